@@ -0,0 +1,96 @@
+# benchmarks/bench_channels.py
+"""
+Many concurrent file-backed channels: thread-per-job vs one asyncio loop.
+
+Run from the repo root:
+    python -m benchmarks.bench_channels [--channels 1 8 32 128] [--fs HZ] [--n BYTES]
+
+Half the channels acquire (replaying a .in file), half generate. Each
+channel moves --n bytes in --chunk pieces paced at --fs chunks/s. Reports
+aggregate throughput, wall time and process CPU time for both models.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+from oscifgen.aio_engine import AsyncEngine
+from oscifgen.file_device import FileDevice
+from oscifgen.reader import Reader
+from oscifgen.wavegen import Wave
+from oscifgen.writer import Writer
+
+
+def _specs(tmp: str, count: int, fs: float, n: int, chunk: int) -> list:
+    src = os.path.join(tmp, "stim.in")
+    specs = []
+    for i in range(count):
+        if i % 2 == 0:
+            specs.append({"name": f"ch{i}", "mode": "acquire", "in": src,
+                          "out": os.path.join(tmp, f"cap{i}.bin"),
+                          "fs": fs, "n": n, "chunk": chunk})
+        else:
+            specs.append({"name": f"ch{i}", "mode": "generate",
+                          "out": os.path.join(tmp, f"tx{i}.out"),
+                          "fo": fs, "n": n, "chunk": chunk})
+    return specs
+
+
+def _threads(specs: list) -> None:
+    def job(s: dict) -> None:
+        if s["mode"] == "acquire":
+            Reader().run(FileDevice(), s["in"], s["out"], s["fs"], n=s["n"], chunk=s["chunk"])
+        else:
+            Writer().run(FileDevice(), s["out"], s["fo"], Wave.SINE, 1.0, s["n"], None, s["chunk"])
+
+    ths = [threading.Thread(target=job, args=(s,), daemon=True) for s in specs]
+    for t in ths:
+        t.start()
+    for t in ths:
+        t.join()
+
+
+def _asyncio(specs: list) -> None:
+    eng = AsyncEngine()
+    for s in specs:
+        eng.add_channel(s)
+    eng.run(quiet=True)
+
+
+def _measure(fn, specs: list) -> tuple:
+    c0 = time.process_time()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(specs)
+    return time.perf_counter() - t0, time.process_time() - c0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--channels", type=int, nargs="+", default=[1, 8, 32, 128])
+    ap.add_argument("--fs", type=float, default=500.0, help="Chunks per second per channel")
+    ap.add_argument("--n", type=int, default=128 * 512, help="Bytes per channel")
+    ap.add_argument("--chunk", type=int, default=512)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "stim.in"), "wb") as f:
+            f.write(os.urandom(args.n))
+        for count in args.channels:
+            specs = _specs(tmp, count, args.fs, args.n, args.chunk)
+            total = count * args.n
+            for label, fn in (("threads", _threads), ("asyncio", _asyncio)):
+                wall, cpu = _measure(fn, specs)
+                print(
+                    f"MODEL={label:<8} channels={count:<4} time_s={wall:.3f} "
+                    f"throughput_Bps={total / wall:,.0f} cpu_s={cpu:.3f} "
+                    f"cpu_per_MB_s={cpu / (total / 1e6):.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_file_device.py
+"""
+FileDevice vs MmapFileDevice read/write throughput across chunk sizes.
+
+Run from the repo root:
+    python -m benchmarks.bench_file_device [--total BYTES] [--dir PATH]
+
+Chunk sizes go from 64 B to 1 MiB in powers of 4. Reads replay a
+--total byte .in file; writes produce a --total byte output file.
+write_wb is FileDevice with a --buffer byte write-behind queue (writev),
+reported with its write syscall count.
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+
+from oscifgen.file_device import FileDevice
+from oscifgen.mmap_device import MmapFileDevice
+
+CHUNKS = [64 << (2 * i) for i in range(8)]  # 64 B .. 1 MiB
+
+
+def _read(dev, path: str, chunk: int) -> float:
+    buf = memoryview(bytearray(chunk))
+    read_view = getattr(dev, "read_view", None)
+    dev.open(path)
+    t0 = time.perf_counter()
+    if read_view is not None:
+        while len(read_view(chunk)):
+            pass
+    else:
+        while dev.read_into(buf).bytes > 0:
+            pass
+    dt = time.perf_counter() - t0
+    dev.close()
+    return dt
+
+
+def _write(dev, path: str, total: int, chunk: int) -> float:
+    data = bytes(chunk)
+    dev.open(path)
+    t0 = time.perf_counter()
+    done = 0
+    while done < total:
+        done += dev.write(data[:min(chunk, total - done)]).bytes
+    dev.close()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--total", type=int, default=64 << 20,
+                    help="Bytes read/written per case")
+    ap.add_argument("--buffer", type=int, default=1 << 20,
+                    help="Write-behind buffer for the write_wb case")
+    ap.add_argument("--dir", default=None,
+                    help="Directory for the scratch files (default: system temp)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        src = os.path.join(tmp, "stim.in")
+        with open(src, "wb") as f:
+            f.write(os.urandom(args.total))
+        dst = os.path.join(tmp, "tx.out")
+
+        for chunk in CHUNKS:
+            r_file = _read(FileDevice(), src, chunk)
+            r_mmap = _read(MmapFileDevice(), src, chunk)
+            w_file = _write(FileDevice(), dst, args.total, chunk)
+            w_mmap = _write(MmapFileDevice(out_size=args.total), dst, args.total, chunk)
+            wb = FileDevice(buffer=args.buffer)
+            w_wb = _write(wb, dst, args.total, chunk)
+            print(
+                f"chunk={chunk:<8} "
+                f"read_file_Bps={args.total / r_file:,.0f} read_mmap_Bps={args.total / r_mmap:,.0f} "
+                f"write_file_Bps={args.total / w_file:,.0f} write_mmap_Bps={args.total / w_mmap:,.0f} "
+                f"write_wb_Bps={args.total / w_wb:,.0f} write_wb_syscalls={wb.syscalls}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_overhead.py
+"""
+Framework ceiling: unpaced (fs=inf) Reader/Writer runs on devices that do no I/O.
+
+Run from the repo root:
+    python -m benchmarks.bench_overhead [--total BYTES] [--chunks 64 512 ...]
+
+null://  - Reader.run / Writer.run against NullDevice: loop overhead (plus
+           DDS synthesis on the write side).
+loop://  - a Writer thread feeding a Reader through an in-memory LoopbackDevice.
+Each case reports the ceiling in bytes/s and the wall time per chunk. The
+Reader's output goes to os.devnull, so no case touches the disk.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import math
+import os
+import threading
+
+from oscifgen.devices import make_device
+from oscifgen.reader import Reader
+from oscifgen.writer import Writer
+
+CHUNKS = [64, 256, 1024, 4096, 16384, 65536]
+
+
+def _read(url: str, total: int, chunk: int) -> Reader:
+    dev, path = make_device(url)
+    r = Reader()
+    r.run(dev, path, os.devnull, math.inf, n=total, chunk=chunk)
+    return r
+
+
+def _write(url: str, total: int, chunk: int) -> Writer:
+    dev, path = make_device(url)
+    w = Writer()
+    # DDS (fs set) is the cheapest synthesis path, so what remains is loop overhead
+    w.run(dev, path, 1000.0, "sine", 1.0, total, None, chunk, fs=48000.0, rate=math.inf)
+    return w
+
+
+def _loop(total: int, chunk: int) -> Reader:
+    url = f"loop://bench?capacity={max(4 * chunk, 1 << 16)}"
+    wt = threading.Thread(target=_write, args=(url, total, chunk), daemon=True)
+    wt.start()
+    r = _read(url, total, chunk)
+    wt.join()
+    return r
+
+
+def _report(case: str, chunk: int, run) -> None:
+    ns = run.elapsed_s / max(1, run.loops_total) * 1e9
+    print(f"case={case:<10} chunk={chunk:<6} ceiling_Bps={run.bytes_total / run.elapsed_s:,.0f} "
+          f"ns_per_chunk={ns:,.0f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--total", type=int, default=32 << 20, help="Bytes per case")
+    ap.add_argument("--chunks", type=int, nargs="+", default=CHUNKS)
+    args = ap.parse_args()
+
+    for chunk in args.chunks:
+        total = max(args.total, 1000 * chunk)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = [("null-read", _read("null://", total, chunk)),
+                     ("null-write", _write("null://", total, chunk)),
+                     ("loopback", _loop(total, chunk))]
+        for case, run in cases:
+            _report(case, chunk, run)
+
+
+if __name__ == "__main__":
+    main()
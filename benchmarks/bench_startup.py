@@ -0,0 +1,82 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the CLI's file-only paths, via python -X importtime.
+
+Run from the repo root:
+    python -m benchmarks.bench_startup [--runs N] [--budget-ms MS]
+
+Each case runs the CLI in a fresh interpreter with -X importtime and
+sums the cumulative import time of top-level modules. It fails (exit 1)
+if a file-only path imports a backend it should not (sounddevice, or
+NumPy for acquire), or if the acquire path's median import time exceeds
+--budget-ms (generate needs NumPy, so it is only checked for sounddevice).
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _importtime(argv: list, cwd: str) -> tuple:
+    """Return (total import µs, set of imported top-level modules) for one run."""
+    env = dict(os.environ, PYTHONPATH=REPO + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "oscifgen", *argv],
+                          cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode not in (0, 1):
+        raise SystemExit(f"oscifgen {' '.join(argv)} failed:\n{proc.stderr}")
+    total = 0
+    mods = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        name = name[1:].rstrip()  # nested imports keep extra leading spaces
+        mods.add(name.strip().split(".")[0])
+        if not name.startswith(" "):
+            total += int(cum)
+    return total, mods
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=120.0,
+                    help="Fail if acquire's median import time exceeds this")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "stim.in"), "wb") as f:
+            f.write(os.urandom(4096))
+        cases = [
+            ("acquire-file", ["acquire", "--in", "stim.in", "--out", "cap.bin",
+                              "--fs", "1e9", "--n", "4096"], {"sounddevice", "numpy"},
+             args.budget_ms),
+            ("generate-file", ["generate", "--out", "tx.out", "--fo", "1e9",
+                               "--n", "4096"], {"sounddevice"}, None),
+        ]
+        failed = False
+        for label, argv, forbidden, budget in cases:
+            samples = []
+            mods = set()
+            for _ in range(args.runs):
+                us, mods = _importtime(argv, tmp)
+                samples.append(us / 1000.0)
+            med = statistics.median(samples)
+            bad = sorted(forbidden & mods)
+            ok = not bad and (budget is None or med <= budget)
+            failed |= not ok
+            print(
+                f"CASE={label:<14} import_ms_median={med:.1f} import_ms_min={min(samples):.1f} "
+                f"modules={len(mods)} forbidden_loaded={','.join(bad) or '-'} "
+                f"{'OK' if ok else 'FAIL'}"
+            )
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
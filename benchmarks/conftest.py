@@ -0,0 +1,36 @@
+# benchmarks/conftest.py
+"""
+pytest-benchmark settings shared by benchmarks/perf_*.py.
+
+Baselines are JSON runs stored under benchmarks/baselines/<machine>/
+(instead of ./.benchmarks in whatever directory pytest was started from).
+--benchmark-compare checks this run against the latest baseline and fails
+when any benchmark's median regresses by more than --regress-pct percent
+(default 10, or $OSCIFGEN_BENCH_REGRESS_PCT). An explicit
+--benchmark-compare-fail expression takes precedence.
+"""
+from __future__ import annotations
+import os
+
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+_DEFAULT_STORAGE = "file://./.benchmarks"
+
+
+def pytest_addoption(parser) -> None:
+    parser.getgroup("oscifgen").addoption(
+        "--regress-pct", type=int,
+        default=int(os.environ.get("OSCIFGEN_BENCH_REGRESS_PCT", "10")),
+        help="Fail --benchmark-compare runs whose median is this many percent slower (default 10)",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)  # before pytest-benchmark builds its session from the options
+def pytest_configure(config) -> None:
+    opt = config.option
+    if getattr(opt, "benchmark_storage", None) == _DEFAULT_STORAGE:
+        opt.benchmark_storage = "file://" + BASELINES
+    if getattr(opt, "benchmark_compare", None) and not opt.benchmark_compare_fail:
+        opt.benchmark_compare_fail = [parse_compare_fail(f"median:{opt.regress_pct}%")]
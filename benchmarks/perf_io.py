@@ -0,0 +1,105 @@
+# benchmarks/perf_io.py
+"""FileDevice read/write per chunk, whole unpaced Reader.run / Writer.run loops,
+and the Reader's optional analytics stage (StreamAnalyzer.feed) per chunk."""
+from __future__ import annotations
+import contextlib
+import io
+import math
+import os
+
+import pytest
+
+from oscifgen.analytics import AnalyticsConfig, StreamAnalyzer
+from oscifgen.file_device import FileDevice
+from oscifgen.null_device import NullDevice
+from oscifgen.reader import Reader
+from oscifgen.writer import Writer
+
+CHUNKS = [64, 4096, 65536]
+SRC_BYTES = 4 << 20
+RUN_BYTES = 4 << 20
+# restart write benchmarks' output file after this much, so it stays small
+ROLLOVER = 16 << 20
+
+
+@pytest.fixture(scope="module")
+def src(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp("io") / "stim.in")
+    with open(path, "wb") as f:
+        f.write(os.urandom(SRC_BYTES))
+    return path
+
+
+def _reopening(dev: FileDevice, path: str, op):
+    """op() on dev, reopening path whenever it hits EOF (reads) or ROLLOVER (writes)."""
+    state = {"bytes": 0}
+    dev.open(path)
+
+    def call():
+        got = op().bytes
+        state["bytes"] += got
+        if got == 0 or state["bytes"] >= ROLLOVER:
+            dev.close()
+            dev.open(path)
+            state["bytes"] = 0
+    return call
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_file_read(benchmark, src: str, chunk: int) -> None:
+    dev = FileDevice()
+    benchmark(_reopening(dev, src, lambda: dev.read(chunk)))
+    dev.close()
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_file_read_into(benchmark, src: str, chunk: int) -> None:
+    dev = FileDevice()
+    buf = memoryview(bytearray(chunk))
+    benchmark(_reopening(dev, src, lambda: dev.read_into(buf)))
+    dev.close()
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_file_write(benchmark, tmp_path, chunk: int) -> None:
+    dev = FileDevice()
+    data = os.urandom(chunk)
+    benchmark(_reopening(dev, str(tmp_path / "tx.out"), lambda: dev.write(data)))
+    dev.close()
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_reader_run(benchmark, src: str, chunk: int) -> None:
+    r = Reader()
+    status = benchmark(_quiet, r.run, FileDevice(), src, os.devnull, math.inf,
+                       n=SRC_BYTES, chunk=chunk)
+    assert status == 0 and r.bytes_total == SRC_BYTES
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_reader_run_null(benchmark, chunk: int) -> None:
+    r = Reader()
+    status = benchmark(_quiet, r.run, NullDevice(), "", os.devnull, math.inf,
+                       n=RUN_BYTES, chunk=chunk)
+    assert status == 0 and r.bytes_total == RUN_BYTES
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_writer_run_null(benchmark, chunk: int) -> None:
+    w = Writer()
+    status = benchmark(_quiet, w.run, NullDevice(), "", 1000.0, "sine", 1.0,
+                       RUN_BYTES, None, chunk, fs=48000.0, rate=math.inf)
+    assert status == 0 and w.bytes_total == RUN_BYTES
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+def test_stream_analyzer_feed(benchmark, chunk: int) -> None:
+    a = StreamAnalyzer(AnalyticsConfig(dtype="int16", nfft=1024), 44100.0)
+    data = memoryview(os.urandom(chunk))
+    benchmark(a.feed, data)
+    assert a.count > 0
@@ -0,0 +1,68 @@
+# benchmarks/perf_timing.py
+"""RunStats over 10^6 samples, and Pacer wakeup jitter at 1 / 8 / 44.1 kHz."""
+from __future__ import annotations
+import random
+
+import pytest
+
+from oscifgen.scheduler import Pacer
+from oscifgen.stats import RunStats
+
+SAMPLES = 1_000_000
+PACE_S = 0.2  # length of one pacing round
+
+
+@pytest.fixture(scope="module")
+def samples() -> list:
+    rng = random.Random(1234)
+    return [rng.lognormvariate(-9.0, 1.0) for _ in range(SAMPLES)]
+
+
+@pytest.fixture(scope="module")
+def filled(samples: list) -> RunStats:
+    rs = RunStats()
+    for dt in samples:
+        rs.mark_interval(dt)
+    return rs
+
+
+def test_runstats_ingest(benchmark, samples: list) -> None:
+    def ingest() -> RunStats:
+        rs = RunStats()
+        mark = rs.mark_interval
+        for dt in samples:
+            mark(dt)
+        return rs
+    rs = benchmark.pedantic(ingest, rounds=3, iterations=1)
+    assert rs.count == SAMPLES
+
+
+def test_runstats_percentiles(benchmark, filled: RunStats) -> None:
+    def percentiles() -> tuple:
+        return filled.p50(), filled.p95(), filled.p99(), filled.p999()
+    p50, p95, p99, p999 = benchmark(percentiles)
+    assert p50 <= p95 <= p99 <= p999
+
+
+@pytest.mark.parametrize("rate_hz", [1000.0, 8000.0, 44100.0], ids=["1kHz", "8kHz", "44.1kHz"])
+def test_pacer_jitter(benchmark, rate_hz: float) -> None:
+    """Times a PACE_S run of ticks; jitter percentiles go into extra_info."""
+    ticks = int(rate_hz * PACE_S)
+    pacers = []
+
+    def run() -> None:
+        p = Pacer(rate_hz)
+        p.start()
+        for _ in range(ticks):
+            p.sleep_until_next()
+        pacers.append(p)
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
+    jitter = RunStats()
+    for p in pacers:
+        jitter.merge(p.jitter)
+    benchmark.extra_info.update(
+        jitter_p50_s=jitter.p50(), jitter_p99_s=jitter.p99(), jitter_max_s=jitter.max,
+        missed=sum(p.missed for p in pacers), resyncs=sum(p.resyncs for p in pacers),
+    )
+    assert jitter.count == ticks * len(pacers)
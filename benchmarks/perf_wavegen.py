@@ -0,0 +1,36 @@
+# benchmarks/perf_wavegen.py
+"""Waveform.next_bytes per wave kind and chunk size (cycle engine and DDS), and
+MultiWaveform.next_into per sample format and channel count."""
+from __future__ import annotations
+
+import pytest
+
+from oscifgen.wavegen import ChannelSpec, DdsWaveform, MultiWaveform, Wave, Waveform
+
+CHUNKS = [64, 512, 4096, 65536]
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+@pytest.mark.parametrize("kind", list(Wave), ids=lambda k: k.value)
+def test_next_bytes(benchmark, kind: Wave, chunk: int) -> None:
+    wf = Waveform(kind=kind, amp=1.0)
+    out = benchmark(wf.next_bytes, chunk)
+    assert len(out) == chunk
+
+
+@pytest.mark.parametrize("chunk", CHUNKS)
+@pytest.mark.parametrize("kind", list(Wave), ids=lambda k: k.value)
+def test_next_bytes_dds(benchmark, kind: Wave, chunk: int) -> None:
+    wf = DdsWaveform(kind=kind, amp=1.0, fo=1000.0, fs=48000.0)
+    out = benchmark(wf.next_bytes, chunk)
+    assert len(out) == chunk
+
+
+@pytest.mark.parametrize("channels", [1, 2, 8])
+@pytest.mark.parametrize("fmt", ["uint8", "int16", "float32"])
+def test_next_into_multi(benchmark, fmt: str, channels: int) -> None:
+    specs = [ChannelSpec(Wave.SINE, 1.0, 90.0 * c) for c in range(channels)]
+    wf = MultiWaveform(specs, fmt, fo=1000.0, fs=48000.0)
+    buf = memoryview(bytearray(4096 * wf.frame_bytes))  # 4096 frames
+    out = benchmark(wf.next_into, buf)
+    assert out == len(buf)
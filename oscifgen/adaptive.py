@@ -0,0 +1,126 @@
+# oscifgen/adaptive.py
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .scheduler import Pacer
+from .stats import RunStats
+
+
+@dataclass
+class AdaptPolicy:
+    chunk_min: int = 64                     # bytes (Reader) / frames (Writer)
+    chunk_max: int = 65536                  # bytes (Reader) / frames (Writer)
+    target_latency_s: Optional[float] = None
+    cpu_budget: Optional[float] = None      # busy fraction of each chunk period, 0..1
+    window: int = 32                        # chunks measured per decision
+
+
+class ChunkTuner:
+    """
+    Adaptive chunk size for Reader/Writer (--adapt).
+
+    The loop reports each chunk's service time (read/synthesize + write,
+    excluding the pacing sleep) to observe(). Every `window` chunks the
+    tuner looks at that window's service times (a RunStats) and at the
+    Pacer's missed-deadline counter, then doubles or halves the chunk
+    within [chunk_min, chunk_max]:
+
+      latency  = chunk / byte_rate + p95 service time
+      busy     = service time / chunk period
+
+      - latency above target_latency_s          -> halve
+      - missed deadlines or busy > cpu_budget   -> double (if 2x latency fits the target)
+      - latency target only, 2x latency fits    -> double (largest chunk that meets it)
+      - busy < cpu_budget / 4, nothing missed   -> halve (spare CPU buys latency),
+                                                   but never back to a size that missed
+
+    "Missed" means more than 1/16 of the window's wakeups were already late,
+    so a single scheduler hiccup does not resize the chunk.
+
+    The byte rate is fixed at the start (rate * starting chunk), so on every
+    change the Pacer is re-rated to rate * start / new chunk and throughput
+    stays the same. With neither target set, cpu_budget defaults to 0.5.
+    Sizes are bytes; unit (bytes per frame for Writer) only scales the
+    sizes summary() reports, so they match the caller's --chunk.
+    """
+    def __init__(self, policy: AdaptPolicy, chunk: int, pacer: Pacer, unit: int = 1) -> None:
+        self.policy = policy
+        self.lo = max(1, int(policy.chunk_min))
+        self.hi = max(self.lo, int(policy.chunk_max))
+        self.target = policy.target_latency_s
+        self.budget = policy.cpu_budget
+        if self.target is None and self.budget is None:
+            self.budget = 0.5
+        self.window = max(1, int(policy.window))
+        self.pacer = pacer
+        self.unit = max(1, int(unit))
+        self.byte_rate = pacer.rate_hz * chunk  # inf or 0 when unpaced
+        self.chunk = min(self.hi, max(self.lo, int(chunk)))
+        self.start_chunk = self.chunk
+        self.loops = 0
+        self.trajectory: List[Tuple[int, int]] = [(0, self.chunk)]  # (loop, chunk) at each change
+        self._service = RunStats()
+        self._busy_s = 0.0
+        self._missed0 = pacer.missed
+        self._floor = 0  # largest chunk that missed deadlines
+        if self.chunk != chunk:
+            self._rerate()
+
+    def observe(self, service_s: float) -> int:
+        """Record one chunk's service time; returns the chunk size to use next."""
+        self.loops += 1
+        self._service.mark_interval(service_s)
+        self._busy_s += service_s
+        if self._service.count >= self.window:
+            self._decide()
+        return self.chunk
+
+    def _decide(self) -> None:
+        paced = 0 < self.byte_rate < math.inf
+        period = self.chunk / self.byte_rate if paced else 0.0
+        count = self._service.count
+        latency = period + self._service.p95()
+        busy = self._busy_s / (count * period) if period > 0 else 1.0
+        missed = (self.pacer.missed - self._missed0) * 16 > count
+        fits_2x = self.target is None or 2 * latency <= self.target
+
+        new = self.chunk
+        if self.target is not None and latency > self.target:
+            new = self.chunk // 2
+        elif (missed or (self.budget is not None and busy > self.budget)) and fits_2x:
+            new = self.chunk * 2
+            if missed:
+                self._floor = max(self._floor, self.chunk)
+        elif self.budget is None and fits_2x:
+            new = self.chunk * 2
+        elif (self.budget is not None and busy < self.budget / 4 and not missed
+              and self.chunk // 2 > self._floor):
+            new = self.chunk // 2
+        new = min(self.hi, max(self.lo, new))
+
+        self._service = RunStats()
+        self._busy_s = 0.0
+        self._missed0 = self.pacer.missed
+        if new != self.chunk:
+            self.chunk = new
+            self.trajectory.append((self.loops, new))
+            self._rerate()
+
+    def _rerate(self) -> None:
+        if 0 < self.byte_rate < math.inf:
+            self.pacer.set_rate(self.byte_rate / self.chunk)
+
+    def summary(self) -> str:
+        """One-line report printed after the PACE line."""
+        u = self.unit
+        sizes = [c // u for _, c in self.trajectory]
+        path = ">".join(f"{c // u}@{i}" for i, c in self.trajectory[-24:])
+        if len(self.trajectory) > 24:
+            path = "...>" + path
+        return (
+            f"ADAPT chunk_start={self.start_chunk // u} chunk_final={self.chunk // u} "
+            f"chunk_lo={min(sizes)} chunk_hi={max(sizes)} changes={len(self.trajectory) - 1} "
+            f"trajectory={path}"
+        )
@@ -0,0 +1,297 @@
+# oscifgen/aio_engine.py
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .device import Device
+from .devices import make_device
+from .stats import RunStats, throughput_bytes_per_s
+from .wavegen import Waveform, make_waveform
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel shared by every channel on one event loop.
+
+    Channels await wait_until(deadline) with a time.perf_counter() deadline.
+    A single driver task wakes once per tick_s and releases every timer
+    whose slot has elapsed, so 100 channels cost one loop wakeup per tick
+    instead of 100 independent sleeps. Timers fire at most ~one tick late.
+    """
+    def __init__(self, tick_s: float = 0.001, slots: int = 1024) -> None:
+        self.tick_s = float(tick_s)
+        self._slots: List[list] = [[] for _ in range(slots)]
+        self._pending = 0
+        self._done = 0  # last tick whose slot has been swept
+        self._kick: Optional[asyncio.Event] = None
+        self._driver: Optional[asyncio.Task] = None
+
+    async def wait_until(self, deadline: float) -> None:
+        if deadline <= time.perf_counter():
+            return
+        if self._driver is None:
+            self._done = int(time.perf_counter() / self.tick_s) - 1
+            self._kick = asyncio.Event()
+            self._driver = asyncio.get_running_loop().create_task(self._drive())
+        fut = asyncio.get_running_loop().create_future()
+        tick = int(deadline / self.tick_s)
+        # the driver may not have run since this tick began; make sure it sweeps it
+        self._done = min(self._done, tick - 1)
+        self._slots[tick % len(self._slots)].append((deadline, fut))
+        self._pending += 1
+        self._kick.set()
+        await fut
+
+    def close(self) -> None:
+        if self._driver is not None:
+            self._driver.cancel()
+            self._driver = None
+
+    async def _drive(self) -> None:
+        nslots = len(self._slots)
+        while True:
+            if not self._pending:
+                self._done = int(time.perf_counter() / self.tick_s) - 1
+                self._kick.clear()
+                await self._kick.wait()
+                continue
+            now = time.perf_counter()
+            await asyncio.sleep(max(0.0, (int(now / self.tick_s) + 1) * self.tick_s - now))
+            now = time.perf_counter()
+            cur = int(now / self.tick_s)
+            for t in range(max(self._done + 1, cur - nslots), cur):
+                slot = self._slots[t % nslots]
+                if not slot:
+                    continue
+                keep = []
+                for deadline, fut in slot:
+                    if deadline < now:
+                        if not fut.done():
+                            fut.set_result(None)
+                        self._pending -= 1
+                    else:
+                        keep.append((deadline, fut))  # a later lap of the wheel
+                self._slots[t % nslots] = keep
+            self._done = cur - 1
+
+
+@dataclass
+class ChannelStats:
+    name: str
+    mode: str
+    status: int = 0
+    bytes_total: int = 0
+    loops_total: int = 0
+    elapsed_s: float = 0.0
+    latency: RunStats = field(default_factory=RunStats)
+
+    def summary(self) -> str:
+        thr = throughput_bytes_per_s(self.bytes_total, self.elapsed_s)
+        return (
+            f"CH name={self.name} mode={self.mode} status={self.status} "
+            f"bytes_total={self.bytes_total} loops_total={self.loops_total} "
+            f"time_s={self.elapsed_s:.6f} throughput_Bps={thr:.2f} "
+            f"latency_p50_s={self.latency.p50():.6f} latency_p95_s={self.latency.p95():.6f}"
+        )
+
+
+def _check_plan(rate: Optional[float], n: Optional[int], loops: Optional[int]) -> str:
+    if (n is None and loops is None) or rate is None or rate <= 0:
+        return "Provide n or loops (or both), and a positive rate."
+    if n is not None and n <= 0:
+        return "Invalid N (must be > 0)."
+    if loops is not None and loops <= 0:
+        return "Invalid loops (must be > 0)."
+    return ""
+
+
+async def _paced(wheel: TimerWheel, rate: float, n: Optional[int], loops: Optional[int],
+                 chunk: int, st: ChannelStats, step) -> None:
+    """Shared loop: call step(need) -> bytes done, paced on the wheel at `rate` chunks/s."""
+    period = 1.0 / rate
+    t0 = time.perf_counter()
+    nxt = t0 + period
+    last = t0
+    while True:
+        if n is None and loops is not None and st.loops_total >= loops:
+            break
+        if n is not None and st.bytes_total >= n:
+            break
+        need = chunk if n is None else min(chunk, n - st.bytes_total)
+        got = step(need)
+        if got <= 0:
+            break
+        st.bytes_total += got
+        st.loops_total += 1
+        now = time.perf_counter()
+        st.latency.mark_interval(now - last)
+        last = now
+        await wheel.wait_until(nxt)
+        nxt += period
+        if nxt - time.perf_counter() < -10 * period:
+            nxt = time.perf_counter() + period
+    st.elapsed_s = max(1e-12, time.perf_counter() - t0)
+
+
+class AsyncReader:
+    """reqfRead as a coroutine: same contract as Reader.run, paced on a shared TimerWheel."""
+
+    async def run(self, dev: Device, in_path: str, out_path: str, fs: float,
+                  n: Optional[int] = None, loops: Optional[int] = None, chunk: int = 1024,
+                  wheel: Optional[TimerWheel] = None, name: str = "reader") -> ChannelStats:
+        st = ChannelStats(name, "acquire")
+        err = _check_plan(fs, n, loops)
+        if err:
+            print(f"[{name}] {err}")
+            st.status = 2
+            return st
+        if not dev.open(in_path):
+            print(f"[{name}] Open failed (input)")
+            st.status = 2
+            return st
+        try:
+            fout = open(out_path, "wb")
+        except OSError:
+            print(f"[{name}] Can't open output file")
+            dev.close()
+            st.status = 3
+            return st
+
+        view = memoryview(bytearray(chunk))
+
+        def step(need: int) -> int:
+            r = dev.read_into(view[:need])
+            if r.bytes < 0 or r.err:
+                print(f"[{name}] Read error: {r.err}")
+                st.status = 1
+                return 0
+            fout.write(view[:r.bytes])
+            return r.bytes
+
+        try:
+            await _paced(wheel or TimerWheel(), fs, n, loops, chunk, st, step)
+        finally:
+            fout.close()
+            dev.close()
+        return st
+
+
+class AsyncWriter:
+    """reqfWrite as a coroutine: same contract as Writer.run, paced on a shared TimerWheel."""
+
+    async def run(self, dev: Device, out_path: str, fo: float, wave: Waveform,
+                  n: Optional[int] = None, loops: Optional[int] = None, chunk: int = 512,
+                  wheel: Optional[TimerWheel] = None, name: str = "writer") -> ChannelStats:
+        st = ChannelStats(name, "generate")
+        err = _check_plan(fo, n, loops)
+        if err:
+            print(f"[{name}] {err}")
+            st.status = 2
+            return st
+        if not dev.open(out_path):
+            print(f"[{name}] Open failed (output)")
+            st.status = 2
+            return st
+
+        def step(need: int) -> int:
+            w = dev.write(wave.next_bytes(need))
+            if w.bytes < 0 or w.err:
+                print(f"[{name}] Write error: {w.err}")
+                st.status = 1
+                return 0
+            return w.bytes
+
+        try:
+            await _paced(wheel or TimerWheel(), fo, n, loops, chunk, st, step)
+        finally:
+            dev.close()
+        close_err = getattr(dev, "error", "")   # e.g. FileDevice's final flush
+        if close_err and not st.status:
+            print(f"[{name}] Write error: {close_err}")
+            st.status = 1
+        return st
+
+
+class AsyncEngine:
+    """
+    Runs many acquire/generate channels concurrently on one asyncio event
+    loop, all paced by a single TimerWheel. "in"/"out" accept device URLs;
+    file-backed channels suit this best, since device calls run inline.
+    Channel specs use the same keys as script start/read/write steps:
+      { "name": "ch0", "mode": "acquire", "in": "a.in", "out": "a.bin",
+        "fs": 1000, "n": 65536, "chunk": 512, "mmap": false }
+      { "name": "ch1", "mode": "generate", "out": "b.out", "fo": 1000,
+        "fs": 48000, "wave": "sine", "amp": 1.0, "n": 65536, "chunk": 512 }
+    add_channel() raises RuntimeError (prefixed with the channel name) when
+    the device URL cannot be used, and ValueError for a bad mode; channels
+    only start (their coroutines are only created) in run(), so abandoning
+    the engine after such an error leaves nothing half-started. run()
+    returns one ChannelStats per channel; see first_failure().
+    """
+    def __init__(self, tick_s: float = 0.001) -> None:
+        self.wheel = TimerWheel(tick_s)
+        self._jobs = []   # (coroutine function, args); coroutines are created by run()
+        self._specs = 0   # channels offered, rejected ones included (default names)
+
+    def add_channel(self, spec: dict) -> None:
+        name = spec.get("name") or f"ch{self._specs}"
+        self._specs += 1
+        mode = (spec.get("mode") or "acquire").lower()
+        n = int(spec["n"]) if spec.get("n") is not None else None
+        loops = int(spec["loops"]) if spec.get("loops") is not None else None
+        chunk = int(spec.get("chunk", 512))
+        if mode == "acquire":
+            try:
+                dev, path = make_device(spec.get("in") or "", "mmap" if spec.get("mmap") else "file")
+            except RuntimeError as e:
+                raise RuntimeError(f"[{name}] {e}") from e
+            fs = float(spec["fs"]) if spec.get("fs") is not None else None
+            self._jobs.append((AsyncReader().run,
+                               (dev, path, spec.get("out"), fs, n, loops, chunk, self.wheel, name)))
+        elif mode == "generate":
+            fo = float(spec["fo"]) if spec.get("fo") is not None else None
+            fs = float(spec["fs"]) if spec.get("fs") is not None else None
+            wf = make_waveform(spec.get("wave") or "sine", float(spec.get("amp", 1.0)), fo=fo, fs=fs)
+            size = n if n is not None else (loops or 0) * chunk
+            try:
+                dev, path = make_device(spec.get("out") or "", "mmap" if spec.get("mmap") else "file",
+                                        size_hint=size)
+            except RuntimeError as e:
+                raise RuntimeError(f"[{name}] {e}") from e
+            # like Writer.run: a DDS channel leaves at fs frames/s, else fo chunks/s
+            rate = fs / chunk if fo is not None and fs is not None else fo
+            self._jobs.append((AsyncWriter().run,
+                               (dev, path, rate, wf, n, loops, chunk, self.wheel, name)))
+        else:
+            raise ValueError(f"channel mode must be acquire|generate (got {mode})")
+
+    @staticmethod
+    def first_failure(results: List[ChannelStats]) -> int:
+        """The first nonzero channel status in run()'s results, else 0."""
+        return next((st.status for st in results if st.status), 0)
+
+    def run(self, quiet: bool = False) -> List[ChannelStats]:
+        """Run every added channel to completion; prints per-channel and total lines."""
+        async def main() -> List[ChannelStats]:
+            try:
+                return await asyncio.gather(*(run(*args) for run, args in self._jobs))
+            finally:
+                self.wheel.close()
+
+        c0 = time.process_time()
+        t0 = time.perf_counter()
+        results = asyncio.run(main())
+        elapsed = max(1e-12, time.perf_counter() - t0)
+        cpu = time.process_time() - c0
+        self._jobs, self._specs = [], 0
+        if not quiet:
+            for st in results:
+                print(st.summary())
+            total = sum(st.bytes_total for st in results)
+            print(
+                f"ENGINE channels={len(results)} bytes_total={total} time_s={elapsed:.6f} "
+                f"throughput_Bps={throughput_bytes_per_s(total, elapsed):.2f} cpu_s={cpu:.6f}"
+            )
+        return results
@@ -0,0 +1,171 @@
+# oscifgen/analytics.py
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass
+class AnalyticsConfig:
+    dtype: str = "int16"
+    channels: int = 1
+    samplerate: Optional[float] = None   # Hz; None -> taken from the device/run
+    nfft: int = 1024                     # Welch segment length (frames), 50% overlap
+    every_s: Optional[float] = None      # also print a STATS line this often
+
+
+class StreamAnalyzer:
+    """
+    Running signal statistics over an acquisition stream (Reader analyze=).
+
+    feed() takes each chunk as it is captured and updates, per channel and
+    with whole-chunk NumPy ops:
+      - mean/variance: the chunk's own mean and M2, merged into the running
+        totals (Chan et al.'s parallel form of Welford's update)
+      - min/max/peak (largest |x|)
+      - zero crossings, counted around the running mean so a DC offset
+        (e.g. uint8 samples centered on 128) does not hide them
+      - a Welch spectrum: Hann-windowed, mean-removed segments of nfft
+        frames at 50% overlap, |rfft|^2 summed across segments; samples
+        not yet forming a full segment carry over to the next chunk
+
+    Chunks may split frames; the partial frame is carried over. summary()
+    gives one STATS line per channel: DC offset (mean), std, RMS, peak,
+    zero-crossing rate and the dominant frequency (Welch peak, refined by
+    parabolic interpolation). With every_s set, feed() also prints the
+    lines every every_s seconds while the stream runs.
+    """
+    def __init__(self, cfg: AnalyticsConfig, samplerate: float) -> None:
+        if cfg.channels <= 0:
+            raise ValueError("channels must be > 0")
+        if not samplerate or samplerate <= 0:
+            raise ValueError("samplerate must be > 0")
+        if cfg.nfft < 8:
+            raise ValueError("nfft must be >= 8")
+        self.dtype = np.dtype(cfg.dtype)
+        self.channels = int(cfg.channels)
+        self.samplerate = float(samplerate)
+        self.nfft = int(cfg.nfft)
+        self.every_s = cfg.every_s
+        self._frame = self.dtype.itemsize * self.channels
+        self._carry = b""
+        ch = self.channels
+        self.count = 0
+        self._mean = np.zeros(ch)
+        self._m2 = np.zeros(ch)
+        self.min = np.full(ch, np.inf)
+        self.max = np.full(ch, -np.inf)
+        self.crossings = np.zeros(ch, dtype=np.int64)
+        self._above: Optional[np.ndarray] = None   # last sample's side of the mean
+        self._hop = self.nfft // 2
+        self._win = np.hanning(self.nfft)
+        self._pend = np.empty((0, ch))
+        self._psd = np.zeros((ch, self.nfft // 2 + 1))
+        self.segments = 0
+        self._t0 = time.perf_counter()
+        self._next_emit = self._t0 + self.every_s if self.every_s else None
+
+    def feed(self, data) -> None:
+        mv = data if isinstance(data, memoryview) else memoryview(data)
+        if self._carry:
+            mv = memoryview(self._carry + bytes(mv))
+        whole = len(mv) - len(mv) % self._frame
+        self._carry = bytes(mv[whole:])
+        if whole:
+            x = np.frombuffer(mv[:whole], dtype=self.dtype).reshape(-1, self.channels)
+            self._update(x.astype(np.float64))
+        if self._next_emit is not None:
+            now = time.perf_counter()
+            if now >= self._next_emit:
+                print(self.summary(t_s=now - self._t0))
+                self._next_emit += self.every_s * max(1, int((now - self._next_emit) // self.every_s) + 1)
+
+    def _update(self, x: np.ndarray) -> None:
+        n = len(x)
+        mean = x.mean(axis=0)
+        m2 = ((x - mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = mean - self._mean
+        self._m2 += m2 + delta * delta * (self.count * n / total)
+        self._mean += delta * (n / total)
+        self.count = total
+        np.minimum(self.min, x.min(axis=0), out=self.min)
+        np.maximum(self.max, x.max(axis=0), out=self.max)
+
+        above = x >= self._mean
+        self.crossings += np.count_nonzero(above[1:] != above[:-1], axis=0)
+        if self._above is not None:
+            self.crossings += above[0] != self._above
+        self._above = above[-1]
+
+        buf = np.concatenate((self._pend, x)) if len(self._pend) else x
+        if len(buf) >= self.nfft:
+            nseg = (len(buf) - self.nfft) // self._hop + 1
+            segs = sliding_window_view(buf, self.nfft, axis=0)[::self._hop][:nseg]  # (nseg, ch, nfft)
+            segs = segs - segs.mean(axis=-1, keepdims=True)
+            spec = np.fft.rfft(segs * self._win, axis=-1)
+            self._psd += (spec.real ** 2 + spec.imag ** 2).sum(axis=0)
+            self.segments += nseg
+            buf = buf[nseg * self._hop:]
+        self._pend = buf.copy()
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean.copy()
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else np.zeros(self.channels)
+
+    @property
+    def rms(self) -> np.ndarray:
+        var = self._m2 / self.count if self.count else np.zeros(self.channels)
+        return np.sqrt(self._mean ** 2 + var)
+
+    @property
+    def peak(self) -> np.ndarray:
+        return np.maximum(np.abs(self.min), np.abs(self.max)) if self.count else np.zeros(self.channels)
+
+    @property
+    def zcr_per_s(self) -> np.ndarray:
+        return self.crossings * (self.samplerate / self.count) if self.count else np.zeros(self.channels)
+
+    def spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(frequencies in Hz, Welch PSD per channel in units^2/Hz, shape (channels, bins))."""
+        freqs = np.fft.rfftfreq(self.nfft, 1.0 / self.samplerate)
+        if not self.segments:
+            return freqs, np.zeros_like(self._psd)
+        psd = self._psd / (self.segments * self.samplerate * (self._win ** 2).sum())
+        psd[:, 1:-1 if self.nfft % 2 == 0 else None] *= 2.0  # one-sided
+        return freqs, psd
+
+    def dominant_hz(self) -> np.ndarray:
+        """Frequency of the largest non-DC Welch bin per channel (0 before the first segment)."""
+        out = np.zeros(self.channels)
+        if not self.segments:
+            return out
+        _, psd = self.spectrum()
+        bin_hz = self.samplerate / self.nfft
+        for c in range(self.channels):
+            k = int(np.argmax(psd[c, 1:])) + 1
+            shift = 0.0
+            if 1 < k < psd.shape[1] - 1:
+                a, b, g = np.log(psd[c, k - 1:k + 2] + 1e-300)
+                den = a - 2.0 * b + g
+                shift = 0.5 * (a - g) / den if den else 0.0
+            out[c] = (k + shift) * bin_hz
+        return out
+
+    def summary(self, t_s: Optional[float] = None) -> str:
+        head = "STATS" if t_s is None else f"STATS t_s={t_s:.3f}"
+        mean, std, rms, peak = self.mean, self.std, self.rms, self.peak
+        zcr, dom = self.zcr_per_s, self.dominant_hz()
+        return "\n".join(
+            f"{head} ch={c} samples={self.count} mean={mean[c]:.4f} std={std[c]:.4f} "
+            f"rms={rms[c]:.4f} peak={peak[c]:.1f} zcr_per_s={zcr[c]:.2f} "
+            f"dominant_hz={dom[c]:.2f} welch_segments={self.segments}"
+            for c in range(self.channels)
+        )
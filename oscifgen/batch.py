@@ -0,0 +1,205 @@
+# oscifgen/batch.py
+from __future__ import annotations
+import contextlib
+import io
+import itertools
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from .devices import make_device, parse_url
+from .stats import throughput_bytes_per_s
+from .writer import Writer
+
+# parameters that define the generated bytes (everything except the output path)
+_KEY_FIELDS = ("wave", "amp", "fo", "fs", "n", "loops", "chunk", "dtype", "channels")
+# schemes whose output is a plain file, so a duplicate can be linked or copied
+_FILE_SCHEMES = ("file", "mmap")
+
+
+def expand_jobs(doc: dict) -> List[dict]:
+    """
+    Turn a batch document into a flat list of generate jobs.
+    Explicit jobs and a cartesian matrix can be mixed:
+      {
+        "defaults": { "chunk": 4096, "fs": 48000 },
+        "jobs":     [ { "out": "a.out", "fo": 1000, "n": 65536 } ],
+        "matrix":   { "wave": ["sine", "square"], "fo": [500, 1000], "n": [65536] },
+        "out":      "stim_{wave}_{fo}_{n}.out"
+      }
+    The "out" template is filled from each matrix combination; a template
+    naming a field the combination lacks raises ValueError.
+    """
+    defaults = dict(doc.get("defaults") or {})
+    jobs = [{**defaults, **j} for j in doc.get("jobs") or []]
+    matrix = doc.get("matrix") or {}
+    if matrix:
+        keys = list(matrix)
+        template = doc.get("out") or "_".join("{%s}" % k for k in keys) + ".out"
+        for combo in itertools.product(*(matrix[k] for k in keys)):
+            params = {**defaults, **dict(zip(keys, combo))}
+            try:
+                params["out"] = template.format(**params)
+            except (KeyError, IndexError, ValueError) as e:
+                raise ValueError(f"bad out template {template!r}: {e!r}") from None
+            jobs.append(params)
+    return jobs
+
+
+def _job_key(job: dict) -> tuple:
+    job = {"wave": "sine", "amp": 1.0, "chunk": 512, "dtype": "uint8", **job}
+    key = []
+    for k in _KEY_FIELDS:
+        v = job.get(k)
+        if isinstance(v, (int, float)):
+            v = float(v)            # 500 and 500.0 are the same job
+        elif isinstance(v, str):
+            v = v.lower()
+        elif isinstance(v, (list, dict)):
+            v = json.dumps(v, sort_keys=True)   # per-channel settings
+        key.append(v)
+    return tuple(key)
+
+
+def _target(job: dict) -> tuple:
+    """(scheme, path) the job writes to; RuntimeError for a missing or unusable "out"."""
+    out = job.get("out")
+    if not out:
+        raise RuntimeError("job has no \"out\"")
+    make_device(out)   # unknown scheme / bad options fail here, before any work
+    scheme, path, _ = parse_url(out)
+    return scheme, path
+
+
+def _generate(job: dict) -> dict:
+    """
+    Worker: one unpaced (unless 'rate' is set) Writer.run; its prints are
+    captured. Errors come back as the job's status instead of being raised,
+    so one bad job does not stop the batch.
+    """
+    w = Writer()
+    try:
+        dev, path = make_device(job["out"])
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            status = w.run(
+                dev=dev,
+                out_path=path,
+                fo=float(job["fo"]) if job.get("fo") is not None else None,
+                wave=(job.get("wave") or "sine").lower(),
+                amp=float(job.get("amp", 1.0)),
+                n=int(job["n"]) if job.get("n") is not None else None,
+                loops=int(job["loops"]) if job.get("loops") is not None else None,
+                chunk=int(job.get("chunk", 512)),
+                fs=float(job["fs"]) if job.get("fs") is not None else None,
+                rate=float(job.get("rate", math.inf)),
+                dtype=str(job.get("dtype", "uint8")),
+                channels=job.get("channels"),
+            )
+    except Exception as e:   # bad parameters, open/IO failures, ...
+        return {"out": job.get("out"), "status": 2, "bytes": 0, "time_s": 0.0,
+                "error": f"{type(e).__name__}: {e}"}
+    # the Writer's own failure message (printed before its report), if any
+    error = log.getvalue().splitlines()[0] if status and log.getvalue() else None
+    return {"out": job["out"], "status": status,
+            "bytes": w.bytes_total, "time_s": w.elapsed_s, "error": error}
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return "same"
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return "link"
+    except OSError:
+        shutil.copyfile(src, dst)
+        return "copy"
+
+
+def run_batch(doc: dict, workers: Optional[int] = None) -> int:
+    """
+    Generate every job in doc across a process pool (one worker per core by
+    default). Jobs with identical parameters writing plain files (file://,
+    mmap:// or a bare path) are generated once and the other outputs are
+    hard-linked (or copied) from the first; other outputs are generated per
+    job. Prints one GEN line per generated file (with error= when a job
+    fails) and a final BATCH throughput report; returns nonzero if any job
+    failed.
+    """
+    try:
+        jobs = expand_jobs(doc)
+    except ValueError as e:
+        print(f"Invalid batch: {e}")
+        return 2
+    if not jobs:
+        print("Batch has no jobs.")
+        return 2
+
+    status = 0
+    runnable: List[dict] = []
+    targets: dict = {}
+    for job in jobs:
+        try:
+            targets[id(job)] = _target(job)
+        except RuntimeError as e:
+            print(f"GEN out={job.get('out')} status=2 error={e}")
+            status = 2
+            continue
+        runnable.append(job)
+
+    unique: dict = {}
+    dupes = []
+    for job in runnable:
+        scheme, path = targets[id(job)]
+        if scheme not in _FILE_SCHEMES:
+            unique[id(job)] = job
+            continue
+        first = unique.setdefault(_job_key(job), job)
+        if first is not job:
+            dupes.append((targets[id(first)][1], path))
+
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    results = []
+    if unique:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_generate, unique.values()))
+
+    failed = set()
+    for job, r in zip(unique.values(), results):
+        thr = throughput_bytes_per_s(r["bytes"], r["time_s"])
+        line = (f"GEN out={r['out']} status={r['status']} bytes_total={r['bytes']} "
+                f"time_s={r['time_s']:.6f} throughput_Bps={thr:.2f}")
+        if r.get("error"):
+            line += f" error={r['error']}"
+        print(line)
+        if r["status"]:
+            status = status or 1
+            failed.add(targets[id(job)][1])
+
+    linked = 0
+    for src, dst in dupes:
+        if src in failed:
+            continue
+        try:
+            via = _link_or_copy(src, dst)
+        except OSError as e:
+            print(f"DUP out={dst} from={src} status=1 error={e}")
+            status = status or 1
+            continue
+        print(f"DUP out={dst} from={src} via={via}")
+        linked += 1
+
+    elapsed = max(1e-12, time.perf_counter() - t0)
+    total = sum(r["bytes"] for r in results)
+    print(
+        f"BATCH jobs={len(jobs)} generated={len(results)} deduplicated={linked} "
+        f"workers={workers} bytes_total={total} time_s={elapsed:.6f} "
+        f"throughput_Bps={throughput_bytes_per_s(total, elapsed):.2f}"
+    )
+    return status
@@ -0,0 +1,319 @@
+# oscifgen/capture.py
+from __future__ import annotations
+import mmap
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+# File layout (all little-endian):
+#   header   HEADER_SIZE bytes, fixed; rewritten on close with the totals
+#   blocks   _BLOCK header + payload, one per block_bytes of raw samples
+#   index    one _ENTRY (file offset, timestamp) per block
+MAGIC = b"OSCAP\x00\r\n"
+VERSION = 1
+HEADER_SIZE = 128
+_HEADER = struct.Struct("<8sHB8sHIddQQQ")
+_BLOCK = struct.Struct("<4sB3xQdII")
+_BLOCK_MAGIC = b"BLK\x00"
+_ENTRY = np.dtype([("offset", "<u8"), ("t", "<f8")])
+
+CODECS = {"none": 0, "zlib": 1, "delta": 2}
+_CODEC_NAMES = {v: k for k, v in CODECS.items()}
+
+
+@dataclass
+class CaptureFormat:
+    dtype: str = "int16"
+    channels: int = 1
+    samplerate: Optional[float] = None   # Hz; None -> taken from the device/run
+    block: int = 65536                   # raw bytes per block (whole frames)
+    codec: str = "none"                  # none | zlib | delta
+
+
+class Block(NamedTuple):
+    seq: int
+    t: float              # arrival: seconds after capture start its first byte came in
+    samples: np.ndarray   # (frames, channels)
+
+
+# ---- delta+varint codec (integer samples) ----
+
+def _delta_encode(raw: memoryview, dtype: np.dtype, channels: int) -> bytes:
+    """Per-channel first differences, zigzagged, as LEB128 varints; partial frame tail stored raw."""
+    frame = dtype.itemsize * channels
+    whole = len(raw) - len(raw) % frame
+    a = np.frombuffer(raw[:whole], dtype=dtype).reshape(-1, channels).astype(np.int64)
+    d = np.diff(a, axis=0, prepend=np.zeros((1, channels), dtype=np.int64)).ravel()
+    z = ((d << 1) ^ (d >> 63)).astype(np.uint64)
+    n = np.ones(len(z), dtype=np.int64)
+    k = 1
+    while k < 10:  # 10 groups of 7 bits hold any 64-bit value
+        more = z >= np.uint64(1 << (7 * k))
+        if not more.any():
+            break
+        n += more
+        k += 1
+    starts = np.cumsum(n) - n
+    out = np.empty(int(n.sum()), dtype=np.uint8)
+    for i in range(k):
+        m = n > i
+        byte = (z[m] >> np.uint64(7 * i)) & np.uint64(0x7F)
+        out[starts[m] + i] = byte.astype(np.uint8) | np.where(n[m] > i + 1, 0x80, 0).astype(np.uint8)
+    return out.tobytes() + bytes(raw[whole:])
+
+
+def _delta_decode(payload, frames: int, dtype: np.dtype, channels: int) -> np.ndarray:
+    count = frames * channels
+    if count == 0:
+        return np.empty((0, channels), dtype=dtype)
+    b = np.frombuffer(payload, dtype=np.uint8)
+    ends = np.flatnonzero(b < 0x80)[:count]
+    starts = np.empty(count, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    used = int(ends[-1]) + 1
+    pos = np.arange(used) - np.repeat(starts, ends - starts + 1)
+    parts = (b[:used] & 0x7F).astype(np.uint64) << (7 * pos).astype(np.uint64)
+    z = np.add.reduceat(parts, starts)
+    d = (z >> np.uint64(1)).astype(np.int64) ^ -(z & np.uint64(1)).astype(np.int64)
+    return np.cumsum(d.reshape(-1, channels), axis=0).astype(dtype)
+
+
+# ---- writer ----
+
+class CaptureWriter:
+    """
+    Writes a self-describing capture file (Reader container=CaptureFormat()).
+
+    The fixed header records fs, the sample dtype, channel count, block
+    size, codec and wall-clock start time; on close() it is rewritten with
+    the block count, the dropped-chunk count and the index offset. Incoming
+    bytes are packed into fixed-size blocks (block_bytes of raw samples,
+    only the last one short), each with a sequence number and the time its
+    first byte arrived. The index after the last block gives every block's
+    offset and timestamp, so CaptureFile can seek without scanning.
+
+    Each block is stored with the configured codec unless that would not
+    make it smaller, in which case it is stored as-is (the codec is recorded
+    per block). "delta" suits slowly varying integer audio; "zlib" works on
+    anything.
+
+    write() has the file-object signature, so it can stand in for the
+    output file in Reader's sink or ring drain.
+    """
+    def __init__(self, path: str, fmt: CaptureFormat, samplerate: float) -> None:
+        if fmt.codec not in CODECS:
+            raise ValueError(f"unknown codec {fmt.codec!r} (choose from {', '.join(CODECS)})")
+        self.dtype = np.dtype(fmt.dtype).newbyteorder("<")
+        if fmt.codec == "delta" and self.dtype.kind not in "iu":
+            raise ValueError("delta codec needs an integer dtype")
+        if fmt.channels <= 0:
+            raise ValueError("channels must be > 0")
+        if not samplerate or samplerate <= 0:
+            raise ValueError("samplerate must be > 0")
+        self.channels = int(fmt.channels)
+        self.samplerate = float(samplerate)
+        frame = self.dtype.itemsize * self.channels
+        self.block_bytes = max(frame, int(fmt.block) - int(fmt.block) % frame)
+        self.codec = CODECS[fmt.codec]
+        self.dropped = 0   # chunks/blocks lost before reaching the file; set by the caller
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+        self._buf = bytearray(self.block_bytes)
+        self._fill = 0
+        self._t = 0.0
+        self._index: List[tuple] = []
+        self._wall0 = time.time()
+        self._t0 = time.perf_counter()
+        self._f = open(path, "wb")
+        self._f.write(self._header(0))   # no index yet: readers fall back to a scan
+        self._pos = HEADER_SIZE
+
+    def _header(self, index_offset: int) -> bytes:
+        h = _HEADER.pack(MAGIC, VERSION, self.codec, self.dtype.str.encode("ascii"),
+                         self.channels, self.block_bytes, self.samplerate, self._wall0,
+                         len(self._index), index_offset, self.dropped)
+        return h + bytes(HEADER_SIZE - len(h))
+
+    def write(self, data) -> int:
+        mv = data if isinstance(data, memoryview) else memoryview(data)
+        mv = mv.cast("B") if mv.format != "B" else mv
+        n = len(mv)
+        i = 0
+        while i < n:
+            if self._fill == 0:
+                self._t = time.perf_counter() - self._t0
+            take = min(n - i, self.block_bytes - self._fill)
+            self._buf[self._fill:self._fill + take] = mv[i:i + take]
+            self._fill += take
+            i += take
+            if self._fill == self.block_bytes:
+                self._emit()
+        return n
+
+    def _emit(self) -> None:
+        raw = memoryview(self._buf)[:self._fill]
+        codec, payload = self.codec, raw
+        if codec == 1:
+            payload = zlib.compress(raw, 1)
+        elif codec == 2:
+            payload = _delta_encode(raw, self.dtype, self.channels)
+        if len(payload) >= len(raw):
+            codec, payload = 0, raw
+        self._index.append((self._pos, self._t))
+        self._f.write(_BLOCK.pack(_BLOCK_MAGIC, codec, len(self._index) - 1, self._t,
+                                  len(raw), len(payload)))
+        self._f.write(payload)
+        self._pos += _BLOCK.size + len(payload)
+        self.bytes_raw += len(raw)
+        self.bytes_stored += len(payload)
+        self._fill = 0
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        if self._fill:
+            self._emit()
+        index_offset = self._pos
+        self._f.write(np.array(self._index, dtype=_ENTRY).tobytes())
+        self._f.seek(0)
+        self._f.write(self._header(index_offset))
+        self._f.close()
+
+    def summary(self) -> str:
+        ratio = self.bytes_stored / self.bytes_raw if self.bytes_raw else 1.0
+        return (
+            f"CAPTURE blocks={len(self._index)} codec={_CODEC_NAMES[self.codec]} "
+            f"block_bytes={self.block_bytes} bytes_raw={self.bytes_raw} "
+            f"bytes_stored={self.bytes_stored} ratio={ratio:.3f} dropped={self.dropped}"
+        )
+
+
+# ---- reader ----
+
+class CaptureFile:
+    """
+    Reads a capture written by CaptureWriter.
+
+    The file is memory-mapped: blocks stored uncompressed come back as
+    read-only NumPy views of the map (no copy); compressed blocks are
+    decoded into a fresh array. Samples are shaped (frames, channels); a
+    trailing partial frame, if the capture ended mid-frame, is not included.
+
+    Time offsets (block_at(), duration_s) are sample time: frame k is at
+    k / fs seconds. Every block but the last holds block_frames frames, so
+    block_at(t) is a direct index computation, O(1). Chunks dropped before
+    reaching the file (header `dropped`) are not in the sample count, so
+    after a drop sample time runs behind the wall clock. Each block's
+    arrival time, as measured by the writer, is kept separately as Block.t
+    and index["t"]. A file whose writer never closed it has no index; it
+    is rebuilt by walking the block headers.
+
+    Usage:
+        with CaptureFile("capture.osc") as cap:
+            for blk in cap.blocks(start=cap.block_at(2.0)):
+                process(blk.t, blk.samples)
+    """
+    def __init__(self, path: str) -> None:
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._f.close()
+            raise ValueError(f"{path}: not a capture file")
+        (magic, version, codec, dtype, channels, block_bytes, samplerate, t0,
+         blocks, index_offset, dropped) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a capture file")
+        self.codec = _CODEC_NAMES.get(codec, str(codec))
+        self.dtype = np.dtype(dtype.rstrip(b"\x00").decode("ascii"))
+        self.channels = channels
+        self.block_bytes = block_bytes
+        self.block_frames = block_bytes // (self.dtype.itemsize * channels)
+        self.samplerate = samplerate
+        self.start_time = t0   # wall clock (time.time()) at the first byte
+        self.dropped = dropped
+        if index_offset:
+            self.index = np.frombuffer(self._mm, dtype=_ENTRY, count=blocks, offset=index_offset)
+        else:
+            self.index = self._scan()
+
+    def _scan(self) -> np.ndarray:
+        entries = []
+        pos = HEADER_SIZE
+        end = len(self._mm)
+        while pos + _BLOCK.size <= end:
+            magic, _codec, _seq, t, _raw, stored = _BLOCK.unpack_from(self._mm, pos)
+            if magic != _BLOCK_MAGIC or pos + _BLOCK.size + stored > end:
+                break
+            entries.append((pos, t))
+            pos += _BLOCK.size + stored
+        return np.array(entries, dtype=_ENTRY)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def frames(self) -> int:
+        """Total whole frames: full blocks plus the (possibly short) last one."""
+        n = len(self)
+        if n == 0:
+            return 0
+        raw = _BLOCK.unpack_from(self._mm, int(self.index["offset"][n - 1]))[4]
+        return (n - 1) * self.block_frames + raw // (self.dtype.itemsize * self.channels)
+
+    @property
+    def duration_s(self) -> float:
+        """Sample-time length of the capture, frames / fs."""
+        return self.frames / self.samplerate
+
+    def block(self, i: int) -> Block:
+        pos = int(self.index["offset"][i])
+        magic, codec, seq, t, raw, stored = _BLOCK.unpack_from(self._mm, pos)
+        if magic != _BLOCK_MAGIC:
+            raise ValueError(f"corrupt block {i} at offset {pos}")
+        data = pos + _BLOCK.size
+        frames = raw // (self.dtype.itemsize * self.channels)
+        if codec == 0:
+            samples = np.frombuffer(self._mm, dtype=self.dtype, count=frames * self.channels,
+                                    offset=data)
+        elif codec == 1:
+            samples = np.frombuffer(zlib.decompress(self._mm[data:data + stored]), dtype=self.dtype,
+                                    count=frames * self.channels)
+        elif codec == 2:
+            samples = _delta_decode(self._mm[data:data + stored], frames, self.dtype, self.channels)
+        else:
+            raise ValueError(f"block {i}: unknown codec {codec}")
+        return Block(seq, t, samples.reshape(frames, self.channels))
+
+    def blocks(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Block]:
+        for i in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield self.block(i)
+
+    def block_at(self, t: float) -> int:
+        """Index of the block holding sample time t (seconds; frame t * fs), clamped to the capture."""
+        n = len(self)
+        if n == 0:
+            raise IndexError("empty capture")
+        return min(n - 1, max(0, int(t * self.samplerate) // max(1, self.block_frames)))
+
+    def close(self) -> None:
+        self.index = None
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # views handed out by block() still reference the map
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self) -> "CaptureFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,17 +1,121 @@
 # oscifgen/cli.py
 import argparse
+import json
 
-from .reader import Reader
-from .writer import Writer
-from .file_device import FileDevice
-from .mic_device import MicrophoneDevice
-from .wavegen import Wave
-from .script_runner import ScriptRunner
+from .devices import make_device
+
+# Subcommand modules are imported inside their branches so that, e.g., an
+# acquire from a .in file loads neither NumPy nor sounddevice/PortAudio.
 
 
 def run_command(args: argparse.Namespace) -> None:
+    from .script_runner import ScriptRunner
     runner = ScriptRunner(args.script)
     runner.run()
+    if runner.status:
+        raise SystemExit(runner.status)
+
+
+def multi_command(args: argparse.Namespace) -> None:
+    from .aio_engine import AsyncEngine
+    with open(args.config, "r") as f:
+        doc = json.load(f)
+    eng = AsyncEngine(tick_s=args.tick)
+    for spec in doc.get("channels", []):
+        try:
+            eng.add_channel(spec)
+        except (RuntimeError, ValueError) as e:
+            raise SystemExit(str(e))
+    status = eng.first_failure(eng.run())
+    if status:
+        raise SystemExit(status)
+
+
+def batch_command(args: argparse.Namespace) -> None:
+    from .batch import run_batch
+    with open(args.matrix, "r") as f:
+        doc = json.load(f)
+    raise SystemExit(run_batch(doc, workers=args.workers))
+
+
+def _add_adapt_args(sp: argparse.ArgumentParser, unit: str) -> None:
+    # unit matches the subcommand's --chunk: bytes for acquire, frames for generate
+    sp.add_argument("--adapt", action="store_true",
+                    help="Resize chunks during the run from measured per-chunk cost")
+    sp.add_argument("--chunk-min", type=int, default=64,
+                    help=f"Smallest adaptive chunk in {unit}")
+    sp.add_argument("--chunk-max", type=int, default=65536,
+                    help=f"Largest adaptive chunk in {unit}")
+    sp.add_argument("--target-latency", type=float, default=None,
+                    help="Adaptive: keep chunk period + p95 service time under this many seconds")
+    sp.add_argument("--cpu-budget", type=float, default=None,
+                    help="Adaptive: busy fraction of each chunk period to aim below (default 0.5)")
+
+
+def _adapt_policy(args: argparse.Namespace):
+    if not args.adapt:
+        return None
+    from .adaptive import AdaptPolicy
+    return AdaptPolicy(chunk_min=args.chunk_min, chunk_max=args.chunk_max,
+                       target_latency_s=args.target_latency, cpu_budget=args.cpu_budget)
+
+
+def _add_container_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--container", action="store_true",
+                    help="Write a self-describing capture (header, timestamped blocks, index)")
+    sp.add_argument("--codec", choices=["none", "zlib", "delta"], default="none",
+                    help="Container: per-block compression (delta = delta+varint, integer samples)")
+    sp.add_argument("--dtype", default="int16",
+                    help="Container/--stats/--pyramid: sample dtype of the input")
+    sp.add_argument("--channels", type=int, default=1,
+                    help="Container/--stats/--pyramid: interleaved channel count")
+    sp.add_argument("--samplerate", type=float, default=None,
+                    help="Container/--stats/--pyramid: sample rate in Hz "
+                         "(default: device rate, else bytes/s per frame)")
+    sp.add_argument("--block", type=int, default=65536,
+                    help="Container: raw bytes per block")
+
+
+def _add_stats_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--stats", action="store_true",
+                    help="Analyze the stream while reading: mean/std/RMS/peak, zero crossings, Welch spectrum")
+    sp.add_argument("--nfft", type=int, default=1024,
+                    help="--stats: Welch segment length in frames")
+    sp.add_argument("--stats-every", type=float, default=None,
+                    help="--stats: also print STATS lines every this many seconds")
+
+
+def _analytics(args: argparse.Namespace):
+    if not args.stats:
+        return None
+    from .analytics import AnalyticsConfig
+    return AnalyticsConfig(dtype=args.dtype, channels=args.channels, samplerate=args.samplerate,
+                           nfft=args.nfft, every_s=args.stats_every)
+
+
+def _add_pyramid_args(sp: argparse.ArgumentParser) -> None:
+    sp.add_argument("--pyramid", action="store_true",
+                    help="Build a min/max/mean/rms decimation pyramid sidecar while reading")
+    sp.add_argument("--pyramid-base", type=int, default=256,
+                    help="--pyramid: frames per finest bucket (each level doubles it)")
+    sp.add_argument("--pyramid-out", default=None,
+                    help="--pyramid: sidecar path (default <out>.pyr)")
+
+
+def _pyramid(args: argparse.Namespace):
+    if not args.pyramid:
+        return None
+    from .pyramid import PyramidConfig
+    return PyramidConfig(dtype=args.dtype, channels=args.channels, samplerate=args.samplerate,
+                         base=args.pyramid_base, path=args.pyramid_out)
+
+
+def _container(args: argparse.Namespace):
+    if not args.container:
+        return None
+    from .capture import CaptureFormat
+    return CaptureFormat(dtype=args.dtype, channels=args.channels, samplerate=args.samplerate,
+                         block=args.block, codec=args.codec)
 
 
 def main() -> None:
@@ -25,7 +129,8 @@ def main() -> None:
     p_acq = sub.add_parser(
         "acquire", help="reqfRead: read from input and write to output file")
     p_acq.add_argument("--in", dest="in_path", required=True,
-                       help="Input source: .in file or the literal 'mic' for microphone")
+                       help="Input source: .in file, 'mic', or a device URL "
+                            "(file://, mmap://, mic://, tcp://host:port, pipe://-)")
     p_acq.add_argument("--out", dest="out_path", required=True,
                        help="Output file to write captured bytes")
     p_acq.add_argument("--fs", type=float, required=True,
@@ -36,24 +141,62 @@ def main() -> None:
                        help="Loop count (alternative termination condition)")
     p_acq.add_argument("--chunk", type=int, default=512,
                        help="Chunk size in bytes per read")
+    p_acq.add_argument("--mmap", action="store_true",
+                       help="Memory-map the .in file instead of buffered reads")
+    p_acq.add_argument("--ring", type=int, default=None,
+                       help="Ring buffer bytes; enables a separate disk-writer thread")
+    p_acq.add_argument("--spin", type=float, default=0.0,
+                       help="Busy-wait the last SPIN seconds before each tick (lower jitter)")
+    p_acq.add_argument("--batch", type=float, default=0.0,
+                       help="Target seconds between wakeups; chunks in between run back-to-back")
+    _add_adapt_args(p_acq, "bytes")
+    _add_container_args(p_acq)
+    _add_stats_args(p_acq)
+    _add_pyramid_args(p_acq)
 
     # --- generate: reqfWrite ---
     p_gen = sub.add_parser(
-        "generate", help="reqfWrite: generate waveform bytes to output")
+        "generate", help="reqfWrite: generate waveform frames to output")
     p_gen.add_argument("--out", dest="out_path", required=True,
-                       help="Output file for generated bytes")
+                       help="Output file or device URL (file://, mmap://, tcp://host:port, pipe://-)")
     p_gen.add_argument("--fo", type=float, required=True,
                        help="Output frequency in Hz")
     p_gen.add_argument("--wave", choices=["sine", "square", "triangle"], default="sine",
                        help="Waveform type")
     p_gen.add_argument("--amp", type=float, default=1.0,
                        help="Wave amplitude (unitless)")
+    p_gen.add_argument("--fs", type=float, default=None,
+                       help="Sample rate in Hz; enables DDS synthesis of a true fo-Hz wave "
+                            "and paces output at fs frames/s (fs/chunk chunks/s)")
     p_gen.add_argument("--n", type=int, default=None,
-                       help="Total number of bytes to write")
+                       help="Total number of frames to write (one sample per channel)")
     p_gen.add_argument("--loops", type=int, default=None,
                        help="Loop count (alternative termination)")
     p_gen.add_argument("--chunk", type=int, default=512,
-                       help="Chunk size in bytes per write")
+                       help="Frames per write")
+    p_gen.add_argument("--dtype", choices=["uint8", "int16", "float32"], default="uint8",
+                       help="Sample format (uint8 is the original 0..255 byte stream)")
+    p_gen.add_argument("--channels", type=int, default=None,
+                       help="Interleaved channels, all using --wave/--amp")
+    p_gen.add_argument("--channel", action="append", default=None, metavar="WAVE[:AMP[:PHASE]]",
+                       help="One channel (repeat per channel), e.g. sine:1.0:0 --channel sine:1.0:90; "
+                            "phase in degrees")
+    p_gen.add_argument("--mmap", action="store_true",
+                       help="Preallocate the output and write through a memory map")
+    p_gen.add_argument("--pipeline", type=int, default=0,
+                       help="Synthesize up to this many chunks ahead on a producer thread (0 = inline)")
+    p_gen.add_argument("--write-buffer", type=int, default=0,
+                       help="File output: queue this many bytes and write them with one writev "
+                            "(0 = one write per chunk)")
+    p_gen.add_argument("--flush-ms", type=float, default=None,
+                       help="File output: also flush queued chunks once the oldest is this old")
+    p_gen.add_argument("--fsync", action="store_true",
+                       help="File output: fsync on close")
+    p_gen.add_argument("--spin", type=float, default=0.0,
+                       help="Busy-wait the last SPIN seconds before each tick (lower jitter)")
+    p_gen.add_argument("--batch", type=float, default=0.0,
+                       help="Target seconds between wakeups; chunks in between run back-to-back")
+    _add_adapt_args(p_gen, "frames")
 
     # --- run: script mode ---
     p_script = sub.add_parser(
@@ -61,44 +204,102 @@ def main() -> None:
     p_script.add_argument("--script", required=True,
                           help="Path to JSON script file")
 
+    # --- multi: many channels on one asyncio loop ---
+    p_multi = sub.add_parser(
+        "multi", help="Run many acquire/generate channels concurrently (asyncio)")
+    p_multi.add_argument("--config", required=True,
+                         help='JSON file: {"channels": [{...start-style params...}, ...]}')
+    p_multi.add_argument("--tick", type=float, default=0.001,
+                         help="Timer-wheel resolution in seconds")
+
+    # --- batch: many generate runs across a process pool ---
+    p_batch = sub.add_parser(
+        "batch", help="Generate a parameter matrix of outputs in parallel processes")
+    p_batch.add_argument("--matrix", required=True,
+                         help="JSON file with jobs and/or a parameter matrix")
+    p_batch.add_argument("--workers", type=int, default=None,
+                         help="Worker processes (default: CPU count)")
+
     args = p.parse_args()
 
     if args.cmd == "run":
         run_command(args)
         return
 
+    if args.cmd == "multi":
+        multi_command(args)
+        return
+
+    if args.cmd == "batch":
+        batch_command(args)
+        return
+
     if args.cmd == "acquire":
+        from .reader import Reader
         # Decide which device to use based on the --in argument
-        if args.in_path.lower().startswith("mic"):
-            dev = MicrophoneDevice()
-        else:
-            dev = FileDevice()
+        try:
+            dev, in_path = make_device(args.in_path, "mmap" if args.mmap else "file")
+        except RuntimeError as e:
+            raise SystemExit(str(e))
 
-        Reader().run(
+        status = Reader().run(
             dev=dev,
-            in_path=args.in_path,
+            in_path=in_path,
             out_path=args.out_path,
             fs=args.fs,
             n=args.n,
             loops=args.loops,
             chunk=args.chunk,
+            ring=args.ring,
+            spin=args.spin,
+            batch=args.batch,
+            adapt=_adapt_policy(args),
+            container=_container(args),
+            analyze=_analytics(args),
+            pyramid=_pyramid(args),
         )
+        if status:
+            raise SystemExit(status)
         return
 
     if args.cmd == "generate":
-        dev = FileDevice()
+        from .writer import Writer
+        from .wavegen import Wave, channel_specs, frame_bytes
+        try:
+            channels = channel_specs(args.channel) if args.channel else args.channels
+        except ValueError as e:
+            raise SystemExit(str(e))
+        size = (args.n if args.n is not None else (args.loops or 0) * args.chunk) \
+            * frame_bytes(args.dtype, channels)
+        # flush-policy options belong to FileDevice; other backends reject them
+        flush = {k: v for k, v in (("buffer", args.write_buffer), ("flush_ms", args.flush_ms),
+                                   ("fsync", args.fsync)) if v}
+        try:
+            dev, out_path = make_device(args.out_path, "mmap" if args.mmap else "file",
+                                        size_hint=size, **flush)
+        except RuntimeError as e:
+            raise SystemExit(str(e))
         w = {"sine": Wave.SINE,
              "square": Wave.SQUARE,
              "triangle": Wave.TRIANGLE}[args.wave]
 
-        Writer().run(
+        status = Writer().run(
             dev=dev,
-            out_path=args.out_path,
+            out_path=out_path,
             fo=args.fo,
             wave=w,
             amp=args.amp,
             n=args.n,
             loops=args.loops,
             chunk=args.chunk,
+            fs=args.fs,
+            spin=args.spin,
+            batch=args.batch,
+            adapt=_adapt_policy(args),
+            pipeline=args.pipeline,
+            dtype=args.dtype,
+            channels=channels,
         )
+        if status:
+            raise SystemExit(status)
         return
@@ -13,6 +13,18 @@ class Device(ABC):
     def close(self) -> None: ...
     @abstractmethod
     def read(self, n: int) -> IoResult: ...
+    def read_into(self, buf: memoryview) -> IoResult:
+        """
+        Fill buf with up to len(buf) bytes of input; IoResult.bytes is the count.
+        This default is built on read(), which reports only a count, so those
+        bytes are zero-filled (what Reader recorded before read_into existed);
+        backends override it to copy the real input into buf.
+        """
+        r = self.read(len(buf))
+        k = min(r.bytes, len(buf))
+        if k > 0 and not r.err:
+            buf[:k] = bytes(k)
+        return r
     @abstractmethod
     def write(self, data: bytes) -> IoResult: ...
     @abstractmethod
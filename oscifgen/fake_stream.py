@@ -0,0 +1,84 @@
+# oscifgen/fake_stream.py
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+
+@dataclass
+class FakeCallbackFlags:
+    """The part of sounddevice.CallbackFlags the capture code looks at."""
+    input_overflow: bool = False
+
+    def __bool__(self) -> bool:
+        return self.input_overflow
+
+
+class FakeInputStream:
+    """
+    Headless stand-in for sounddevice.InputStream in callback mode
+    (mic://?fake=1), so capture code runs on CI without PortAudio.
+
+    A thread calls callback(indata, frames, time_info, status) with blocks
+    of a `freq` Hz test tone at the real-time block rate. Like PortAudio,
+    it reuses one indata array for every block, so callbacks must copy the
+    samples out. A block delivered more than one block period late is
+    flagged input_overflow, as a real device would after losing input.
+    """
+    def __init__(self, samplerate: float = 44100, channels: int = 1, dtype: str = "int16",
+                 blocksize: int = 0, callback: Optional[Callable] = None,
+                 freq: float = 440.0, amp: float = 0.5, **_ignored) -> None:
+        self.samplerate = float(samplerate)
+        self.channels = int(channels)
+        self.dtype = np.dtype(dtype)
+        self.blocksize = int(blocksize) or 256
+        self.callback = callback
+        self.freq = float(freq)
+        self.amp = float(amp)
+        self._thread: Optional[threading.Thread] = None
+        self._halt = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._run, name="fake-input-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._halt.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        bs = self.blocksize
+        period = bs / self.samplerate
+        indata = np.zeros((bs, self.channels), dtype=self.dtype)
+        full = np.iinfo(self.dtype).max if self.dtype.kind == "i" else 1.0
+        step = 2.0 * np.pi * self.freq / self.samplerate
+        ramp = np.arange(bs) * step
+        phase = 0.0
+        nxt = time.perf_counter()
+        while not self._halt.is_set():
+            tone = np.sin(ramp + phase) * (self.amp * full)
+            phase = (phase + bs * step) % (2.0 * np.pi)
+            indata[:] = tone[:, None].astype(self.dtype)
+            late = time.perf_counter() - nxt > period
+            self.callback(indata, bs, None, FakeCallbackFlags(input_overflow=late))
+            nxt += period
+            dt = nxt - time.perf_counter()
+            if dt > 0:
+                time.sleep(dt)
+            elif -dt > period:
+                nxt = time.perf_counter()  # fell behind: skip ahead, like a device dropping input
@@ -1,18 +1,56 @@
 from __future__ import annotations
+import os
+import time
+
 from .device import Device, IoResult
 
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
 class FileDevice(Device):
     """
     Convention:
       - If path ends with ".in": open file for reading (mock input stream).
       - Otherwise: open file for writing (mock output sink).
+    mode="r" or mode="w" overrides the convention (file://x.dat?mode=r).
+
+    Output flush policy (file://x.out?buffer=65536&flush_ms=50&fsync=1):
+      - buffer=0 (default): every write() goes straight to the file, one
+        write(2) per chunk.
+      - buffer=N: write-behind. Chunks are queued and written together with
+        one writev(2) once N bytes are queued (every N bytes), and on close.
+      - flush_ms=T: also flush when the oldest queued chunk is T ms old
+        (checked on each write, so an idle output is flushed on close).
+      - fsync=True: fsync(2) the file on close, for durability.
+    Counters (syscalls, bytes per syscall, flushes, fsyncs) are reported by
+    io_summary(), which Writer prints after its PACE line. A failure while
+    flushing, fsyncing or closing in close() cannot be returned from it, so
+    it is kept in .error (reset by open()); Writer checks it after close()
+    and fails the run.
     """
-    def __init__(self) -> None:
+    def __init__(self, mode: str | None = None, buffer: int = 0,
+                 flush_ms: float | None = None, fsync: bool = False) -> None:
+        self.mode = mode
+        self.buffer = max(0, int(buffer))
+        self.flush_ms = flush_ms
+        self.fsync = bool(fsync)
         self._in = None
-        self._out = None
+        self._out = None     # raw fd of the output file
+        self._queue = []     # write-behind chunks, oldest first
+        self._queued = 0
+        self._since = 0.0    # when the oldest queued chunk arrived
+        self.syscalls = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self.error = ""
 
     def open(self, path: str) -> bool:
-        if path.endswith(".in"):
+        self.error = ""
+        if self.mode == "r" or (self.mode is None and path.endswith(".in")):
             try:
                 self._in = open(path, "rb")
                 return True
@@ -20,7 +58,7 @@ class FileDevice(Device):
                 return False
         else:
             try:
-                self._out = open(path, "wb")
+                self._out = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
                 return True
             except OSError:
                 return False
@@ -28,10 +66,22 @@ class FileDevice(Device):
     def close(self) -> None:
         if self._in and not self._in.closed:
             self._in.close()
-        if self._out and not self._out.closed:
-            self._out.close()
+        if self._out is not None:
+            try:
+                self.flush()
+                if self.fsync:
+                    os.fsync(self._out)
+                    self.fsyncs += 1
+            except OSError as e:
+                self.error = f"close-error:{e}"
+            try:
+                os.close(self._out)
+            except OSError as e:
+                self.error = self.error or f"close-error:{e}"
         self._in = None
         self._out = None
+        self._queue = []
+        self._queued = 0
 
     def read(self, n: int) -> IoResult:
         if not self._in:
@@ -44,15 +94,70 @@ class FileDevice(Device):
         except OSError as e:
             return IoResult(0, f"read-error:{e}")
 
+    def read_into(self, buf: memoryview) -> IoResult:
+        if not self._in:
+            return IoResult(-1, "not-open-input")
+        try:
+            got = self._in.readinto(buf)
+            return IoResult(got or 0, "")
+        except OSError as e:
+            return IoResult(0, f"read-error:{e}")
+
     def write(self, data: bytes) -> IoResult:
-        if not self._out:
+        if self._out is None:
             return IoResult(-1, "not-open-output")
+        n = len(data)
         try:
-            self._out.write(data)
-            self._out.flush()
-            return IoResult(len(data), "")
+            if not self.buffer:
+                self._write_all([data])
+                return IoResult(n, "")
+            if not self._queue:
+                self._since = time.perf_counter()
+            # callers may reuse their buffer; only immutable bytes are queued as-is
+            self._queue.append(data if isinstance(data, bytes) else bytes(data))
+            self._queued += n
+            if self._queued >= self.buffer or (
+                    self.flush_ms is not None
+                    and (time.perf_counter() - self._since) * 1000.0 >= self.flush_ms):
+                self.flush()
+            return IoResult(n, "")
         except OSError as e:
             return IoResult(0, f"write-error:{e}")
 
+    def flush(self) -> None:
+        """Write out every queued chunk (raises OSError)."""
+        if not self._queue:
+            return
+        queue, self._queue, self._queued = self._queue, [], 0
+        self._write_all(queue)
+        self.flushes += 1
+
+    def _write_all(self, chunks: list) -> None:
+        # writev() in IOV_MAX groups; resume after short writes
+        i = 0
+        while i < len(chunks):
+            group = chunks[i:i + _IOV_MAX]
+            want = sum(len(c) for c in group)
+            done = os.writev(self._out, group) if len(group) > 1 else os.write(self._out, group[0])
+            self.syscalls += 1
+            self.bytes_written += done
+            if done < want:
+                # short write: rebuild the rest of this group and go again
+                rest = memoryview(b"".join(group))[done:]
+                while rest:
+                    k = os.write(self._out, rest)
+                    self.syscalls += 1
+                    self.bytes_written += k
+                    rest = rest[k:]
+            i += len(group)
+
+    def io_summary(self) -> str:
+        bps = self.bytes_written / self.syscalls if self.syscalls else 0.0
+        line = (
+            f"IO syscalls={self.syscalls} bytes_written={self.bytes_written} "
+            f"bytes_per_syscall={bps:.1f} flushes={self.flushes} fsyncs={self.fsyncs}"
+        )
+        return line + (f" error={self.error}" if self.error else "")
+
     def is_connected(self) -> bool:
-        return (self._in and not self._in.closed) or (self._out and not self._out.closed)
+        return (self._in and not self._in.closed) or self._out is not None
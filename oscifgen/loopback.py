@@ -1,41 +1,116 @@
-# oscifgen/loopctl.py
-from dataclasses import dataclass
+# oscifgen/loopback.py
+from __future__ import annotations
 import threading
+import time
+from typing import Dict, Optional
 
-@dataclass
-class LoopPlan:
-    n_bytes: int | None    # total target bytes/samples; None = ignore
-    loops: int | None      # max loop iterations/chunks; None = ignore
-    chunk: int             # bytes per read/write
-
-class StopToken:
-    def __init__(self) -> None:
-        self._evt = threading.Event()
-    def stop(self) -> None:
-        self._evt.set()
-    def stopped(self) -> bool:
-        return self._evt.is_set()
-
-class LoopController:
-    def __init__(self, plan: LoopPlan) -> None:
-        self.plan = plan
-        self._bytes = 0
-        self._loops = 0
-        self._lock = threading.Lock()
-
-    def step(self, bytes_this_chunk: int) -> None:
-        with self._lock:
-            self._bytes += bytes_this_chunk
-            self._loops += 1
-
-    def continue_running(self) -> bool:
-        with self._lock:
-            ok_n = (self.plan.n_bytes is None) or (self._bytes < self.plan.n_bytes)
-            ok_l = (self.plan.loops   is None) or (self._loops < self.plan.loops)
-            return ok_n and ok_l
-
-    @property
-    def totals(self) -> tuple[int,int]:
-        with self._lock:
-            return self._bytes, self._loops
+from .device import Device, IoResult
+from .ringbuffer import RingBuffer
 
+
+class _Channel:
+    """Bounded byte pipe shared by every LoopbackDevice opened on one name."""
+    def __init__(self, capacity: int) -> None:
+        self.rb = RingBuffer(capacity)
+        self.cond = threading.Condition()
+        self.eof = False       # a writer closed; readers drain then see EOF
+        self.users = 0
+
+
+_channels: Dict[str, _Channel] = {}
+_channels_lock = threading.Lock()
+
+
+class LoopbackDevice(Device):
+    """
+    In-memory loopback (loop://name): a Writer on one LoopbackDevice feeds
+    a Reader on another opened with the same name, through a bounded
+    RingBuffer of `capacity` bytes. No disk, no syscalls.
+
+    write() blocks while the buffer is full and read_into() blocks while it
+    is empty, each for at most `timeout` seconds ("loopback-timeout").
+    Once a device that wrote is closed, readers drain what is left and then
+    read 0 bytes (EOF). The first open() of a name sets its capacity; the
+    channel goes away once its last user has closed and it is empty.
+    """
+    def __init__(self, capacity: int = 1 << 20, timeout: float = 5.0) -> None:
+        self.capacity = int(capacity)
+        self.timeout = float(timeout)
+        self._name: Optional[str] = None
+        self._ch: Optional[_Channel] = None
+        self._wrote = False
+        self._scratch = bytearray()
+
+    def open(self, path: str) -> bool:
+        if self.capacity <= 0:
+            return False
+        name = path or "default"
+        with _channels_lock:
+            ch = _channels.get(name)
+            if ch is None:
+                ch = _channels[name] = _Channel(self.capacity)
+            ch.users += 1
+        self._name, self._ch, self._wrote = name, ch, False
+        return True
+
+    def close(self) -> None:
+        ch = self._ch
+        if ch is None:
+            return
+        if self._wrote:
+            with ch.cond:
+                ch.eof = True
+                ch.cond.notify_all()
+        with _channels_lock:
+            ch.users -= 1
+            # keep unread data around for a reader that has not opened yet
+            if ch.users <= 0 and not len(ch.rb) and _channels.get(self._name) is ch:
+                del _channels[self._name]
+        self._name = self._ch = None
+
+    def read(self, n: int) -> IoResult:
+        if len(self._scratch) < n:
+            self._scratch = bytearray(n)
+        return self.read_into(memoryview(self._scratch)[:n])
+
+    def read_into(self, buf: memoryview) -> IoResult:
+        ch = self._ch
+        if ch is None:
+            return IoResult(-1, "not-open-input")
+        deadline = time.monotonic() + self.timeout
+        with ch.cond:
+            while not len(ch.rb):
+                if ch.eof:
+                    return IoResult(0, "")
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return IoResult(0, "loopback-timeout")
+                ch.cond.wait(left)
+            got = ch.rb.read_into(buf)
+            ch.cond.notify_all()
+        return IoResult(got, "")
+
+    def write(self, data: bytes) -> IoResult:
+        ch = self._ch
+        if ch is None:
+            return IoResult(-1, "not-open-output")
+        self._wrote = True
+        view = memoryview(data)
+        done = 0
+        deadline = time.monotonic() + self.timeout
+        with ch.cond:
+            ch.eof = False
+            while done < len(view):
+                room = ch.rb.free()
+                if not room:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return IoResult(done, "loopback-timeout")
+                    ch.cond.wait(left)
+                    continue
+                done += ch.rb.write_from(view[done:done + room])
+                ch.cond.notify_all()
+        return IoResult(done, "")
+
+    def is_connected(self) -> bool:
+        return self._ch is not None
@@ -1,8 +1,12 @@
 # oscifgen/mic_device.py
 from __future__ import annotations
-from .device import Device, IoResult
+import threading
+import time
+
+import numpy as np
 
-import sounddevice as sd
+from .device import Device, IoResult
+from .ringbuffer import RingBuffer
 
 
 class MicrophoneDevice(Device):
@@ -11,29 +15,72 @@ class MicrophoneDevice(Device):
     source. It implements the same Device interface used by Reader/Writer.
 
     open(path: str) ignores the path (kept only to satisfy the interface).
+
+    The input stream runs in callback mode: PortAudio's callback copies
+    each block straight into a preallocated RingBuffer holding ring_s
+    seconds of audio, and reads are served from that ring. read_view()
+    lends a zero-copy view of the ring (valid until the next read), so the
+    Reader takes no per-read allocation at all. A read waits up to
+    `timeout` seconds for data; if none arrives it returns 0 bytes (EOF).
+
+    Dropped audio is counted rather than ignored:
+      overflows   - blocks PortAudio flagged input_overflow, plus blocks
+                    dropped because the ring was full (reader too slow)
+      underflows  - reads that found less audio than asked for and waited
+    Both are reported by input_summary(), which Reader prints after READ.
+
+    fake=True (mic://?fake=1) captures from a FakeInputStream test tone
+    instead, which needs neither sounddevice nor an audio device.
     """
 
-    def __init__(self, samplerate: int = 44100, channels: int = 1, dtype: str = "int16") -> None:
+    def __init__(self, samplerate: int = 44100, channels: int = 1, dtype: str = "int16",
+                 blocksize: int = 0, ring_s: float = 1.0, timeout: float = 1.0,
+                 fake: bool = False) -> None:
         self.samplerate = samplerate
         self.channels = channels
         self.dtype = dtype
-        self._stream: sd.InputStream | None = None
+        self.blocksize = blocksize
+        self.ring_s = ring_s
+        self.timeout = timeout
+        self.fake = fake
+        self._frame = np.dtype(dtype).itemsize * channels  # bytes per frame
+        self._stream = None
+        self._rb: RingBuffer | None = None
+        self._ready = threading.Event()
+        self.status_overflows = 0
+        self.underflows = 0
 
     def open(self, path: str) -> bool:
         """Open the default microphone input."""
         try:
-            self._stream = sd.InputStream(
+            if self.fake:
+                from .fake_stream import FakeInputStream as InputStream
+            else:
+                from sounddevice import InputStream
+            frames = max(1, int(self.samplerate * self.ring_s))
+            self._rb = RingBuffer(frames * self._frame)
+            self._stream = InputStream(
                 samplerate=self.samplerate,
                 channels=self.channels,
                 dtype=self.dtype,
+                blocksize=self.blocksize,
+                callback=self._callback,
             )
             self._stream.start()
             return True
         except Exception as e:
             print(f"Microphone open failed: {e}")
             self._stream = None
+            self._rb = None
             return False
 
+    def _callback(self, indata, frames, time_info, status) -> None:
+        # runs on the audio thread: one copy into the ring, nothing else
+        if status and status.input_overflow:
+            self.status_overflows += 1
+        self._rb.write_from(memoryview(indata).cast("B"))
+        self._ready.set()
+
     def close(self) -> None:
         if self._stream is not None:
             try:
@@ -42,29 +89,75 @@ class MicrophoneDevice(Device):
             finally:
                 self._stream = None
 
+    def _wait_for(self, want: int) -> None:
+        rb = self._rb
+        if len(rb) >= want:
+            return
+        self.underflows += 1
+        deadline = time.monotonic() + self.timeout
+        while len(rb) < want:
+            self._ready.clear()
+            if len(rb) >= want:
+                break
+            left = deadline - time.monotonic()
+            if left <= 0 or not self._ready.wait(left):
+                break
+
+    def _frames(self, n: int) -> int:
+        # whole frames only; never more than n, so 0 when n is under a frame
+        return n - n % self._frame
+
+    def read_view(self, n: int) -> memoryview:
+        """
+        Up to n bytes (whole frames; empty when n is under one frame) as a view
+        into the capture ring; no copy.
+        The view is valid until the next read.
+        """
+        if self._stream is None:
+            return memoryview(b"")
+        want = self._frames(n)
+        self._rb.read_view(0)  # hand back the previous view first
+        self._wait_for(want)
+        return self._rb.read_view(want)
+
     def read(self, n: int) -> IoResult:
         """
-        Read approximately n bytes from the microphone.
+        Read approximately n bytes from the microphone and discard them,
+        returning only the count. Use read_into() to keep the samples.
+        """
+        if self._stream is None:
+            return IoResult(-1, "not-open-input")
+        return IoResult(len(self.read_view(n)), "")
 
-        NOTE: Reader.py only cares about the *number* of bytes read, not the
-        actual data buffer (it currently writes placeholder bytes). So we just
-        compute the number of bytes produced and return that count.
+    def read_into(self, buf: memoryview) -> IoResult:
+        """
+        Read as many whole frames as fit in buf, copied out of the capture ring.
         """
         if self._stream is None:
             return IoResult(-1, "not-open-input")
+        want = self._frames(len(buf))
+        if not want:
+            return IoResult(0, "")  # less than a frame left to read
+        self._rb.read_view(0)
+        self._wait_for(want)
+        return IoResult(self._rb.read_into(buf[:want]), "")
 
-        # Each int16 sample is 2 bytes per channel.
-        bytes_per_frame = 2 * self.channels
-        frames = max(1, n // bytes_per_frame)
+    @property
+    def overflows(self) -> int:
+        return self.status_overflows + (self._rb.overruns if self._rb is not None else 0)
 
-        try:
-            data, overflowed = self._stream.read(frames)
-            # data is a NumPy array; convert to bytes to know the length
-            buf = data.tobytes()
-            # Trim or pad to approximate n if desired; here we just report len(buf).
-            return IoResult(len(buf), "")
-        except Exception as e:
-            return IoResult(0, f"read-error:{e}")
+    # blocks lost before read_into() saw them; Reader adds these to a capture
+    # container's dropped count
+    dropped = overflows
+
+    def input_summary(self) -> str:
+        rb = self._rb
+        has = rb is not None  # an empty ring is falsy (len 0), so test for None
+        return (
+            f"INPUT overflows={self.overflows} dropped_bytes={rb.dropped_bytes if has else 0} "
+            f"underflows={self.underflows} ring_size={rb.capacity if has else 0} "
+            f"ring_hwm={rb.high_water if has else 0}"
+        )
 
     def write(self, data: bytes) -> IoResult:
         """
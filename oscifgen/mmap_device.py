@@ -0,0 +1,111 @@
+# oscifgen/mmap_device.py
+from __future__ import annotations
+import mmap
+import os
+from typing import Optional
+
+from .device import Device, IoResult
+
+
+class MmapFileDevice(Device):
+    """
+    Memory-mapped variant of FileDevice, same ".in" convention:
+      - path ends with ".in": map the file read-only; read_view() hands out
+        zero-copy slices of the mapping.
+      - otherwise: create the file, preallocate `out_size` bytes and write
+        into a writable mapping (grown by doubling if writes run past it).
+        close() truncates the file to the bytes actually written.
+    mode="r" or mode="w" overrides the ".in" convention, like FileDevice.
+    No per-chunk syscalls on either side; the kernel pages data in and out.
+    """
+    def __init__(self, out_size: Optional[int] = None, mode: Optional[str] = None) -> None:
+        self.out_size = out_size
+        self.mode = mode
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._reading = False
+        self._pos = 0
+        self._size = 0
+
+    def open(self, path: str) -> bool:
+        self._reading = self.mode == "r" or (self.mode is None and path.endswith(".in"))
+        try:
+            if self._reading:
+                self._fd = os.open(path, os.O_RDONLY)
+                self._size = os.fstat(self._fd).st_size
+                if self._size:
+                    self._mm = mmap.mmap(self._fd, self._size, access=mmap.ACCESS_READ)
+            else:
+                self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+                self._size = max(mmap.PAGESIZE, int(self.out_size or 0))
+                os.ftruncate(self._fd, self._size)
+                self._mm = mmap.mmap(self._fd, self._size, access=mmap.ACCESS_WRITE)
+        except (OSError, ValueError):
+            self.close()
+            return False
+        self._view = memoryview(self._mm) if self._mm is not None else None
+        self._pos = 0
+        return True
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            if not self._reading:
+                os.ftruncate(self._fd, self._pos)
+            os.close(self._fd)
+            self._fd = None
+        self._pos = 0
+        self._size = 0
+
+    def read_view(self, n: int) -> memoryview:
+        """Next n bytes (fewer at EOF) as a view into the mapping; no copy."""
+        if self._view is None:
+            return memoryview(b"")
+        end = min(self._size, self._pos + n)
+        v = self._view[self._pos:end]
+        self._pos = end
+        return v
+
+    def read(self, n: int) -> IoResult:
+        if self._fd is None or not self._reading:
+            return IoResult(-1, "not-open-input")
+        return IoResult(len(self.read_view(n)), "")
+
+    def read_into(self, buf: memoryview) -> IoResult:
+        if self._fd is None or not self._reading:
+            return IoResult(-1, "not-open-input")
+        v = self.read_view(len(buf))
+        buf[:len(v)] = v
+        return IoResult(len(v), "")
+
+    def write(self, data: bytes) -> IoResult:
+        if self._mm is None or self._reading:
+            return IoResult(-1, "not-open-output")
+        n = len(data)
+        try:
+            if self._pos + n > self._size:
+                self._grow(self._pos + n)
+            self._view[self._pos:self._pos + n] = data
+        except (OSError, ValueError) as e:
+            return IoResult(0, f"write-error:{e}")
+        self._pos += n
+        return IoResult(n, "")
+
+    def _grow(self, need: int) -> None:
+        size = self._size
+        while size < need:
+            size *= 2
+        # the exported view must be released before the map can be resized
+        self._view.release()
+        self._mm.resize(size)
+        self._view = memoryview(self._mm)
+        self._size = size
+
+    def is_connected(self) -> bool:
+        return self._fd is not None
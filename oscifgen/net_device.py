@@ -0,0 +1,73 @@
+# oscifgen/net_device.py
+from __future__ import annotations
+import socket
+from typing import Optional
+
+from .device import Device, IoResult
+
+
+class TcpDevice(Device):
+    """
+    Byte stream over TCP: tcp://host:port.
+
+    By default open() connects to host:port; with listen=True it binds
+    there and accepts a single peer. Reads go straight into the caller's
+    buffer (recv_into); writes use sendall. The same device can read and
+    write, so one URL works for acquire and generate.
+    """
+    def __init__(self, listen: bool = False, timeout: float = 5.0, nodelay: bool = True) -> None:
+        self.listen = listen
+        self.timeout = timeout
+        self.nodelay = nodelay
+        self._sock: Optional[socket.socket] = None
+        self._scratch = bytearray()
+
+    def open(self, path: str) -> bool:
+        host, _, port = path.rpartition(":")
+        try:
+            addr = (host or "localhost", int(port))
+            if self.listen:
+                with socket.create_server(addr) as srv:
+                    srv.settimeout(self.timeout)
+                    self._sock, _ = srv.accept()
+            else:
+                self._sock = socket.create_connection(addr, timeout=self.timeout)
+            self._sock.settimeout(None)
+            if self.nodelay:
+                self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return True
+        except (OSError, ValueError):
+            self._sock = None
+            return False
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def read(self, n: int) -> IoResult:
+        if len(self._scratch) < n:
+            self._scratch = bytearray(n)
+        return self.read_into(memoryview(self._scratch)[:n])
+
+    def read_into(self, buf: memoryview) -> IoResult:
+        if self._sock is None:
+            return IoResult(-1, "not-open-input")
+        try:
+            return IoResult(self._sock.recv_into(buf), "")
+        except OSError as e:
+            return IoResult(0, f"read-error:{e}")
+
+    def write(self, data: bytes) -> IoResult:
+        if self._sock is None:
+            return IoResult(-1, "not-open-output")
+        try:
+            self._sock.sendall(data)
+            return IoResult(len(data), "")
+        except OSError as e:
+            return IoResult(0, f"write-error:{e}")
+
+    def is_connected(self) -> bool:
+        return self._sock is not None
@@ -0,0 +1,42 @@
+# oscifgen/null_device.py
+from __future__ import annotations
+
+from .device import Device, IoResult
+
+
+class NullDevice(Device):
+    """
+    Device that does no I/O at all (null://).
+
+    Reads report the requested number of bytes without touching the
+    buffer; writes accept everything. Running Reader/Writer against it
+    measures the cost of the Python loop itself, with no disk or audio
+    stack underneath. The open() path is ignored.
+    """
+    def __init__(self) -> None:
+        self._open = False
+
+    def open(self, path: str) -> bool:
+        self._open = True
+        return True
+
+    def close(self) -> None:
+        self._open = False
+
+    def read(self, n: int) -> IoResult:
+        if not self._open:
+            return IoResult(-1, "not-open-input")
+        return IoResult(n, "")
+
+    def read_into(self, buf: memoryview) -> IoResult:
+        if not self._open:
+            return IoResult(-1, "not-open-input")
+        return IoResult(len(buf), "")
+
+    def write(self, data: bytes) -> IoResult:
+        if not self._open:
+            return IoResult(-1, "not-open-output")
+        return IoResult(len(data), "")
+
+    def is_connected(self) -> bool:
+        return self._open
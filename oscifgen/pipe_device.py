@@ -0,0 +1,77 @@
+# oscifgen/pipe_device.py
+from __future__ import annotations
+import os
+import sys
+from typing import Optional
+
+from .device import Device, IoResult
+
+
+class PipeDevice(Device):
+    """
+    Unbuffered pipe I/O: pipe://- (stdin/stdout) or pipe://path (a FIFO).
+
+    For "-", reads come from stdin and writes go to stdout (the run's
+    summary lines are printed there too, after the data). For a FIFO the
+    direction follows FileDevice's ".in" convention unless mode="r"/"w"
+    is given; opening blocks until the other end is opened too. Reads land
+    directly in the caller's buffer (os.readv), with no Python-level buffering.
+    """
+    def __init__(self, mode: Optional[str] = None) -> None:
+        self.mode = mode
+        self._rfd: Optional[int] = None
+        self._wfd: Optional[int] = None
+        self._owned = False
+        self._scratch = bytearray()
+
+    def open(self, path: str) -> bool:
+        try:
+            if path in ("", "-"):
+                self._rfd, self._wfd = sys.stdin.fileno(), sys.stdout.fileno()
+                sys.stdout.flush()
+                self._owned = False
+            elif self.mode == "r" or (self.mode is None and path.endswith(".in")):
+                self._rfd = os.open(path, os.O_RDONLY)
+                self._owned = True
+            else:
+                self._wfd = os.open(path, os.O_WRONLY)
+                self._owned = True
+            return True
+        except (OSError, ValueError):
+            self._rfd = self._wfd = None
+            return False
+
+    def close(self) -> None:
+        if self._owned:
+            for fd in (self._rfd, self._wfd):
+                if fd is not None:
+                    os.close(fd)
+        self._rfd = self._wfd = None
+        self._owned = False
+
+    def read(self, n: int) -> IoResult:
+        if len(self._scratch) < n:
+            self._scratch = bytearray(n)
+        return self.read_into(memoryview(self._scratch)[:n])
+
+    def read_into(self, buf: memoryview) -> IoResult:
+        if self._rfd is None:
+            return IoResult(-1, "not-open-input")
+        try:
+            return IoResult(os.readv(self._rfd, [buf]), "")
+        except OSError as e:
+            return IoResult(0, f"read-error:{e}")
+
+    def write(self, data: bytes) -> IoResult:
+        if self._wfd is None:
+            return IoResult(-1, "not-open-output")
+        view = memoryview(data)
+        try:
+            while view:
+                view = view[os.write(self._wfd, view):]
+            return IoResult(len(data), "")
+        except OSError as e:
+            return IoResult(0, f"write-error:{e}")
+
+    def is_connected(self) -> bool:
+        return self._rfd is not None or self._wfd is not None
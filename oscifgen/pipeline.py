@@ -0,0 +1,107 @@
+# oscifgen/pipeline.py
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from .stats import RunStats
+from .wavegen import Waveform
+
+
+class ChunkPipeline:
+    """
+    Synthesizes waveform chunks ahead of a paced consumer (Writer --pipeline).
+
+    A producer thread fills a bounded pool of `depth` reusable buffers
+    (Waveform.next_into, so no per-chunk allocation) and queues them as
+    ready; the consumer takes a ready buffer, writes it, and releases it
+    back to the pool. Synthesis then overlaps the pacing sleep and the
+    device write, and a spike in synthesis cost is absorbed by the chunks
+    already queued. NumPy releases the GIL in the heavy kernels, so a
+    thread is enough.
+
+    plan() is called by the producer for each chunk: it returns the next
+    chunk size, or 0 when the run is fully planned. Devices must be done
+    with a buffer when write() returns (they copy or send it), since the
+    buffer is refilled right after release().
+
+    Counters: underruns (the consumer found no ready chunk and waited) and
+    synth, a RunStats of per-chunk synthesis times.
+    """
+    def __init__(self, wf: Waveform, depth: int, size: int) -> None:
+        self.wf = wf
+        self.depth = max(2, int(depth))
+        self._pool = [bytearray(size) for _ in range(self.depth)]
+        self._free: queue.SimpleQueue = queue.SimpleQueue()
+        for i in range(self.depth):
+            self._free.put(i)
+        self._ready: queue.SimpleQueue = queue.SimpleQueue()
+        self._halt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+        self.underruns = 0
+        self.synth = RunStats()
+
+    def start(self, plan: Callable[[], int]) -> None:
+        """Start the producer and wait until the pool is full (or the plan is done)."""
+        self._thread = threading.Thread(target=self._produce, args=(plan,), daemon=True)
+        self._thread.start()
+        while self._ready.qsize() < self.depth and self._thread.is_alive():
+            time.sleep(0.0005)
+
+    def _produce(self, plan: Callable[[], int]) -> None:
+        try:
+            while not self._halt.is_set():
+                k = plan()
+                if k <= 0:
+                    break
+                i = self._take_free()
+                if i is None:
+                    return
+                t = time.perf_counter()
+                self.wf.next_into(memoryview(self._pool[i])[:k])
+                self.synth.mark_interval(time.perf_counter() - t)
+                self._ready.put((i, k))
+        except BaseException as e:  # surfaced to the consumer by get()
+            self.error = e
+        finally:
+            self._ready.put(None)
+
+    def _take_free(self) -> Optional[int]:
+        while not self._halt.is_set():
+            try:
+                return self._free.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return None
+
+    def get(self) -> Optional[Tuple[int, memoryview]]:
+        """Next ready (buffer id, view), or None once every planned chunk was taken."""
+        try:
+            item = self._ready.get_nowait()
+        except queue.Empty:
+            self.underruns += 1
+            item = self._ready.get()
+        if item is None:
+            if self.error is not None:
+                raise self.error
+            return None
+        i, k = item
+        return i, memoryview(self._pool[i])[:k]
+
+    def release(self, i: int) -> None:
+        self._free.put(i)
+
+    def close(self) -> None:
+        self._halt.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def summary(self) -> str:
+        s = self.synth
+        return (
+            f"PIPE depth={self.depth} underruns={self.underruns} "
+            f"synth_p50_s={s.p50():.6f} synth_p99_s={s.p99():.6f} synth_max_s={max(0.0, s.max):.6f}"
+        )
@@ -0,0 +1,338 @@
+# oscifgen/pyramid.py
+from __future__ import annotations
+import mmap
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Sidecar layout (little-endian):
+#   header       _HEADER
+#   level table  one _LEVEL (data offset, bucket count) per level
+#   level data   per level: min[count, ch], max[count, ch] (sample dtype),
+#                mean[count, ch], rms[count, ch] (float32)
+MAGIC = b"OSCPYR\r\n"
+VERSION = 1
+_HEADER = struct.Struct("<8sH8sHdIQH")
+_LEVEL = struct.Struct("<QQ")
+
+
+@dataclass
+class PyramidConfig:
+    dtype: str = "int16"
+    channels: int = 1
+    samplerate: Optional[float] = None   # Hz; None -> taken from the device/run
+    base: int = 256                      # frames per level-0 bucket
+    path: Optional[str] = None           # sidecar; default <out_path>.pyr
+
+
+class Level(NamedTuple):
+    level: int
+    frames_per_bucket: int
+    t: np.ndarray      # start time (s) of each bucket
+    min: np.ndarray    # (buckets, channels)
+    max: np.ndarray
+    mean: np.ndarray
+    rms: np.ndarray
+    count: np.ndarray  # frames in each bucket (the stream's last bucket may be short)
+
+
+def _pick(base: int, nlevels: int, f0: int, f1: int, width: int) -> int:
+    """Coarsest level that still gives at least `width` buckets over frames [f0, f1)."""
+    span = max(1, f1 - f0)
+    k = 0
+    while k + 1 < nlevels and span // (base << (k + 1)) >= max(1, width):
+        k += 1
+    return k
+
+
+class _Levels(ABC):
+    """Level arrays plus the shared query logic (live builder and sidecar file)."""
+    samplerate: float
+    base: int
+    frames: int
+
+    @abstractmethod
+    def _arrays(self, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(min, max, mean, rms) of level k, each (buckets, channels)."""
+
+    @abstractmethod
+    def _nlevels(self) -> int:
+        """Number of levels."""
+
+    def query(self, t0: float, t1: float, width: int) -> Level:
+        """
+        Buckets covering [t0, t1) seconds from the level that best fits `width`
+        pixels: the coarsest level with at least `width` buckets in the range
+        (so between width and 2*width of them), or level 0 if even that has
+        fewer. Only those buckets are touched.
+        """
+        n = self._nlevels()
+        if n == 0:
+            raise IndexError("empty pyramid")
+        f0 = max(0, int(t0 * self.samplerate))
+        f1 = min(self.frames, max(f0 + 1, int(np.ceil(t1 * self.samplerate))))
+        k = _pick(self.base, n, f0, f1, width)
+        per = self.base << k
+        mn, mx, mean, rms = self._arrays(k)
+        b0, b1 = f0 // per, min(len(mn), -(-f1 // per))
+        t = np.arange(b0, b1) * (per / self.samplerate)
+        count = _weights(b0 * per, max(0, b1 - b0), per, self.frames)
+        return Level(k, per, t, mn[b0:b1], mx[b0:b1], mean[b0:b1], rms[b0:b1], count)
+
+    def columns(self, t0: float, t1: float, width: int):
+        """
+        Exactly min(width, buckets) display columns over [t0, t1): query()'s
+        buckets folded together per column, mean/rms weighted by each
+        bucket's frames (the stream's last bucket may be short). Returns
+        (min, max, mean, rms), each (columns, channels).
+        """
+        lv = self.query(t0, t1, width)
+        m = len(lv.min)
+        if m == 0:
+            empty = np.empty((0, lv.min.shape[1]))
+            return lv.min, lv.max, empty, empty
+        cols = max(1, min(width, m))
+        starts = (np.arange(cols) * m) // cols
+        w = lv.count[:, None]
+        total = np.add.reduceat(w, starts, axis=0)
+        mean = np.add.reduceat(lv.mean.astype(np.float64) * w, starts, axis=0) / total
+        rms = np.sqrt(np.add.reduceat(lv.rms.astype(np.float64) ** 2 * w, starts, axis=0) / total)
+        return (np.minimum.reduceat(lv.min, starts, axis=0),
+                np.maximum.reduceat(lv.max, starts, axis=0), mean, rms)
+
+    @property
+    def duration_s(self) -> float:
+        return self.frames / self.samplerate
+
+
+def _weights(first: int, count: int, per: int, frames: int) -> np.ndarray:
+    """Frames in each of `count` buckets of `per` frames, the first starting at frame `first`."""
+    start = first + np.arange(count, dtype=np.int64) * per
+    return np.clip(frames - start, 0, per)
+
+
+class _Grow:
+    """One level's min/max/mean/rms arrays, grown by doubling (amortized O(1) appends)."""
+    def __init__(self, dtype: np.dtype, channels: int) -> None:
+        self.n = 0
+        self._a = [np.empty((16, channels), dtype=dt)
+                   for dt in (dtype, dtype, np.float32, np.float32)]
+
+    def append(self, arrays: tuple) -> None:
+        m = len(arrays[0])
+        if self.n + m > len(self._a[0]):
+            cap = max(2 * len(self._a[0]), self.n + m)
+            for i, a in enumerate(self._a):
+                grown = np.empty((cap,) + a.shape[1:], dtype=a.dtype)
+                grown[:self.n] = a[:self.n]
+                self._a[i] = grown
+        for a, src in zip(self._a, arrays):
+            a[self.n:self.n + m] = src
+        self.n += m
+
+    def view(self) -> tuple:
+        return tuple(a[:self.n] for a in self._a)
+
+
+class PyramidBuilder(_Levels):
+    """
+    Builds a min/max/mean/rms decimation pyramid incrementally from a sample
+    stream (Reader pyramid=PyramidConfig()).
+
+    Level 0 summarizes every `base` frames; level k+1 combines pairs of
+    level-k buckets, so level k covers base * 2**k frames per bucket. feed()
+    reduces each chunk with whole-array NumPy ops: full buckets are
+    reshaped and reduced, then each level pairs its new buckets (plus one
+    carried over) into the next. Partial frames and buckets carry over to
+    the next chunk, so the stream is never re-read.
+
+    The levels stay in memory (about 2 * frames / base buckets; an hour of
+    44.1 kHz int16 mono at base=256 is ~15 MB) and close() writes them to
+    the sidecar. On close each level's leftover partial bucket is kept as its
+    last bucket; merges weight mean and rms by each bucket's frame count, so
+    a short tail bucket counts for only the frames it holds. query()/
+    columns() also work live, before close().
+    """
+    def __init__(self, path: str, cfg: PyramidConfig, samplerate: float) -> None:
+        if cfg.channels <= 0:
+            raise ValueError("channels must be > 0")
+        if cfg.base <= 0:
+            raise ValueError("base must be > 0")
+        if not samplerate or samplerate <= 0:
+            raise ValueError("samplerate must be > 0")
+        self.path = path
+        self.dtype = np.dtype(cfg.dtype).newbyteorder("<")
+        self.channels = int(cfg.channels)
+        self.samplerate = float(samplerate)
+        self.base = int(cfg.base)
+        self.frames = 0
+        self._frame = self.dtype.itemsize * self.channels
+        self._carry = b""
+        self._pend = np.empty((0, self.channels), dtype=self.dtype)  # frames short of a bucket
+        # per level: its buckets so far, and the odd bucket (with its frame count) waiting for a pair
+        self._parts: List[_Grow] = []
+        self._odd: List[Optional[tuple]] = []
+        with open(path, "wb"):
+            pass  # fail now rather than at close()
+
+    def feed(self, data) -> None:
+        mv = data if isinstance(data, memoryview) else memoryview(data)
+        if self._carry:
+            mv = memoryview(self._carry + bytes(mv))
+        whole = len(mv) - len(mv) % self._frame
+        self._carry = bytes(mv[whole:])
+        if not whole:
+            return
+        x = np.frombuffer(mv[:whole], dtype=self.dtype).reshape(-1, self.channels)
+        self.frames += len(x)
+        if len(self._pend):
+            x = np.concatenate((self._pend, x))
+        full = len(x) - len(x) % self.base
+        self._pend = x[full:].copy()
+        if full:
+            b = x[:full].reshape(-1, self.base, self.channels)
+            f = b.astype(np.float64)
+            self._add(0, (b.min(axis=1), b.max(axis=1),
+                          f.mean(axis=1), np.sqrt((f * f).mean(axis=1))),
+                      np.full(len(b), self.base))
+
+    def _add(self, k: int, buckets: tuple, count: np.ndarray) -> None:
+        """Append buckets (min, max, mean, rms) holding `count` frames each to level k."""
+        while len(self._parts) <= k:
+            self._parts.append(_Grow(self.dtype, self.channels))
+            self._odd.append(None)
+        self._parts[k].append(buckets)
+        odd = self._odd[k]
+        if odd is not None:
+            buckets = tuple(np.concatenate((o, a)) for o, a in zip(odd[0], buckets))
+            count = np.concatenate((odd[1], count))
+        pairs = len(count) // 2 * 2
+        self._odd[k] = (tuple(a[pairs:] for a in buckets), count[pairs:]) if pairs < len(count) else None
+        if pairs:
+            self._add(k + 1, *_pair(tuple(a[:pairs] for a in buckets), count[:pairs]))
+
+    def _finish(self) -> None:
+        # leftover frames become a short last level-0 bucket; each level's odd
+        # bucket then moves up alone, keeping its real frame count as weight
+        if len(self._pend):
+            f = self._pend.astype(np.float64)
+            self._add(0, (self._pend.min(axis=0)[None], self._pend.max(axis=0)[None],
+                          f.mean(axis=0)[None], np.sqrt((f * f).mean(axis=0))[None]),
+                      np.array([len(self._pend)]))
+            self._pend = self._pend[:0]
+        k = 0
+        while k < len(self._odd):
+            odd = self._odd[k]
+            if odd is not None and k + 1 < len(self._parts):
+                self._odd[k] = None
+                self._add(k + 1, *odd)
+            k += 1
+
+    def _nlevels(self) -> int:
+        return len(self._parts)
+
+    def _arrays(self, k: int):
+        return self._parts[k].view()
+
+    def close(self) -> None:
+        self._finish()
+        n = self._nlevels()
+        levels = [self._arrays(k) for k in range(n)]
+        head = _HEADER.pack(MAGIC, VERSION, self.dtype.str.encode("ascii"), self.channels,
+                            self.samplerate, self.base, self.frames, n)
+        pos = _HEADER.size + n * _LEVEL.size
+        table = []
+        for mn, *_ in levels:
+            table.append(_LEVEL.pack(pos, len(mn)))
+            pos += len(mn) * self.channels * (2 * self.dtype.itemsize + 8)
+        with open(self.path, "wb") as f:
+            f.write(head)
+            f.write(b"".join(table))
+            for arrays in levels:
+                for a in arrays:
+                    f.write(np.ascontiguousarray(a).tobytes())
+
+    def summary(self) -> str:
+        n = self._nlevels()
+        buckets = sum(g.n for g in self._parts)
+        size = _HEADER.size + n * _LEVEL.size + buckets * self.channels * (2 * self.dtype.itemsize + 8)
+        return (f"PYRAMID levels={n} base={self.base} buckets={buckets} "
+                f"bytes={size} frames={self.frames} path={self.path}")
+
+
+def _pair(buckets: tuple, count: np.ndarray) -> tuple:
+    """
+    Combine adjacent pairs of buckets; mean and rms are weighted by each
+    bucket's frame count. Returns (buckets, count) for the next level.
+    """
+    mn, mx, mean, rms = (a.reshape(-1, 2, *a.shape[1:]) for a in buckets)
+    w = count.reshape(-1, 2).astype(np.float64)
+    total = w.sum(axis=1)
+    w = w[..., None]
+    mean = (mean.astype(np.float64) * w).sum(axis=1) / total[:, None]
+    rms = np.sqrt((rms.astype(np.float64) ** 2 * w).sum(axis=1) / total[:, None])
+    return (mn.min(axis=1), mx.max(axis=1), mean, rms), count.reshape(-1, 2).sum(axis=1)
+
+
+class PyramidFile(_Levels):
+    """
+    Reads a pyramid sidecar written by PyramidBuilder. The file is
+    memory-mapped and levels are NumPy views into it, so a query reads only
+    the buckets it returns (a zoomed-out view of hours of capture touches a
+    few kilobytes).
+
+    Usage:
+        with PyramidFile("capture.bin.pyr") as pyr:
+            mn, mx, mean, rms = pyr.columns(0.0, pyr.duration_s, width=120)
+    """
+    def __init__(self, path: str) -> None:
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, dtype, channels, samplerate, base, frames,
+             nlevels) = _HEADER.unpack_from(self._mm, 0)
+        except (ValueError, struct.error):
+            self._f.close()
+            raise ValueError(f"{path}: not a pyramid file")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a pyramid file")
+        self.dtype = np.dtype(dtype.rstrip(b"\x00").decode("ascii"))
+        self.channels = channels
+        self.samplerate = samplerate
+        self.base = base
+        self.frames = frames
+        self._levels = []
+        for k in range(nlevels):
+            off, count = _LEVEL.unpack_from(self._mm, _HEADER.size + k * _LEVEL.size)
+            arrays = []
+            for dt in (self.dtype, self.dtype, np.dtype("<f4"), np.dtype("<f4")):
+                arrays.append(np.frombuffer(self._mm, dtype=dt, count=count * channels,
+                                            offset=off).reshape(count, channels))
+                off += count * channels * dt.itemsize
+            self._levels.append(tuple(arrays))
+
+    def _nlevels(self) -> int:
+        return len(self._levels)
+
+    def _arrays(self, k: int):
+        return self._levels[k]
+
+    def close(self) -> None:
+        self._levels = []
+        if getattr(self, "_mm", None) is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # arrays returned by query() still reference the map
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self) -> "PyramidFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,27 +1,21 @@
 from __future__ import annotations
+import threading
 import time
-from statistics import median
-from typing import List, Optional
-from .device import Device
+from typing import TYPE_CHECKING, Optional
+from .device import Device, IoResult
 
 # --- pacing and metrics (unchanged) ---
 from .stats import RunStats, throughput_bytes_per_s
 from .scheduler import Pacer
 # --------------------------------------
+from .ringbuffer import RingBuffer
+from .loopctl import StopToken
+from .adaptive import AdaptPolicy, ChunkTuner
 
-
-def percentile(vals: List[float], p: float) -> float:
-    if not vals:
-        return 0.0
-    vals = sorted(vals)
-    k = (len(vals) - 1) * p
-    f = int(k)
-    c = min(f + 1, len(vals) - 1)
-    if f == c:
-        return vals[f]
-    d0 = vals[f] * (c - k)
-    d1 = vals[c] * (k - f)
-    return d0 + d1
+if TYPE_CHECKING:  # these need NumPy; only import them for runs that use them
+    from .analytics import AnalyticsConfig
+    from .capture import CaptureFormat
+    from .pyramid import PyramidConfig
 
 
 class Reader:
@@ -30,8 +24,39 @@ class Reader:
     Read bytes from input at sampling frequency Fs and write to output file.
     Termination is controlled by N (bytes) and/or loops (iteration count).
     If both are provided, N takes precedence (stop as soon as N is reached).
+
+    With ring=<bytes>, acquisition runs in two stages: this thread reads and
+    paces, pushing chunks into a RingBuffer, while a writer thread drains it
+    to disk. A slow disk then shows up as ring backlog (ring_hwm), and only
+    a full ring drops chunks (ring_overruns). If the writer thread fails (the
+    output or a tap below raises), the read loop stops and run() returns 1.
+
+    A StopToken passed as stop= ends the loop at the next chunk boundary.
+
+    With adapt=AdaptPolicy(...), a ChunkTuner resizes the chunk during the
+    run (at a constant byte rate) and an ADAPT line reports its trajectory.
+
+    With container=CaptureFormat(...), out_path is a self-describing capture
+    (capture.CaptureWriter: header, timestamped blocks, index, optional
+    codec) instead of raw bytes, and a CAPTURE line reports its size. The
+    header's fs is the format's samplerate, else the device's, else the
+    byte rate divided by the frame size.
+
+    With analyze=AnalyticsConfig(...), a StreamAnalyzer sees every chunk
+    (in the disk-writer thread when ring= is set, off the paced loop) and
+    STATS lines (mean/std/RMS/peak, zero-crossing rate, Welch dominant
+    frequency) follow READ; every_s also prints them during the run.
+
+    With pyramid=PyramidConfig(...), a PyramidBuilder fed the same way
+    builds a min/max/mean/rms decimation pyramid and writes it to a
+    sidecar (<out_path>.pyr by default) for fast zoomed-out views.
     """
 
+    # totals of the last run(), for callers such as ScriptRunner
+    bytes_total = 0
+    loops_total = 0
+    elapsed_s = 0.0
+
     def run(
         self,
         dev: Device,
@@ -41,9 +66,17 @@ class Reader:
         n: Optional[int] = None,
         loops: Optional[int] = None,
         chunk: int = 1024,
+        ring: Optional[int] = None,
+        spin: float = 0.0,
+        batch: float = 0.0,
+        stop: Optional[StopToken] = None,
+        adapt: Optional[AdaptPolicy] = None,
+        container: Optional[CaptureFormat] = None,
+        analyze: Optional[AnalyticsConfig] = None,
+        pyramid: Optional[PyramidConfig] = None,
     ) -> int:
         # Validate termination conditions
-        if (n is None and loops is None) or fs <= 0:
+        if (n is None and loops is None) or fs is None or fs <= 0:
             print("Provide --n or --loops (or both), and a positive --fs.")
             return 2
         if n is not None and n <= 0:
@@ -52,37 +85,125 @@ class Reader:
         if loops is not None and loops <= 0:
             print("Invalid loops (must be > 0).")
             return 2
+        # the largest chunk this run may use
+        top = chunk if adapt is None else max(chunk, adapt.chunk_max)
+        if ring is not None and ring < top:
+            print("Invalid ring (must be >= chunk).")
+            return 2
+
+        def rate_of(spec) -> float:
+            # sample rate for a container/analytics spec: its own, the device's, or bytes/s per frame
+            import numpy as np
+            frame = np.dtype(spec.dtype).itemsize * spec.channels
+            return spec.samplerate or getattr(dev, "samplerate", None) or fs * chunk / frame
+
+        stats = None
+        if analyze is not None:
+            from .analytics import StreamAnalyzer
+            try:
+                stats = StreamAnalyzer(analyze, rate_of(analyze))
+            except (TypeError, ValueError) as e:
+                print(f"Invalid analytics: {e}")
+                return 2
 
         if not dev.open(in_path):
             print("Open failed (input)")
             return 2
 
         try:
-            fout = open(out_path, "wb")
+            if container is None:
+                fout = open(out_path, "wb")
+            else:
+                from .capture import CaptureWriter
+                fout = CaptureWriter(out_path, container, rate_of(container))
         except OSError:
             print("Can't open output file")
             dev.close()
             return 3
+        except (TypeError, ValueError) as e:
+            print(f"Invalid container: {e}")
+            dev.close()
+            return 2
+
+        # the sidecar is created only once input and output are open, so a
+        # failed open leaves no handle or empty .pyr behind
+        pyr = None
+        if pyramid is not None:
+            from .pyramid import PyramidBuilder
+            try:
+                pyr = PyramidBuilder(pyramid.path or out_path + ".pyr", pyramid, rate_of(pyramid))
+            except OSError:
+                print("Can't open pyramid sidecar")
+                fout.close()
+                dev.close()
+                return 3
+            except (TypeError, ValueError) as e:
+                print(f"Invalid pyramid: {e}")
+                fout.close()
+                dev.close()
+                return 2
+        # per-chunk consumers of the captured samples
+        taps = [t.feed for t in (stats, pyr) if t is not None]
+
+        # One buffer for the whole run; each read fills a slice of it in place.
+        view = memoryview(bytearray(top))
+        # Devices that lend out their own memory (mmap) skip even that copy.
+        read_view = getattr(dev, "read_view", None)
+
+        rb = None
+        drained = threading.Event()
+        drain_errors = []   # an exception that stopped the disk-writer thread
+        if ring is not None:
+            rb = RingBuffer(ring)
+
+            def drain() -> None:
+                out = memoryview(bytearray(top))
+                try:
+                    while True:
+                        k = rb.read_into(out)
+                        if k:
+                            fout.write(out[:k])
+                            for tap in taps:
+                                tap(out[:k])
+                        elif drained.is_set() and not len(rb):
+                            return
+                        else:
+                            time.sleep(0.0005)
+                except Exception as e:  # output or a tap failed; the read loop stops on it
+                    drain_errors.append(e)
+
+            drainer = threading.Thread(target=drain, daemon=True)
+            drainer.start()
+        sink = fout.write if rb is None else rb.write_from
 
         total_bytes = 0
         iter_count = 0
         t0 = time.perf_counter()
         rs = RunStats()           # collect latency intervals
-        p = Pacer(fs)
+        p = Pacer(fs, spin_s=spin, batch_s=batch)
         p.start()
-        last = t0
+        tuner = ChunkTuner(adapt, chunk, p) if adapt is not None else None
+        cur = chunk if tuner is None else tuner.chunk
+        last = woke = t0
 
         def need_this_iter() -> int:
             # If N is set, cap this read so we don't overshoot
             if n is None:
-                return chunk
+                return cur
             remaining = n - total_bytes
-            return chunk if remaining >= chunk else max(0, remaining)
+            return cur if remaining >= cur else max(0, remaining)
 
         # Loop until N or loops condition is satisfied
         status = 0
+        close_err = None
         try:
             while True:
+                # A StopToken (script 'stop') ends the run early
+                if stop is not None and stop.stopped():
+                    break
+                # Nothing drains the ring once the writer thread has died
+                if drain_errors:
+                    break
                 # Check termination BEFORE reading if loops limit only (no N) is set
                 if n is None and loops is not None and iter_count >= loops:
                     break
@@ -94,7 +215,12 @@ class Reader:
                 if need == 0:
                     break  # exactly satisfied N
 
-                r = dev.read(need)
+                if read_view is not None:
+                    data = read_view(need)
+                    r = IoResult(len(data), "")
+                else:
+                    r = dev.read_into(view[:need])
+                    data = view[:max(0, r.bytes)]
                 if r.bytes < 0 or r.err:
                     print(f"Read error: {r.err}")
                     status = 1
@@ -103,27 +229,80 @@ class Reader:
                     # EOF or no data
                     break
 
-
-                # Write placeholder bytes (mock path). Replace with actual buffer if needed.
-                fout.write(b'\x00' * r.bytes)
+                # Hand the filled slice straight to the file (or ring), then drop the view.
+                if rb is None:
+                    for tap in taps:
+                        tap(data)
+                try:
+                    sink(data)
+                except OSError as e:  # e.g. disk full
+                    print(f"Write error: {e}")
+                    status = 1
+                    break
+                finally:
+                    data.release()
                 total_bytes += r.bytes
                 iter_count += 1
 
                 now = time.perf_counter()
                 rs.mark_interval(now - last)
+                if tuner is not None:
+                    # service time: from the end of the last pacing sleep to now
+                    cur = tuner.observe(now - woke)
                 last = now
                 p.sleep_until_next()
+                woke = time.perf_counter() if tuner is not None else now
         finally:
-            fout.close()
+            if rb is not None:
+                drained.set()
+                drainer.join()
+            if container is not None:
+                # chunks the disk-writer ring overwrote plus losses inside the device
+                fout.dropped = (rb.overruns if rb is not None else 0) + getattr(dev, "dropped", 0)
+            try:
+                fout.close()   # flushes buffered output, which can fail too
+            except OSError as e:
+                close_err = e
             dev.close()
+            if pyr is not None:
+                pyr.close()
+
+        if drain_errors and not status:
+            # also covers a failure while draining the tail after the loop ended
+            print(f"Write error: {drain_errors[0]!r} (disk-writer thread)")
+            status = 1
+        if close_err is not None and not status:
+            print(f"Write error: {close_err}")
+            status = 1
 
         t1 = time.perf_counter()
         elapsed = max(1e-12, t1 - t0)
+        self.bytes_total, self.loops_total, self.elapsed_s = total_bytes, iter_count, elapsed
         thr = throughput_bytes_per_s(total_bytes, elapsed)
         print(
             f"READ bytes_total={total_bytes} loops_total={iter_count} "
             f"time_s={elapsed:.6f} throughput_Bps={thr:.2f} "
-            f"latency_p50_s={rs.p50():.6f} latency_p95_s={rs.p95():.6f}"
+            f"latency_p50_s={rs.p50():.6f} latency_p95_s={rs.p95():.6f} "
+            f"latency_p99_s={rs.p99():.6f}"
         )
+        if stats is not None:
+            print(stats.summary())
+        print(p.summary())
+        if tuner is not None:
+            print(tuner.summary())
+        if container is not None:
+            print(fout.summary())
+        if pyr is not None:
+            print(pyr.summary())
+        # read-side device counters (e.g. mic overflows); io_summary() is the
+        # write-side report, which says nothing useful about an input
+        input_summary = getattr(dev, "input_summary", None)
+        if input_summary is not None:
+            print(input_summary())
+        if rb is not None:
+            print(
+                f"RING size={rb.capacity} ring_hwm={rb.high_water} "
+                f"ring_overruns={rb.overruns} dropped_bytes={rb.dropped_bytes}"
+            )
         return status
 
@@ -0,0 +1,88 @@
+# oscifgen/ringbuffer.py
+from __future__ import annotations
+from typing import Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class RingBuffer:
+    """
+    Preallocated single-producer/single-consumer byte ring.
+
+    The producer only advances the write counter and the consumer only
+    advances the read counter, so one thread of each can share a ring
+    without a lock. Counters grow monotonically; positions are taken
+    modulo the capacity.
+
+    A write that does not fit is dropped whole (no torn samples) and
+    counted in `overruns` / `dropped_bytes`. `high_water` is the largest
+    backlog (bytes written but not yet read) seen so far.
+
+    read_view(n) is the zero-copy read: it lends the consumer a view of the
+    ring itself. The lent bytes stay reserved (the producer cannot reuse
+    them) until the consumer's next read_view()/read_into() call.
+    Usage:
+        rb = RingBuffer(1 << 20)
+        rb.write_from(view)        # producer thread
+        k = rb.read_into(out)      # consumer thread
+        v = rb.read_view(4096)     # or: borrow up to 4096 bytes, no copy
+    """
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = int(capacity)
+        self._mv = memoryview(bytearray(self.capacity))
+        self._w = 0  # total bytes written (producer-owned)
+        self._r = 0  # total bytes read (consumer-owned)
+        self._lent = 0  # bytes handed out by read_view, not yet given back
+        self.high_water = 0
+        self.overruns = 0
+        self.dropped_bytes = 0
+
+    def __len__(self) -> int:
+        return self._w - self._r - self._lent
+
+    def free(self) -> int:
+        return self.capacity - (self._w - self._r)
+
+    def write_from(self, data: Buffer) -> int:
+        """Copy all of data into the ring; returns len(data), or 0 if it was dropped."""
+        src = data if isinstance(data, memoryview) else memoryview(data)
+        n = len(src)
+        used = self._w - self._r
+        if n > self.capacity - used:
+            self.overruns += 1
+            self.dropped_bytes += n
+            return 0
+        pos = self._w % self.capacity
+        first = min(n, self.capacity - pos)
+        self._mv[pos:pos + first] = src[:first]
+        if first < n:
+            self._mv[:n - first] = src[first:]
+        self._w += n
+        if used + n > self.high_water:
+            self.high_water = used + n
+        return n
+
+    def read_view(self, n: int) -> memoryview:
+        """Next up to n queued bytes as a view into the ring (stops at the wrap point)."""
+        self._r += self._lent
+        pos = self._r % self.capacity
+        k = min(n, self._w - self._r, self.capacity - pos)
+        self._lent = k
+        return self._mv[pos:pos + k]
+
+    def read_into(self, buf: memoryview) -> int:
+        """Move up to len(buf) queued bytes into buf; returns the count (0 if empty)."""
+        self._r += self._lent
+        self._lent = 0
+        n = min(len(buf), self._w - self._r)
+        if n == 0:
+            return 0
+        pos = self._r % self.capacity
+        first = min(n, self.capacity - pos)
+        buf[:first] = self._mv[pos:pos + first]
+        if first < n:
+            buf[first:n] = self._mv[:n - first]
+        self._r += n
+        return n
@@ -1,7 +1,11 @@
 # oscifgen/scheduler.py
 from __future__ import annotations
+import math
 import time
 
+from .stats import RunStats
+
+
 class Pacer:
     """
     Simple fixed-rate pacer.
@@ -11,27 +15,114 @@ class Pacer:
         p.start()
         # in a loop:
         p.sleep_until_next()
+
+    With spin_s > 0 it sleeps until spin_s before each deadline and then
+    busy-waits the rest, trading CPU for much lower wakeup jitter than
+    time.sleep alone gives at kHz rates.
+
+    With batch_s > 0 it wakes up only once per ~batch_s: the ticks in
+    between return immediately and the caller runs them back-to-back.
+    Deadlines stay on the absolute schedule, so the long-run rate is
+    unchanged; only the number of wakeups drops.
+
+    Bookkeeping:
+      wakeups  - calls that actually waited for a deadline
+      missed   - wakeups that were already late when sleep_until_next() ran
+      resyncs  - times the schedule was reset after falling >10 wakeups behind
+      drift_s  - how far the latest wakeup is behind the nominal schedule
+      jitter   - RunStats of wakeup lateness (wakeup time - deadline)
     """
-    def __init__(self, rate_hz: float) -> None:
-        self.rate_hz = float(rate_hz)
-        self._period = 0.0 if self.rate_hz <= 0 else 1.0 / self.rate_hz
+    def __init__(self, rate_hz: float, spin_s: float = 0.0, batch_s: float = 0.0) -> None:
+        self.spin_s = max(0.0, float(spin_s))
+        self._batch_s = float(batch_s)
+        self._set_period(rate_hz)
         self._next = 0.0
         self._started = False
+        self._t0 = 0.0
+        self._sched = 0.0       # nominal time of the latest tick
+        self._last_wake = 0.0
+        self._wake_sched = 0.0  # nominal time of the latest wakeup's tick
+        self._wake_tick = 0
+        self.ticks = 0
+        self.wakeups = 0
+        self.missed = 0
+        self.resyncs = 0
+        self.jitter = RunStats()
+
+    def _set_period(self, rate_hz: float) -> None:
+        self.rate_hz = float(rate_hz)
+        self._period = 0.0 if self.rate_hz <= 0 else 1.0 / self.rate_hz
+        # ticks per wakeup; an unpaced (infinite) rate never waits, so there is nothing to batch
+        batching = self._batch_s > 0 and math.isfinite(self.rate_hz)
+        self.batch = max(1, int(self._batch_s * self.rate_hz)) if batching else 1
 
     def start(self) -> None:
         now = time.perf_counter()
         self._next = now + (self._period if self._period > 0 else 0.0)
         self._started = True
+        self._t0 = now
+        self._sched = now
+        self._last_wake = now
+
+    def set_rate(self, rate_hz: float) -> None:
+        """Change the tick rate mid-run; the next deadline becomes last deadline + new period."""
+        old = self._period
+        self._set_period(rate_hz)
+        if self._started:
+            self._next += self._period - old
 
     def sleep_until_next(self) -> None:
         if not self._started or self._period <= 0:
             return
+        self.ticks += 1
+        self._sched += self._period
+        if self.ticks % self.batch:
+            # mid-batch: keep the schedule moving, run the next chunk now
+            self._next += self._period
+            return
+        target = self._next
         now = time.perf_counter()
-        dt = self._next - now
-        if dt > 0:
+        dt = target - now
+        if dt <= 0:
+            self.missed += 1
+        elif self.spin_s > 0:
+            if dt > self.spin_s:
+                time.sleep(dt - self.spin_s)
+            while time.perf_counter() < target:
+                pass
+        else:
             time.sleep(dt)
+        wake = time.perf_counter()
+        self._last_wake = wake
+        self._wake_tick = self.ticks
+        self._wake_sched = self._sched
+        self.wakeups += 1
+        self.jitter.mark_interval(max(0.0, wake - target))
         # schedule next tick
         self._next += self._period
-        # if we fell behind a lot, catch up by jumping to “now + period”
-        if self._next - time.perf_counter() < -10 * self._period:
-            self._next = time.perf_counter() + self._period
+        # if we fell behind a lot (10 wakeup intervals), catch up by jumping to “now + period”
+        if self._next - wake < -10 * self._period * self.batch:
+            self.resyncs += 1
+            self._next = wake + self._period
+
+    @property
+    def drift_s(self) -> float:
+        if not self._wake_tick:
+            return 0.0
+        return self._last_wake - self._wake_sched
+
+    @property
+    def achieved_hz(self) -> float:
+        elapsed = self._last_wake - self._t0
+        return self._wake_tick / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """One-line report printed by Reader/Writer next to their throughput line."""
+        j = self.jitter
+        return (
+            f"PACE target_hz={self.rate_hz:.2f} achieved_hz={self.achieved_hz:.2f} "
+            f"wakeups={self.wakeups} missed={self.missed} resyncs={self.resyncs} "
+            f"drift_s={self.drift_s:.6f} "
+            f"jitter_p50_s={j.p50():.6f} jitter_p95_s={j.p95():.6f} "
+            f"jitter_p99_s={j.p99():.6f} jitter_max_s={max(0.0, j.max):.6f}"
+        )
@@ -3,48 +3,95 @@
 # from .writer import Writer
 # from .ftdi_device import FtdiDevice
 # from .wavegen import Wave
-
 # NEW
 import json
 import threading
 import time
+from dataclasses import dataclass, field
+from typing import Optional
 
 from .reader import Reader
 from .writer import Writer
-from .file_device import FileDevice
-from .mic_device import MicrophoneDevice
-from .wavegen import Wave
+from .devices import make_device
+from .wavegen import Wave, frame_bytes
+from .loopctl import StopToken
+from .adaptive import AdaptPolicy
+
+
+@dataclass
+class _Job:
+    """A named background start job and the StopToken its loop checks."""
+    name: str
+    mode: str
+    thread: Optional[threading.Thread] = None
+    token: StopToken = field(default_factory=StopToken)
+    runner: object = None          # the Reader/Writer, for its run totals
+    status: Optional[int] = None   # run() return code once finished
 
 
 class ScriptRunner:
     """
     Executes a JSON script with commands:
-      start, wait, stop, read, write
+      start, wait, stop, join, read, write, multi, batch
     Example:
     {
       "sequence": [
-        { "start": { "mode": "acquire",
+        { "start": { "name": "cap",
+                     "mode": "acquire",
                      "in": "ftdi://::/1",
                      "out": "capture.bin",
                      "fs": 1000,
                      "n": 1024,
                      "loops": 10,
-                     "chunk": 512 } },
+                     "chunk": 512,
+                     "ring": 65536 } },
         { "wait":  { "seconds": 2 } },
-        { "stop":  {} },
-        { "write": { "out": "ftdi://::/1",
+        { "stop":  { "name": "cap" } },
+        { "write": { "out": "tcp://localhost:9000",
                      "fo": 2000,
+                     "fs": 48000,
                      "n": 2048,
                      "wave": "square",
                      "amp": 1.0,
-                     "chunk": 512 } }
+                     "chunk": 512 } },
+        { "multi": { "channels": [
+                       { "mode": "acquire", "in": "a.in", "out": "a.bin",
+                         "fs": 1000, "n": 8192 },
+                       { "mode": "generate", "out": "b.out", "fo": 1000,
+                         "n": 8192 } ] } }
       ]
     }
+    "multi" runs all its channels concurrently on one asyncio event loop.
+    "batch" takes the same document as `oscifgen batch --matrix` inline
+    (or {"matrix_file": "..."}) and generates it across a process pool.
+
+    Each start launches a named background job (default job1, job2, ...).
+    stop signals the job's StopToken and joins it; join waits for it to
+    finish on its own. Both take "name": "<job>" or "all" (the default).
+
+    start/read/write steps with "adapt": true resize chunks during the run;
+    "chunk_min", "chunk_max", "target_latency" and "cpu_budget" tune it
+    (sizes in the step's "chunk" unit: bytes to read, frames to write).
+    Generate steps take "pipeline": <depth> to synthesize chunks ahead,
+    and "dtype" ("uint8", "int16", "float32") plus "channels" (a count, or
+    a list of {"wave", "amp", "phase"} / "wave:amp:phase") for multi-
+    channel frames; their "n" and "chunk" then count frames.
+    Acquire steps with "container": true write a capture container;
+    "codec", "dtype", "channels", "samplerate" and "block" describe it.
+    "stats": true analyzes the stream as it is read (STATS lines after
+    READ); "nfft" and "stats_every" tune it, sharing dtype/channels.
+    "pyramid": true also writes a decimation pyramid sidecar
+    ("pyramid_base", "pyramid_out").
+    When the script ends, remaining jobs are joined and a JOB line with
+    per-job totals is printed for every job started. .status is then the
+    first nonzero status of a read/write step or job (0 if all succeeded).
     """
 
     def __init__(self, script_path: str):
         self.script_path = script_path
-        self._bg = None  # background thread
+        self._jobs: dict[str, _Job] = {}  # background start jobs by name
+        self._job_seq = 0                 # last default job number handed out
+        self.status = 0
 
     def run(self):
         with open(self.script_path, "r") as f:
@@ -63,18 +110,106 @@ class ScriptRunner:
             elif cmd == "wait":
                 self._wait(params)
             elif cmd == "stop":
-                self._stop()
+                self._stop(params)
+            elif cmd == "join":
+                self._join(params)
             elif cmd == "read":
                 self._read(params)
             elif cmd == "write":
                 self._write(params)
+            elif cmd == "multi":
+                self._multi(params)
+            elif cmd == "batch":
+                self._batch(params)
             else:
                 print(f"[WARN] Unknown command: {cmd}")
+        self._join({"name": "all"}, quiet=True)
+        self._report()
         print("\n[ScriptRunner] Done.")
 
     # ---- handlers ----
+    def _device(self, url, p):
+        """(device, open path) for a step's in/out URL, or (None, None) after a warning."""
+        n = p.get("n")
+        size = int(n) if n is not None else int(p.get("loops") or 0) * int(p.get("chunk", 512))
+        try:
+            size *= frame_bytes(str(p.get("dtype", "uint8")), p.get("channels"))
+        except ValueError:
+            pass  # reported by Writer
+        try:
+            return make_device(url or "", "mmap" if p.get("mmap") else "file", size_hint=size)
+        except RuntimeError as e:
+            print(f"[WARN] {e}")
+            return None, None
+
+    @staticmethod
+    def _adapt(p):
+        if not p.get("adapt"):
+            return None
+        t = p.get("target_latency")
+        c = p.get("cpu_budget")
+        return AdaptPolicy(chunk_min=int(p.get("chunk_min", 64)),
+                           chunk_max=int(p.get("chunk_max", 65536)),
+                           target_latency_s=float(t) if t is not None else None,
+                           cpu_budget=float(c) if c is not None else None)
+
+    @staticmethod
+    def _container(p):
+        if not p.get("container"):
+            return None
+        from .capture import CaptureFormat
+        sr = p.get("samplerate")
+        return CaptureFormat(dtype=str(p.get("dtype", "int16")),
+                             channels=int(p.get("channels", 1)),
+                             samplerate=float(sr) if sr is not None else None,
+                             block=int(p.get("block", 65536)),
+                             codec=str(p.get("codec", "none")))
+
+    @staticmethod
+    def _analytics(p):
+        if not p.get("stats"):
+            return None
+        from .analytics import AnalyticsConfig
+        sr = p.get("samplerate")
+        every = p.get("stats_every")
+        return AnalyticsConfig(dtype=str(p.get("dtype", "int16")),
+                               channels=int(p.get("channels", 1)),
+                               samplerate=float(sr) if sr is not None else None,
+                               nfft=int(p.get("nfft", 1024)),
+                               every_s=float(every) if every is not None else None)
+
+    @staticmethod
+    def _pyramid(p):
+        if not p.get("pyramid"):
+            return None
+        from .pyramid import PyramidConfig
+        sr = p.get("samplerate")
+        return PyramidConfig(dtype=str(p.get("dtype", "int16")),
+                             channels=int(p.get("channels", 1)),
+                             samplerate=float(sr) if sr is not None else None,
+                             base=int(p.get("pyramid_base", 256)),
+                             path=p.get("pyramid_out"))
+
+    def _default_job_name(self) -> str:
+        # job1, job2, ...: numbers are never reused, and names a script
+        # already gave a job are skipped
+        while True:
+            self._job_seq += 1
+            name = f"job{self._job_seq}"
+            if name not in self._jobs:
+                return name
+
     def _start(self, p):
         mode = (p.get("mode") or "acquire").lower()
+        name = str(p.get("name") or self._default_job_name())
+        old = self._jobs.get(name)
+        if old is not None and old.thread.is_alive():
+            print(f"[WARN] job '{name}' is still running; not starting another")
+            return
+        if name == "all":
+            print("[WARN] 'all' is reserved; pick another job name")
+            return
+        job = _Job(name, mode)
         in_url = p.get("in")
         out = p.get("out")
         fs = p.get("fs")
@@ -87,40 +222,63 @@ class ScriptRunner:
         w = {"sine": Wave.SINE, "square": Wave.SQUARE,
              "triangle": Wave.TRIANGLE}.get(wave_name, Wave.SINE)
 
-        src = p.get("in", "")
-        if isinstance(src, str) and src.lower().startswith("mic"):
-            dev = MicrophoneDevice()
-        else:
-            dev = FileDevice()
+        dev, path = self._device(in_url if mode == "acquire" else out, p)
+        if dev is None:
+            return
 
         def worker():
-            if mode == "acquire":
-                Reader().run(
-                    dev=dev,
-                    in_path=in_url,
-                    out_path=out,
-                    fs=float(fs) if fs is not None else None,
-                    n=int(n) if n is not None else None,
-                    loops=int(loops) if loops is not None else None,
-                    chunk=int(chunk),
-                )
-            elif mode == "generate":
-                Writer().run(
-                    dev=dev,
-                    out_path=out,                 # FTDI URL for output device
-                    fo=float(fo) if fo is not None else None,
-                    wave=w,
-                    amp=float(amp),
-                    n=int(n) if n is not None else None,
-                    loops=int(loops) if loops is not None else None,
-                    chunk=int(chunk),
-                )
-            else:
-                print(
-                    f"[WARN] start.mode must be acquire|generate (got {mode})")
-        self._bg = threading.Thread(target=worker, daemon=True)
-        self._bg.start()
-        print(f"[ScriptRunner] START launched (mode={mode}).")
+            try:
+                if mode == "acquire":
+                    job.runner = Reader()
+                    job.status = job.runner.run(
+                        dev=dev,
+                        in_path=path,
+                        out_path=out,
+                        fs=float(fs) if fs is not None else None,
+                        n=int(n) if n is not None else None,
+                        loops=int(loops) if loops is not None else None,
+                        chunk=int(chunk),
+                        ring=int(p.get("ring")) if p.get("ring") is not None else None,
+                        spin=float(p.get("spin", 0.0)),
+                        batch=float(p.get("batch", 0.0)),
+                        adapt=self._adapt(p),
+                        container=self._container(p),
+                        analyze=self._analytics(p),
+                        pyramid=self._pyramid(p),
+                        stop=job.token,
+                    )
+                elif mode == "generate":
+                    job.runner = Writer()
+                    job.status = job.runner.run(
+                        dev=dev,
+                        out_path=path,                # device URL minus scheme/options
+                        fo=float(fo) if fo is not None else None,
+                        wave=w,
+                        amp=float(amp),
+                        n=int(n) if n is not None else None,
+                        loops=int(loops) if loops is not None else None,
+                        chunk=int(chunk),
+                        fs=float(fs) if fs is not None else None,
+                        spin=float(p.get("spin", 0.0)),
+                        batch=float(p.get("batch", 0.0)),
+                        adapt=self._adapt(p),
+                        stop=job.token,
+                        pipeline=int(p.get("pipeline", 0)),
+                        dtype=str(p.get("dtype", "uint8")),
+                        channels=p.get("channels"),
+                    )
+                else:
+                    print(
+                        f"[WARN] start.mode must be acquire|generate (got {mode})")
+                    job.status = 2
+            except Exception as e:  # a crashed run must still leave a failed status
+                print(f"[ScriptRunner] job '{name}' failed: {e!r}")
+                job.status = 1
+
+        job.thread = threading.Thread(target=worker, name=f"job-{name}", daemon=True)
+        self._jobs[name] = job
+        job.thread.start()
+        print(f"[ScriptRunner] START launched (name={name} mode={mode}).")
 
     def _wait(self, p):
         secs = p.get("seconds")
@@ -134,51 +292,120 @@ class ScriptRunner:
         else:
             print("[ScriptRunner] WAIT needs seconds or loops")
 
-    def _stop(self):
-        if self._bg and self._bg.is_alive():
-            print("[ScriptRunner] STOP waiting for background job to finish...")
-            self._bg.join(timeout=5)
-            self._bg = None
-            print("[ScriptRunner] STOP complete.")
-        else:
+    def _select(self, p) -> list:
+        name = str(p.get("name") or "all")
+        if name == "all":
+            return list(self._jobs.values())
+        if name not in self._jobs:
+            print(f"[WARN] No job named '{name}'")
+            return []
+        return [self._jobs[name]]
+
+    def _stop(self, p):
+        jobs = [j for j in self._select(p) if j.thread.is_alive()]
+        if not jobs:
             print("[ScriptRunner] No active background job.")
+            return
+        for j in jobs:
+            j.token.stop()
+        for j in jobs:
+            print(f"[ScriptRunner] STOP signalled {j.name}, joining...")
+            j.thread.join(timeout=5)
+            if j.thread.is_alive():
+                print(f"[WARN] job '{j.name}' did not stop within 5s")
+        print("[ScriptRunner] STOP complete.")
+
+    def _join(self, p, quiet: bool = False):
+        for j in self._select(p):
+            if j.thread.is_alive():
+                print(f"[ScriptRunner] JOIN waiting for {j.name}...")
+                j.thread.join()
+            elif not quiet:
+                print(f"[ScriptRunner] JOIN {j.name} already finished")
+
+    def _report(self):
+        for j in self._jobs.values():
+            self._note(j.status)
+            r = j.runner
+            print(
+                f"JOB name={j.name} mode={j.mode} status={j.status} "
+                f"stopped={j.token.stopped()} "
+                f"bytes_total={getattr(r, 'bytes_total', 0)} "
+                f"loops_total={getattr(r, 'loops_total', 0)} "
+                f"time_s={getattr(r, 'elapsed_s', 0.0):.6f}"
+            )
 
     def _read(self, p):
         print("[ScriptRunner] READ (one-shot)")
-        src = p.get("in", "")
-        if isinstance(src, str) and src.lower().startswith("mic"):
-            dev = MicrophoneDevice()
-        else:
-            dev = FileDevice()
+        dev, path = self._device(p.get("in"), p)
+        if dev is None:
+            return
 
-        Reader().run(
+        self._note(Reader().run(
             dev=dev,
-            in_path=p.get("in"),
+            in_path=path,
             out_path=p.get("out"),
             fs=float(p.get("fs")) if p.get("fs") is not None else None,
             n=int(p.get("n")) if p.get("n") is not None else None,
             loops=int(p.get("loops")) if p.get("loops") is not None else None,
             chunk=int(p.get("chunk", 512)),
-        )
+            ring=int(p.get("ring")) if p.get("ring") is not None else None,
+            spin=float(p.get("spin", 0.0)),
+            batch=float(p.get("batch", 0.0)),
+            adapt=self._adapt(p),
+            container=self._container(p),
+            analyze=self._analytics(p),
+            pyramid=self._pyramid(p),
+        ))
 
     def _write(self, p):
         print("[ScriptRunner] WRITE (one-shot)")
-        src = p.get("in", "")
-        if isinstance(src, str) and src.lower().startswith("mic"):
-            dev = MicrophoneDevice()
-        else:
-            dev = FileDevice()
+        dev, path = self._device(p.get("out"), p)
+        if dev is None:
+            return
 
         wave_name = (p.get("wave") or "sine").lower()
         w = {"sine": Wave.SINE, "square": Wave.SQUARE,
              "triangle": Wave.TRIANGLE}.get(wave_name, Wave.SINE)
-        Writer().run(
+        self._note(Writer().run(
             dev=dev,
-            out_path=p.get("out"),                 # FTDI URL
+            out_path=path,                         # device URL minus scheme/options
             fo=float(p.get("fo")) if p.get("fo") is not None else None,
             wave=w,
             amp=float(p.get("amp", 1.0)),
             n=int(p.get("n")) if p.get("n") is not None else None,
             loops=int(p.get("loops")) if p.get("loops") is not None else None,
             chunk=int(p.get("chunk", 512)),
-        )
+            fs=float(p.get("fs")) if p.get("fs") is not None else None,
+            spin=float(p.get("spin", 0.0)),
+            batch=float(p.get("batch", 0.0)),
+            adapt=self._adapt(p),
+            pipeline=int(p.get("pipeline", 0)),
+            dtype=str(p.get("dtype", "uint8")),
+            channels=p.get("channels"),
+        ))
+
+    def _note(self, status):
+        if status and not self.status:
+            self.status = status
+
+    def _multi(self, p):
+        from .aio_engine import AsyncEngine
+        chans = p.get("channels") or []
+        print(f"[ScriptRunner] MULTI {len(chans)} channel(s) on one event loop")
+        eng = AsyncEngine(tick_s=float(p.get("tick", 0.001)))
+        for spec in chans:
+            try:
+                eng.add_channel(spec)
+            except (RuntimeError, ValueError) as e:
+                print(f"[WARN] {e}")
+        self._note(eng.first_failure(eng.run()))
+
+    def _batch(self, p):
+        from .batch import run_batch
+        doc = p
+        if p.get("matrix_file"):
+            with open(p["matrix_file"], "r") as f:
+                doc = json.load(f)
+        workers = p.get("workers")
+        self._note(run_batch(doc, workers=int(workers) if workers is not None else None))
@@ -1,30 +1,106 @@
 from __future__ import annotations
-from typing import List
+import math
+
+# Histogram range and resolution: 1 ns .. 1000 s, buckets 1% wide.
+_LO = 1e-9
+_HI = 1e3
+_GROWTH = 1.01
+_LOG_GROWTH = math.log(_GROWTH)
+_NBUCKETS = int(math.ceil(math.log(_HI / _LO) / _LOG_GROWTH)) + 2  # + under/overflow
+
 
 class RunStats:
-    """Collects latency intervals and computes percentiles."""
+    """
+    Collects latency intervals in a fixed-size log-bucketed histogram.
+
+    Memory and per-call cost do not grow with the run length: each bucket
+    is 1% wide, so quantiles are accurate to about +/-0.5% (clamped to the
+    exact min/max). Running min/max/mean/stddev are exact (Welford).
+    Histograms from several runs can be combined with merge().
+    """
     def __init__(self) -> None:
-        self._vals: List[float] = []
+        self._counts = [0] * _NBUCKETS
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
 
     def mark_interval(self, dt: float) -> None:
-        if dt >= 0:
-            self._vals.append(dt)
+        if dt < 0:
+            return
+        self._counts[_bucket(dt)] += 1
+        self.count += 1
+        if dt < self.min:
+            self.min = dt
+        if dt > self.max:
+            self.max = dt
+        delta = dt - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (dt - self._mean)
+
+    def merge(self, other: RunStats) -> RunStats:
+        """Fold other's samples into this histogram; returns self."""
+        if other.count == 0:
+            return self
+        for i, c in enumerate(other._counts):
+            if c:
+                self._counts[i] += c
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self._mean += delta * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
 
-    def _percentile(self, p: float) -> float:
-        vals = sorted(self._vals)
-        if not vals:
+    @property
+    def mean(self) -> float:
+        return self._mean if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q in [0, 1] (0.0 if nothing was recorded)."""
+        if self.count == 0:
             return 0.0
-        k = (len(vals) - 1) * p
-        f = int(k)
-        c = min(f + 1, len(vals) - 1)
-        if f == c:
-            return vals[f]
-        d0 = vals[f] * (c - k)
-        d1 = vals[c] * (k - f)
-        return d0 + d1
-
-    def p50(self) -> float: return self._percentile(0.50)
-    def p95(self) -> float: return self._percentile(0.95)
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for i, c in enumerate(self._counts):
+            seen += c
+            if seen > rank:
+                return min(self.max, max(self.min, _bucket_value(i)))
+        return self.max
+
+    def p50(self) -> float: return self.quantile(0.50)
+    def p95(self) -> float: return self.quantile(0.95)
+    def p99(self) -> float: return self.quantile(0.99)
+    def p999(self) -> float: return self.quantile(0.999)
+
+
+def _bucket(v: float) -> int:
+    if v < _LO:
+        return 0
+    if v >= _HI:
+        return _NBUCKETS - 1
+    return 1 + int(math.log(v / _LO) / _LOG_GROWTH)
+
+
+def _bucket_value(i: int) -> float:
+    # geometric midpoint of the bucket's [lo, hi) range
+    if i == 0:
+        return 0.0
+    if i == _NBUCKETS - 1:
+        return _HI
+    return _LO * _GROWTH ** (i - 1 + 0.5)
+
 
 def throughput_bytes_per_s(total_bytes: int, elapsed_s: float) -> float:
     if elapsed_s <= 0:
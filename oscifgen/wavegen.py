@@ -1,27 +1,161 @@
 # oscifgen/wavegen.py
 from __future__ import annotations
 import math
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+_TWO_PI = 2.0 * math.pi
+
+# DDS: 32-bit phase accumulator indexing a 2**12-entry wavetable
+DDS_PHASE_BITS = 32
+DDS_TABLE_BITS = 12
+
+
+# Sample formats for generated output. "uint8" is the original 0..255
+# byte stream; int16 spans +/-32767 and float32 +/-1.0 at amp=1.
+SAMPLE_FORMATS = {"uint8": np.uint8, "int16": np.int16, "float32": np.float32}
+
 
 class Wave(Enum):
     SINE = "sine"
     SQUARE = "square"
     TRIANGLE = "triangle"
 
+
+def _shape(kind: Wave, ph: np.ndarray) -> np.ndarray:
+    """Wave values in [-1, 1] at phases ph (radians)."""
+    if kind == Wave.SINE:
+        return np.sin(ph)
+    if kind == Wave.SQUARE:
+        return np.where(np.sin(ph) >= 0.0, 1.0, -1.0)
+    t = np.mod(ph / _TWO_PI, 1.0)  # TRIANGLE
+    return 4.0 * np.abs(t - 0.5) - 1.0
+
+
+def _quantize(val: np.ndarray, amp: float, fmt: str) -> np.ndarray:
+    """Scale [-1, 1] values by amp into sample format fmt."""
+    if fmt == "uint8":
+        # same operation order as the scalar path so rounding matches;
+        # in place on one temporary rather than a new array per step
+        scaled = val * amp
+        scaled *= 0.5
+        scaled += 0.5
+        scaled *= 255.0
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, 0, 255, out=scaled)
+        return scaled.astype(np.uint8)
+    if fmt == "int16":
+        return np.rint(val * (amp * 32767.0)).astype(np.int16)
+    return (val * amp).astype(np.float32)
+
+
 class Waveform:
     """
     Simple byte-stream waveform generator.
     Produces 0..255 bytes for sine/square/triangle using a phase accumulator.
+
+    By default whole chunks are computed as NumPy arrays; pass
+    vectorized=False to use the original per-sample loop. Both paths
+    produce identical bytes and keep phase continuous across calls.
+
+    Output is one uint8 channel, so a frame is one byte; MultiWaveform
+    generalizes this to other formats and several channels.
     """
-    def __init__(self, kind: Wave = Wave.SINE, amp: float = 1.0):
+    fmt = "uint8"
+    channels = 1
+    frame_bytes = 1
+
+    def __init__(self, kind: Wave = Wave.SINE, amp: float = 1.0, vectorized: bool = True):
         self.kind = kind
         # clamp amplitude to [0, 1]
         self.amp = max(0.0, min(1.0, float(amp)))
+        self.vectorized = vectorized
         self._phase = 0.0
         # fixed step per sample (independent of real Fo/Fs for this assignment)
         self._step = 2.0 * math.pi / 64.0  # 64 samples per cycle
+        # _phases(): last cycle-to-cycle start drift and prediction block size
+        self._drift: Optional[float] = None
+        self._block = 1
 
     def next_bytes(self, n: int) -> bytes:
+        if self.vectorized:
+            return self.next_array(n).tobytes()
+        return self._next_bytes_scalar(n)
+
+    def next_into(self, buf) -> int:
+        """Write the next len(buf) samples into a writable byte buffer; returns the count."""
+        out = np.frombuffer(buf, dtype=np.uint8)
+        out[:] = self.next_array(len(out))
+        return len(out)
+
+    def next_array(self, n: int) -> np.ndarray:
+        """Return the next n samples as a uint8 array."""
+        return _quantize(_shape(self.kind, self._phases(int(n))), self.amp, "uint8")
+
+    def _phases(self, n: int) -> np.ndarray:
+        """
+        Phase of each of the next n samples, advancing the accumulator.
+
+        The scalar path adds _step in floating point and wraps at 2*pi, so
+        the phase slowly drifts and bytes at cycle edges depend on it. To
+        stay byte-identical every cycle is rebuilt with a row-wise cumsum
+        from its start phase (a sequential sum, so it rounds identically).
+
+        Cycle starts are not walked sample by sample: from one cycle to the
+        next the start moves by a constant drift for long stretches, so a
+        block of starts is predicted as start + j * drift, all its cycles are
+        summed in one 2-D cumsum, and each row's real wrap (first phase
+        >= 2*pi) is checked against the next predicted start. Rows up to the
+        first mismatch are exact; the block grows while predictions hold and
+        restarts small from the true start when one fails; both carry over
+        between calls. The Python work is per block, not per sample or per
+        cycle. Chunks of only a few cycles are cheaper to walk directly than
+        to set up as blocks, so those still add sample by sample.
+        """
+        if n <= 0:
+            return np.empty(0)
+        step = self._step
+        width = int(_TWO_PI / step) + 3     # longest cycle plus its wrap value
+        per = width - 3                     # shortest cycle
+        x = self._phase
+        if n < 4 * per:
+            out = [0.0] * n
+            for i in range(n):
+                out[i] = x
+                x += step
+                if x >= _TWO_PI:
+                    x -= _TWO_PI
+            self._phase = x
+            return np.array(out)
+        drift, block = self._drift, self._block
+        parts = []
+        have = 0
+        while have <= n:                    # one phase past n: the new accumulator
+            m = 1 if drift is None else min(block, (n - have) // per + 2)
+            starts = x + np.arange(m) * drift if drift is not None else np.array([x])
+            rows = np.full((m, width), step)
+            rows[:, 0] = starts
+            np.cumsum(rows, axis=1, out=rows)
+            wrap = np.argmax(rows >= _TWO_PI, axis=1)
+            nxt = rows[np.arange(m), wrap] - _TWO_PI
+            miss = np.flatnonzero(nxt[:-1] != starts[1:])
+            good = int(miss[0]) + 1 if miss.size else m
+            block = min(2 * block, 1 << 16) if not miss.size else 1
+            mask = np.arange(width) < wrap[:good, None]
+            parts.append(rows[:good][mask])
+            have += len(parts[-1])
+            drift = float(nxt[good - 1]) - float(rows[good - 1, 0])
+            x = float(nxt[good - 1])
+        ph = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        self._drift, self._block = drift, block
+        self._phase = float(ph[n])
+        return ph[:n]
+
+    def _next_bytes_scalar(self, n: int) -> bytes:
         out = bytearray()
         for _ in range(int(n)):
             if self.kind == Wave.SINE:
@@ -44,8 +178,192 @@ class Waveform:
 
         return bytes(out)
 
+
+@lru_cache(maxsize=32)
+def wavetable(kind: Wave, amp: float, size: int = 1 << DDS_TABLE_BITS,
+              fmt: str = "uint8") -> np.ndarray:
+    """
+    One period of `kind` at amplitude `amp` as `size` samples in format fmt.
+    Tables are cached (least recently used evicted first) so repeated runs
+    with the same parameters reuse them; the returned array is read-only.
+    """
+    ph = np.arange(size) * (_TWO_PI / size)
+    table = _quantize(_shape(kind, ph), amp, fmt)
+    table.setflags(write=False)
+    return table
+
+
+class DdsWaveform(Waveform):
+    """
+    Direct digital synthesis: a fixed-point phase accumulator indexes a
+    cached wavetable, so the output really is `fo` Hz at `fs` samples/s.
+    Each chunk is a single gather from the table.
+    """
+    def __init__(self, kind: Wave = Wave.SINE, amp: float = 1.0,
+                 fo: float = 1.0, fs: float = 64.0) -> None:
+        super().__init__(kind, amp)
+        if fs <= 0:
+            raise ValueError("fs must be > 0")
+        self.fo = float(fo)
+        self.fs = float(fs)
+        self._table = wavetable(kind, self.amp)
+        # tuning word: phase increment per sample, mod 2**DDS_PHASE_BITS
+        self._tw = int(round(self.fo / self.fs * (1 << DDS_PHASE_BITS))) % (1 << DDS_PHASE_BITS)
+        self._acc = 0
+        self._shift = DDS_PHASE_BITS - DDS_TABLE_BITS
+
+    def _indices(self, n: int) -> np.ndarray:
+        # uint32 arithmetic wraps mod 2**32, which is the accumulator modulus
+        acc = np.arange(n, dtype=np.uint32)
+        acc *= np.uint32(self._tw)
+        acc += np.uint32(self._acc)
+        self._acc = (self._acc + self._tw * n) % (1 << DDS_PHASE_BITS)
+        acc >>= self._shift
+        return acc
+
+    def next_array(self, n: int) -> np.ndarray:
+        return self._table.take(self._indices(int(n)))
+
+    def next_into(self, buf) -> int:
+        # gather straight into the caller's buffer, no intermediate array
+        out = np.frombuffer(buf, dtype=np.uint8)
+        self._table.take(self._indices(len(out)), out=out)
+        return len(out)
+
+
+@dataclass
+class ChannelSpec:
+    kind: Wave = Wave.SINE
+    amp: float = 1.0
+    phase: float = 0.0   # degrees
+
+
+_KINDS = {"sine": Wave.SINE, "square": Wave.SQUARE, "triangle": Wave.TRIANGLE}
+
+
+def channel_specs(value) -> Union[None, int, List[ChannelSpec]]:
+    """
+    Normalize a channel setting from the CLI, a script or a batch job:
+    None or a count pass through as an int (or None); a string
+    "sine:0.5:90,square" or a list of such strings / {"wave", "amp",
+    "phase"} dicts / ChannelSpecs becomes one ChannelSpec per channel.
+    Fields left out default to sine, amp 1.0, phase 0 degrees.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        if value.strip().isdigit():
+            return int(value)
+        value = value.split(",")
+    specs = []
+    for item in value:
+        if isinstance(item, ChannelSpec):
+            specs.append(item)
+            continue
+        if isinstance(item, dict):
+            wave, amp, phase = item.get("wave"), item.get("amp"), item.get("phase")
+        else:
+            parts = (str(item).split(":") + [None, None])[:3]
+            wave, amp, phase = (p or None for p in parts)
+        k = (wave or "sine").strip().lower()
+        if k not in _KINDS:
+            raise ValueError(f"unknown wave {k!r} in channel {len(specs)}")
+        specs.append(ChannelSpec(_KINDS[k], float(amp if amp is not None else 1.0),
+                                 float(phase if phase is not None else 0.0)))
+    return specs
+
+
+def frame_bytes(fmt: str = "uint8", channels=None) -> int:
+    """Bytes per frame for a sample format and channel setting (see channel_specs)."""
+    specs = channel_specs(channels)
+    count = len(specs) if isinstance(specs, list) else (specs or 1)
+    return np.dtype(SAMPLE_FORMATS.get(fmt, np.uint8)).itemsize * count
+
+
+class MultiWaveform(Waveform):
+    """
+    Interleaved multi-channel output in a chosen sample format
+    (SAMPLE_FORMATS): each frame holds one sample per channel, and every
+    channel has its own wave, amplitude and phase offset (degrees) at a
+    shared frequency.
+
+    With fo and fs set, synthesis is DDS: one phase accumulator per chunk,
+    each channel gathering from its own cached wavetable at its phase
+    offset. Without them it follows the fixed 64-samples-per-cycle engine
+    of Waveform. Either way each channel is computed as a whole-chunk
+    NumPy op and written straight into its column of the output, so
+    next_into() fills a caller's buffer with no per-chunk allocation.
+
+    next_bytes(n)/next_into(buf) take byte counts (whole frames only, so
+    n is rounded down to a multiple of frame_bytes); next_array(frames)
+    returns a (frames, channels) array.
+    """
+    def __init__(self, channels: Sequence[ChannelSpec], fmt: str = "int16",
+                 fo: Optional[float] = None, fs: Optional[float] = None) -> None:
+        if not channels:
+            raise ValueError("at least one channel is required")
+        if fmt not in SAMPLE_FORMATS:
+            raise ValueError(f"unknown sample format {fmt!r} (choose from {', '.join(SAMPLE_FORMATS)})")
+        super().__init__(channels[0].kind, channels[0].amp)
+        self.specs = list(channels)
+        self.fmt = fmt
+        self.dtype = np.dtype(SAMPLE_FORMATS[fmt])
+        self.channels = len(self.specs)
+        self.frame_bytes = self.dtype.itemsize * self.channels
+        self._amps = [max(0.0, min(1.0, float(c.amp))) for c in self.specs]
+        self.dds = fs is not None and fo is not None
+        if self.dds:
+            if fs <= 0:
+                raise ValueError("fs must be > 0")
+            self.fo = float(fo)
+            self.fs = float(fs)
+            self._tables = [wavetable(c.kind, a, fmt=fmt) for c, a in zip(self.specs, self._amps)]
+            mod = 1 << DDS_PHASE_BITS
+            self._tw = int(round(self.fo / self.fs * mod)) % mod
+            self._offs = [int(round(c.phase / 360.0 * mod)) % mod for c in self.specs]
+            self._acc = 0
+            self._shift = DDS_PHASE_BITS - DDS_TABLE_BITS
+        else:
+            self._offs = [math.radians(c.phase) for c in self.specs]
+
+    def _fill(self, out: np.ndarray) -> None:
+        n = len(out)
+        if self.dds:
+            acc = np.arange(n, dtype=np.uint32)
+            acc *= np.uint32(self._tw)
+            acc += np.uint32(self._acc)
+            self._acc = (self._acc + self._tw * n) % (1 << DDS_PHASE_BITS)
+            idx = np.empty_like(acc)
+            for c, (table, off) in enumerate(zip(self._tables, self._offs)):
+                np.add(acc, np.uint32(off), out=idx)
+                idx >>= self._shift
+                table.take(idx, out=out[:, c])
+        else:
+            ph = self._phases(n)
+            for c, (spec, amp, off) in enumerate(zip(self.specs, self._amps, self._offs)):
+                out[:, c] = _quantize(_shape(spec.kind, ph + off if off else ph), amp, self.fmt)
+
+    def next_array(self, n: int) -> np.ndarray:
+        """Return the next n frames as a (n, channels) array."""
+        out = np.empty((int(n), self.channels), dtype=self.dtype)
+        self._fill(out)
+        return out
+
+    def next_bytes(self, n: int) -> bytes:
+        return self.next_array(int(n) // self.frame_bytes).tobytes()
+
+    def next_into(self, buf) -> int:
+        frames = len(buf) // self.frame_bytes
+        out = np.frombuffer(buf, dtype=self.dtype, count=frames * self.channels)
+        self._fill(out.reshape(frames, self.channels))
+        return frames * self.frame_bytes
+
+
 # optional helper if you prefer strings elsewhere
-def make_waveform(kind_str: str, amp: float = 1.0) -> Waveform:
+def make_waveform(kind_str: str, amp: float = 1.0,
+                  fo: float | None = None, fs: float | None = None) -> Waveform:
     k = (kind_str or "sine").lower()
     mapping = {"sine": Wave.SINE, "square": Wave.SQUARE, "triangle": Wave.TRIANGLE}
+    if fo is not None and fs is not None:
+        return DdsWaveform(mapping.get(k, Wave.SINE), amp=amp, fo=fo, fs=fs)
     return Waveform(mapping.get(k, Wave.SINE), amp=amp)
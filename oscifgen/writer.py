@@ -1,17 +1,40 @@
 from __future__ import annotations
+import dataclasses
 import time
 from typing import Optional
 from .device import Device
-from .wavegen import Waveform
 
 # --- pacing (unchanged) ---
 from .scheduler import Pacer
 # --------------------------
+from .loopctl import StopToken
+from .adaptive import AdaptPolicy, ChunkTuner
+from .pipeline import ChunkPipeline
 
-from .wavegen import Wave, Waveform, make_waveform
+from .wavegen import (ChannelSpec, DdsWaveform, MultiWaveform, Wave, Waveform,
+                      channel_specs, make_waveform)
 
 
 class Writer:
+    """
+    Implements reqfWrite: generate waveform frames at fo (chunks/s) and
+    write them to the output device until N frames and/or loops chunks.
+    With fs set the wave is synthesized at fo Hz (DDS) and chunks are paced
+    at fs/chunk per second, so frames leave at fs per second; rate (chunks/s)
+    overrides either pacing.
+
+    dtype ("uint8", "int16", "float32") and channels (a count, or one
+    ChannelSpec per channel with its own wave/amp/phase) select the
+    frame layout; the default is the original one uint8 channel, where a
+    frame is one byte. n and chunk count frames; each chunk is synthesized
+    into one preallocated buffer and written as interleaved frames.
+    """
+    # totals of the last run(), for callers such as ScriptRunner
+    bytes_total = 0
+    frames_total = 0
+    loops_total = 0
+    elapsed_s = 0.0
+
     def run(
         self,
         dev: Device,
@@ -22,32 +45,76 @@ class Writer:
         n: Optional[int],
         loops: Optional[int],
         chunk: int,
+        fs: Optional[float] = None,
+        spin: float = 0.0,
+        batch: float = 0.0,
+        stop: Optional[StopToken] = None,
+        rate: Optional[float] = None,
+        adapt: Optional[AdaptPolicy] = None,
+        pipeline: int = 0,
+        dtype: str = "uint8",
+        channels=None,
     ) -> int:
+        # Validate termination conditions (before building the waveform: DDS needs fo)
+        if (n is None and loops is None) or fo is None or fo <= 0:
+            print("Provide --n or --loops (or both), and a positive --fo.")
+            return 2
+        if n is not None and n <= 0:
+            print("Invalid N (must be > 0).")
+            return 2
+        if loops is not None and loops <= 0:
+            print("Invalid loops (must be > 0).")
+            return 2
+        if fs is not None and fs <= 0:
+            print("Invalid --fs (must be > 0).")
+            return 2
+
         # --- NEW: normalize wave to a Waveform ---
         # Accepts:
         #   - Wave enum (Wave.SINE / SQUARE / TRIANGLE)
         #   - string ("sine", "square", "triangle")
         #   - Waveform (already a generator)
+        # With fs set, Wave/str inputs use DDS so the output is fo Hz at fs samples/s.
         if isinstance(wave, Waveform):
             wf = wave
+        elif dtype != "uint8" or channels is not None:
+            try:
+                specs = channel_specs(channels)
+                if not isinstance(specs, list):
+                    kind = wave if isinstance(wave, Wave) else Wave(str(wave).lower())
+                    specs = [ChannelSpec(kind, amp)] * (specs or 1)
+                wf = MultiWaveform(specs, dtype, fo=fo, fs=fs)
+            except ValueError as e:
+                print(f"Invalid channels/dtype: {e}")
+                return 2
         elif isinstance(wave, Wave):
-            wf = Waveform(kind=wave, amp=amp)
+            if fs is not None:
+                wf = DdsWaveform(kind=wave, amp=amp, fo=fo, fs=fs)
+            else:
+                wf = Waveform(kind=wave, amp=amp)
         elif isinstance(wave, str):
-            wf = make_waveform(wave, amp=amp)
+            wf = make_waveform(wave, amp=amp, fo=fo, fs=fs)
         else:
             raise TypeError(f"Unsupported wave type: {type(wave)!r}")
         # -----------------------------------------
-        # ... existing code below ...
-        # Validate termination conditions
-        if (n is None and loops is None) or fo <= 0:
-            print("Provide --n or --loops (or both), and a positive --fo.")
-            return 2
-        if n is not None and n <= 0:
-            print("Invalid N (must be > 0).")
-            return 2
-        if loops is not None and loops <= 0:
-            print("Invalid loops (must be > 0).")
-            return 2
+
+        # chunks/s: fo, or with fs set fs/chunk so samples leave at fs per second
+        # (fo is then only the synthesized frequency); rate overrides both
+        if rate is None:
+            rate = fo if fs is None else fs / chunk
+
+        # n and chunk count frames; the loop below works in bytes
+        fb = wf.frame_bytes
+        if fb > 1:
+            n = n * fb if n is not None else None
+            chunk *= fb
+            if adapt is not None:
+                adapt = dataclasses.replace(adapt, chunk_min=adapt.chunk_min * fb,
+                                            chunk_max=adapt.chunk_max * fb)
+
+        def whole(k: int) -> int:
+            # adaptive sizes need not be frame multiples; never split a frame
+            return k - k % fb
 
         if not dev.open(out_path):
             print("Open failed (output)")
@@ -55,19 +122,51 @@ class Writer:
 
         total_bytes = 0
         iter_count = 0
+        # rate=math.inf runs unpaced
+        p = Pacer(rate, spin_s=spin, batch_s=batch)
+        # adapt=AdaptPolicy(...) resizes chunks at a constant byte rate (see ChunkTuner)
+        tuner = ChunkTuner(adapt, chunk, p, unit=fb) if adapt is not None else None
+        cur = chunk if tuner is None else tuner.chunk
+
+        # one chunk buffer for the whole run, refilled in place (next_into)
+        top = chunk if adapt is None else max(chunk, adapt.chunk_max)
+        scratch = memoryview(bytearray(top)) if not pipeline else None
+
+        # pipeline=<depth>: a producer thread synthesizes up to depth chunks ahead
+        pipe = None
+        if pipeline:
+            planned_bytes = planned_chunks = 0
+
+            def plan() -> int:
+                # producer-side mirror of the termination checks below
+                nonlocal planned_bytes, planned_chunks
+                if n is None and loops is not None and planned_chunks >= loops:
+                    return 0
+                k = whole(cur if n is None else min(cur, n - planned_bytes))
+                if k > 0:
+                    planned_bytes += k
+                    planned_chunks += 1
+                return k
+
+            pipe = ChunkPipeline(wf, pipeline, top)
+            pipe.start(plan)
+
         t0 = time.perf_counter()
-        p = Pacer(fo)
         p.start()
+        woke = t0
 
         def need_this_iter() -> int:
             if n is None:
-                return chunk
+                return whole(cur)
             remaining = n - total_bytes
-            return chunk if remaining >= chunk else max(0, remaining)
+            return whole(cur if remaining >= cur else max(0, remaining))
 
         status = 0
         try:
             while True:
+                # A StopToken (script 'stop') ends the run early
+                if stop is not None and stop.stopped():
+                    break
                 # Check termination BEFORE writing if loops-only
                 if n is None and loops is not None and iter_count >= loops:
                     break
@@ -78,24 +177,59 @@ class Writer:
                 if need == 0:
                     break
 
-                # Generate waveform bytes; apply amp scale inside your wavegen if supported.
-                buf = wf.next_bytes(need)
+                # Generate waveform frames into the chunk buffer (or take a pipelined one)
+                if pipe is None:
+                    buf = scratch[:need]
+                    wf.next_into(buf)
+                else:
+                    try:
+                        ready = pipe.get()
+                    except Exception as e:  # the producer thread failed synthesizing
+                        print(f"Write error: {e} (pipeline producer)")
+                        status = 1
+                        break
+                    if ready is None:
+                        break
+                    slot, buf = ready
                 w = dev.write(buf)
+                if pipe is not None:
+                    pipe.release(slot)
                 if w.bytes < 0 or w.err:
                     print(f"Write error: {w.err}")
                     status = 1
                     break
                 total_bytes += w.bytes
                 iter_count += 1
+                if tuner is not None:
+                    cur = tuner.observe(time.perf_counter() - woke)
                 p.sleep_until_next()
+                if tuner is not None:
+                    woke = time.perf_counter()
         finally:
+            if pipe is not None:
+                pipe.close()
             dev.close()
+        # write-behind devices flush on close; a failure there loses data too
+        close_err = getattr(dev, "error", "")
+        if close_err and not status:
+            print(f"Write error: {close_err}")
+            status = 1
 
         t1 = time.perf_counter()
         elapsed = max(1e-12, t1 - t0)
+        self.bytes_total, self.loops_total, self.elapsed_s = total_bytes, iter_count, elapsed
+        self.frames_total = total_bytes // fb
         thr = (total_bytes / elapsed) if elapsed > 0 else 0.0
         print(
             f"WRITE bytes_total={total_bytes} loops_total={iter_count} "
-            f"time_s={elapsed:.6f} throughput_Bps={thr:.2f}"
+            f"time_s={elapsed:.6f} throughput_Bps={thr:.2f} frames_total={self.frames_total}"
         )
+        print(p.summary())
+        if tuner is not None:
+            print(tuner.summary())
+        if pipe is not None:
+            print(pipe.summary())
+        io_summary = getattr(dev, "io_summary", None)
+        if io_summary is not None:
+            print(io_summary())
         return status
@@ -1,11 +1,16 @@
 from .stop_token import StopToken
-from .ftdi_device import MockFtdiDevice
 from .timer_thread import TimerThread
 from .reader_thread import ReaderThread
+from .frame_ring import FrameRing
+from .renderer_thread import RendererThread
+from .trigger import Trigger, WindowFile
 
 __all__ = [
     "StopToken",
-    "MockFtdiDevice",
     "TimerThread",
     "ReaderThread",
+    "FrameRing",
+    "RendererThread",
+    "Trigger",
+    "WindowFile",
 ]
@@ -0,0 +1,48 @@
+# scope_mt/frame_ring.py
+import numpy as np
+
+
+class FrameRing:
+    """
+    Preallocated int16 sample ring between the reader and the renderer.
+
+    The reader thread write()s every chunk it captures; the renderer takes
+    latest(n) snapshots at its own frame rate. The ring never blocks and
+    never grows: once full, new frames overwrite the oldest (a display
+    only needs the most recent window). `written` counts every frame ever
+    pushed, so the renderer can tell how much arrived between frames.
+    """
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=np.int16)
+        self.written = 0  # total frames written (reader-owned)
+
+    def write(self, frames):
+        """Append int16 frames (array or raw bytes)."""
+        if not isinstance(frames, np.ndarray):
+            frames = np.frombuffer(frames, dtype=np.int16)
+        n = len(frames)
+        if n == 0:
+            return
+        src = frames[-self.capacity:]
+        k = len(src)
+        pos = (self.written + n - k) % self.capacity
+        first = min(k, self.capacity - pos)
+        self._buf[pos:pos + first] = src[:first]
+        if first < k:
+            self._buf[:k - first] = src[first:]
+        self.written += n
+
+    def latest(self, n):
+        """Copy of the most recent n frames (fewer if not yet written), oldest first."""
+        end = self.written
+        n = min(int(n), end, self.capacity)
+        if n <= 0:
+            return self._buf[:0].copy()
+        start = (end - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._buf[start:start + n].copy()
+        return np.concatenate((self._buf[start:], self._buf[:start + n - self.capacity]))
@@ -1,5 +1,5 @@
 # scope_mt/mic_device.py
-import sounddevice as sd
+from oscifgen.mic_device import MicrophoneDevice as _CallbackMic
 
 
 class MicrophoneDevice:
@@ -7,51 +7,49 @@ class MicrophoneDevice:
     Simple microphone-backed device that mimics the MockFtdiDevice interface:
 
       - open()
-      - read_chunk(nbytes=16) -> bytes
+      - read_chunk(nbytes=16) -> memoryview of int16 mono samples
       - close()
 
     It uses the default system input device (your default microphone).
+    Capture is oscifgen's callback-mode MicrophoneDevice: PortAudio blocks
+    are copied straight into a preallocated ring, and read_chunk() returns
+    a zero-copy view of it that stays valid until the next read_chunk().
+    overflows/underflows count dropped audio and reads that had to wait.
+    fake=True captures a test tone instead (no sounddevice needed).
     """
 
-    def __init__(self, samplerate=44100, channels=1):
+    def __init__(self, samplerate=44100, channels=1, fake=False):
         self.samplerate = samplerate
         self.channels = channels
-        self.stream = None
+        self._dev = _CallbackMic(samplerate=samplerate, channels=channels,
+                                 dtype="int16", fake=fake)
         self._open = False
 
     def open(self):
         if self._open:
             return
-
-        # Blocking input stream, 16-bit mono
-        self.stream = sd.InputStream(
-            samplerate=self.samplerate,
-            channels=self.channels,
-            dtype="int16",
-        )
-        self.stream.start()
+        if not self._dev.open(""):
+            raise RuntimeError("MicrophoneDevice open failed")
         self._open = True
 
     def read_chunk(self, nbytes=16):
         """
-        Read roughly nbytes of audio from the microphone and return as bytes.
-        Each sample is int16 (2 bytes). For mono, bytes_per_frame = 2.
+        Read roughly nbytes of audio from the microphone.
+        Each sample is int16 (2 bytes). For multi-channel input the
+        frames come interleaved; ReaderThread's ring keeps them as-is.
         """
         if not self._open:
             raise RuntimeError("MicrophoneDevice not open")
+        return self._dev.read_view(nbytes)
 
-        bytes_per_frame = 2 * self.channels  # int16 per channel
-        frames = max(1, nbytes // bytes_per_frame)
+    @property
+    def overflows(self):
+        return self._dev.overflows
 
-        data, overflowed = self.stream.read(frames)
-        # data.shape == (frames, channels), dtype=int16
-        # Down-mix to mono if needed and return raw bytes
-        mono = data[:, 0]
-        return mono.tobytes()
+    @property
+    def underflows(self):
+        return self._dev.underflows
 
     def close(self):
-        if self.stream is not None:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
+        self._dev.close()
         self._open = False
@@ -0,0 +1,49 @@
+# scope_mt/overview.py
+import sys
+
+from oscifgen.pyramid import PyramidFile
+
+from .renderer_thread import render
+
+
+def overview(path, start_s=0.0, end_s=None, width=120, height=12, channel=0):
+    """
+    Draw [start_s, end_s) of a long capture from its decimation pyramid
+    (the .pyr sidecar `oscifgen acquire --pyramid` writes) in the scope's
+    min/max/RMS style. Only the pyramid level matching `width` is read, so
+    an hour of audio draws as fast as a second of it.
+    """
+    with PyramidFile(path) as pyr:
+        end_s = pyr.duration_s if end_s is None else min(end_s, pyr.duration_s)
+        lv = pyr.query(start_s, end_s, width)
+        mn, mx, _mean, rms = pyr.columns(start_s, end_s, width)
+        head = (
+            f"[overview] {path} {start_s:.3f}-{end_s:.3f}s level={lv.level} "
+            f"frames_per_bucket={lv.frames_per_bucket} buckets_read={len(lv.min)} "
+            f"min={int(mn[:, channel].min())} max={int(mx[:, channel].max())}\n"
+        )
+        return head + render(mn[:, channel], mx[:, channel], rms[:, channel], height)
+
+
+def _seconds(v):
+    if v.endswith("ms"):
+        return float(v[:-2]) / 1000.0
+    return float(v[:-1]) if v.endswith("s") else float(v)
+
+
+def main(argv):
+    if len(argv) < 2:
+        raise SystemExit("Usage: overview capture.bin.pyr [start=0s] [end=60s] [width=120] [height=12] [ch=0]")
+    opts = dict(tok.split("=", 1) for tok in argv[2:] if "=" in tok)
+    sys.stdout.write(overview(
+        argv[1],
+        start_s=_seconds(opts.get("start", "0")),
+        end_s=_seconds(opts["end"]) if "end" in opts else None,
+        width=int(opts.get("width", 120)),
+        height=int(opts.get("height", 12)),
+        channel=int(opts.get("ch", 0)),
+    ))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
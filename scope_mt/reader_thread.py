@@ -4,12 +4,28 @@ import time
 
 
 class ReaderThread(threading.Thread):
-    def __init__(self, dev, sample_interval_s, stop_token, out_lock):
+    """
+    Acquisition stage of the scope: reads a chunk every sample_interval_s
+    and pushes the raw int16 frames into a FrameRing. Nothing is formatted
+    or printed per chunk (the RendererThread draws the display), so the
+    sampling interval does not depend on how fast the terminal is.
+
+    With a Trigger, chunks go to trigger.process() instead, and only the
+    triggered windows it emits reach the ring (and disk).
+    """
+
+    def __init__(self, dev, sample_interval_s, stop_token, out_lock, ring, chunk_bytes=256,
+                 trigger=None):
         super().__init__(daemon=True)
         self.dev = dev
         self.sample_interval_s = sample_interval_s
         self.stop_token = stop_token
         self.out_lock = out_lock
+        self.ring = ring
+        self.chunk_bytes = chunk_bytes
+        self.trigger = trigger
+        self.chunks = 0
+        self.late = 0  # reads that took longer than the sample interval
 
     def run(self):
         self.dev.open()
@@ -17,21 +33,28 @@ class ReaderThread(threading.Thread):
             while not self.stop_token.stopped():
                 start = time.monotonic()
 
-                # Read a small chunk of microphone samples
-                # 256 bytes instead of 16 for more signal
-                data = self.dev.read_chunk(256)
-                ts = time.strftime("%H:%M:%S", time.localtime())
-
-                # Treat the bytes like you did FTDI: hex dump = "oscilloscope display"
-                with self.out_lock:
-                    print(f"[scope] {ts}  {data.hex(' ')}")
+                # Read a small chunk of microphone samples (int16 mono)
+                data = self.dev.read_chunk(self.chunk_bytes)
+                if self.trigger is None:
+                    self.ring.write(data)
+                else:
+                    self.trigger.process(data)
+                self.chunks += 1
 
                 elapsed = time.monotonic() - start
                 remaining = self.sample_interval_s - elapsed
                 if remaining > 0:
                     time.sleep(remaining)
+                else:
+                    self.late += 1
 
         finally:
             self.dev.close()
             with self.out_lock:
-                print("[scope] reader stopped")
+                print(
+                    f"[scope] reader stopped: chunks={self.chunks} "
+                    f"frames={self.ring.written} late={self.late} "
+                    f"overflows={getattr(self.dev, 'overflows', 0)} "
+                    f"underflows={getattr(self.dev, 'underflows', 0)}"
+                    + (f" triggers={self.trigger.triggers}" if self.trigger is not None else "")
+                )
@@ -0,0 +1,96 @@
+# scope_mt/renderer_thread.py
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+
+_FULL_SCALE = 32768.0
+
+
+def column_stats(samples, width):
+    """
+    Decimate samples to at most `width` columns; returns (min, max, rms)
+    arrays, one entry per column, computed with whole-array NumPy ops.
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    per = max(1, -(-len(x) // max(1, width)))  # ceil, so cols <= width
+    cols = len(x) // per
+    x = x[len(x) - cols * per:].reshape(cols, per)
+    return x.min(axis=1), x.max(axis=1), np.sqrt((x * x).mean(axis=1))
+
+
+def render(mn, mx, rms, height):
+    """
+    Draw one frame as text: each column is a '|' bar from its min to its
+    max, with '-' marks at +/-RMS and the zero line as '.' where empty.
+    """
+    scale = (height - 1) / (2 * _FULL_SCALE)
+
+    def row(v):
+        # +full scale is row 0 (top), -full scale is the bottom row
+        return np.clip(np.rint((_FULL_SCALE - v) * scale), 0, height - 1).astype(np.int32)
+
+    rows = np.arange(height)[:, None]
+    top, bottom = row(mx), row(mn)
+    grid = np.full((height, len(mn)), ord(" "), dtype=np.uint8)
+    grid[row(np.zeros(1))[0]] = ord(".")
+    grid[(rows >= top) & (rows <= bottom)] = ord("|")
+    grid[(rows == row(rms)) | (rows == row(-rms))] = ord("-")
+    nl = np.full((height, 1), ord("\n"), dtype=np.uint8)
+    return np.hstack((grid, nl)).tobytes().decode("ascii")
+
+
+class RendererThread(threading.Thread):
+    """
+    Display stage of the scope: wakes at a fixed frame rate, takes the last
+    span_s of samples from the FrameRing, decimates them to the terminal
+    width (min/max/RMS per column) and draws one frame with a single write.
+    The reader never waits on the terminal; a slow console only lowers the
+    achieved frame rate.
+    """
+
+    def __init__(self, ring, stop_token, out_lock, fps=30.0, samplerate=44100,
+                 span_s=0.05, width=None, height=12):
+        super().__init__(daemon=True)
+        self.ring = ring
+        self.stop_token = stop_token
+        self.out_lock = out_lock
+        self.period_s = 1.0 / fps
+        self.window = max(1, int(samplerate * span_s))
+        self.width = width
+        self.height = height
+        self.frames = 0
+        self.late = 0  # frames that missed their slot
+
+    def run(self):
+        out = sys.stdout
+        clear = "\x1b[H\x1b[J" if out.isatty() else ""
+        nxt = time.monotonic()
+        seen = 0
+        while not self.stop_token.stopped():
+            width = self.width or max(10, shutil.get_terminal_size().columns - 1)
+            samples = self.ring.latest(self.window)
+            total = self.ring.written
+            if len(samples):
+                mn, mx, rms = column_stats(samples, width)
+                ts = time.strftime("%H:%M:%S", time.localtime())
+                status = (
+                    f"[scope] {ts}  frame={self.frames} new={total - seen} "
+                    f"min={int(mn.min())} max={int(mx.max())} rms={float(np.sqrt((rms * rms).mean())):.1f}\n"
+                )
+                frame = clear + status + render(mn, mx, rms, self.height)
+                with self.out_lock:
+                    out.write(frame)
+                    out.flush()
+                self.frames += 1
+                seen = total
+
+            nxt += self.period_s
+            remaining = nxt - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                self.late += 1
+                nxt = time.monotonic()
@@ -6,46 +6,103 @@ from .stop_token import StopToken
 from .mic_device import MicrophoneDevice
 from .timer_thread import TimerThread
 from .reader_thread import ReaderThread
+from .frame_ring import FrameRing
+from .renderer_thread import RendererThread
+from .trigger import Trigger, WindowFile
 
 
 class ScopeApp:
     def __init__(self):
         self.out_lock = threading.Lock()
 
-    def run(self, sample_ms, wait_s):
+    def run(self, sample_ms, wait_s, fake=False, trigger=None):
         stop = StopToken()
 
         # Use microphone as the input device instead of FTDI
         # sample_interval is how often we read from the mic
         sample_interval_s = sample_ms / 1000.0
 
-        # Create the device – default system mic
-        dev = MicrophoneDevice(samplerate=44100, channels=1)
+        # Create the device – default system mic (or a test tone with fake)
+        dev = MicrophoneDevice(samplerate=44100, channels=1, fake=fake)
+
+        # Reader -> ring (1 s of audio) -> renderer at a fixed frame rate
+        ring = FrameRing(dev.samplerate)
+        span_s = 0.05
+
+        # Triggered mode: only pre+post windows around each trigger reach the
+        # display (one window per frame) and, with save=, the disk
+        trig = None
+        saved = None
+        if trigger is not None:
+            opts = dict(trigger)
+            path = opts.pop("save", None)
+            saved = WindowFile(path) if path else None
+
+            def on_window(samples, at):
+                ring.write(samples)
+                if saved is not None:
+                    saved(samples, at)
+
+            trig = Trigger(on_window=on_window, **_to_samples(opts, dev.samplerate))
+            span_s = (trig.pre + trig.post) / dev.samplerate
 
         timer = TimerThread(wait_s, stop, self.out_lock)
-        reader = ReaderThread(dev, sample_interval_s, stop, self.out_lock)
+        reader = ReaderThread(dev, sample_interval_s, stop, self.out_lock, ring, trigger=trig)
+        renderer = RendererThread(ring, stop, self.out_lock, fps=30.0,
+                                  samplerate=dev.samplerate, span_s=span_s)
 
         with self.out_lock:
             print(
                 f"[main] start scope (mic): sample={sample_ms}ms wait={wait_s}s")
+            if trig is not None:
+                print(f"[main] trigger: mode={trig.mode} pre={trig.pre} post={trig.post} "
+                      f"holdoff={trig.gap} samples")
 
         reader.start()
+        renderer.start()
         timer.start()
 
         timer.join()
         stop.stop()
         reader.join()
+        renderer.join()
+        if saved is not None:
+            saved.close()
+            print(f"[main] saved {saved.windows} triggered window(s) to {trigger['save']}")
 
         print("[main] scope finished")
 
 
+_TRIGGER_KEYS = ("level", "hyst", "low", "high", "holdoff", "pre", "post", "save")
+_TIME_KEYS = ("holdoff", "pre", "post")
+
+
+def _to_samples(opts, samplerate):
+    """Trigger options with 10ms / 0.5s durations turned into sample counts."""
+    out = {}
+    for k, v in opts.items():
+        if k in _TIME_KEYS and v.endswith("ms"):
+            out[k] = int(round(float(v[:-2]) * samplerate / 1000.0))
+        elif k in _TIME_KEYS and v.endswith("s"):
+            out[k] = int(round(float(v[:-1]) * samplerate))
+        elif k == "mode":
+            out[k] = v
+        else:
+            out[k] = int(v)
+    return out
+
+
 def parse_command(argv):
     tokens = argv[1:]
     if tokens[0] != "start" or tokens[-1] != "stop":
-        raise SystemExit("Usage: scope start sampleTime=1ms wait=5s stop")
+        raise SystemExit("Usage: scope start sampleTime=1ms wait=5s [fake] "
+                         "[trigger=rising level=1000 hyst=50 pre=5ms post=20ms holdoff=50ms "
+                         "save=events.bin] stop")
 
     sample_ms = None
     wait_s = None
+    fake = False
+    trigger = None
 
     for tok in tokens[1:-1]:
         t = tok.replace(" ", "")
@@ -53,6 +110,13 @@ def parse_command(argv):
             sample_ms = int(t.split("=")[1][:-2])
         if t.startswith("wait="):
             wait_s = int(t.split("=")[1][:-1])
+        if t == "fake":
+            fake = True
+        if t.startswith("trigger="):
+            trigger = dict(trigger or {}, mode=t.split("=", 1)[1])
+        key = t.split("=", 1)[0]
+        if key in _TRIGGER_KEYS and "=" in t:
+            trigger = dict(trigger or {}, **{key: t.split("=", 1)[1]})
 
     if sample_ms is None or wait_s is None:
         raise SystemExit(
@@ -60,12 +124,15 @@ def parse_command(argv):
             "Example: scope start sampleTime=1ms wait=5s stop"
         )
 
-    return sample_ms, wait_s
+    if trigger is not None and "mode" not in trigger:
+        raise SystemExit("Error: trigger options need trigger=rising|falling|level|window")
+
+    return sample_ms, wait_s, fake, trigger
 
 
 def main(argv):
-    sample_ms, wait_s = parse_command(argv)
-    ScopeApp().run(sample_ms, wait_s)
+    sample_ms, wait_s, fake, trigger = parse_command(argv)
+    ScopeApp().run(sample_ms, wait_s, fake, trigger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+# scope_mt/trigger.py
+import struct
+
+import numpy as np
+
+from .frame_ring import FrameRing
+
+MODES = ("rising", "falling", "level", "window")
+
+# record header of a saved window: absolute trigger sample index, window length
+_RECORD = struct.Struct("<QI")
+
+
+class Trigger:
+    """
+    Oscilloscope-style trigger over the int16 sample stream.
+
+    Modes (all with hysteresis `hyst`, in sample units):
+      rising   fires when x reaches `level` after having been below level - hyst
+      falling  fires when x drops to `level` after having been above level + hyst
+      level    like rising, but already armed at start (x >= level fires at once)
+      window   fires when x leaves [low, high], re-arms once back inside by hyst
+
+    Each chunk is scanned with whole-array comparisons: the arm and fire
+    conditions become boolean masks, and a running max of their indices
+    finds the fires that come after an arm (a Schmitt trigger, with the
+    armed state carried over between chunks). Only the few resulting
+    edges are walked in Python, to apply the holdoff: after a trigger,
+    edges are ignored for max(holdoff, post) samples, so windows never
+    overlap.
+
+    Every trigger yields one window of pre + post samples, with the trigger
+    sample at index `pre`. The pre part comes from a preallocated FrameRing
+    holding the last `pre` samples (zeros before the stream started); the
+    post part may span later chunks. Completed windows go to on_window(
+    samples, trigger_index), where trigger_index counts samples from the
+    start of the stream; the window buffer is reused, so copy it to keep it.
+    """
+
+    def __init__(self, mode="rising", level=0, hyst=0, low=None, high=None,
+                 holdoff=0, pre=256, post=1024, on_window=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown trigger mode {mode!r} (choose from {', '.join(MODES)})")
+        if mode == "window" and (low is None or high is None or low >= high):
+            raise ValueError("window trigger needs low < high")
+        if pre < 0 or post <= 0 or hyst < 0 or holdoff < 0:
+            raise ValueError("need pre >= 0, post > 0, hyst >= 0, holdoff >= 0")
+        self.mode = mode
+        self.level = level
+        self.hyst = hyst
+        self.low = low
+        self.high = high
+        self.pre = int(pre)
+        self.post = int(post)
+        self.gap = max(int(holdoff), self.post)
+        self.on_window = on_window
+        self.history = FrameRing(max(1, self.pre))
+        self._window = np.zeros(self.pre + self.post, dtype=np.int16)
+        self._fill = 0            # post samples still missing from the open window
+        self._trig_at = 0
+        self._armed = mode == "level"
+        self._next_ok = 0         # first sample index a trigger may fire at
+        self.seen = 0             # samples scanned
+        self.triggers = 0
+
+    def _masks(self, x):
+        if self.mode == "falling":
+            return x > self.level + self.hyst, x <= self.level
+        if self.mode == "window":
+            fire = (x < self.low) | (x > self.high)
+            return (x >= self.low + self.hyst) & (x <= self.high - self.hyst), fire
+        return x < self.level - self.hyst, x >= self.level  # rising / level
+
+    def edges(self, x):
+        """Indices in x where the trigger condition fires (before holdoff)."""
+        arm, fire = self._masks(x.astype(np.int32))
+        n = len(x)
+        # index + 2 of the last arm/fire so far; slot 0 is the carried-in state
+        pos = np.arange(2, n + 2)
+        last_arm = np.empty(n + 1, dtype=np.int64)
+        last_fire = np.empty(n + 1, dtype=np.int64)
+        last_arm[0], last_fire[0] = (1, 0) if self._armed else (0, 1)
+        last_arm[1:] = np.where(arm, pos, 0)
+        last_fire[1:] = np.where(fire, pos, 0)
+        np.maximum.accumulate(last_arm, out=last_arm)
+        np.maximum.accumulate(last_fire, out=last_fire)
+        self._armed = bool(last_arm[-1] > last_fire[-1])
+        return np.flatnonzero(fire & (last_arm[:-1] > last_fire[:-1]))
+
+    def process(self, frames):
+        """Scan one chunk (int16 array or raw bytes); emit any windows it completes."""
+        x = frames if isinstance(frames, np.ndarray) else np.frombuffer(frames, dtype=np.int16)
+        n = len(x)
+        if n == 0:
+            return
+        base = self.seen
+        if self._fill:
+            self._extend(x, 0)
+        for i in self.edges(x):
+            g = base + int(i)
+            if g < self._next_ok:
+                continue
+            self.triggers += 1
+            self._next_ok = g + self.gap
+            self._trig_at = g
+            # pre-trigger samples: tail of the history ring, then this chunk up to i
+            k = min(int(i), self.pre)
+            older = self.history.latest(self.pre - k)
+            w = self._window
+            w[:self.pre - k - len(older)] = 0
+            w[self.pre - k - len(older):self.pre - k] = older
+            w[self.pre - k:self.pre] = x[i - k:i]
+            self._fill = self.post
+            self._extend(x, int(i))
+        self.history.write(x)
+        self.seen += n
+
+    def _extend(self, x, start):
+        take = min(self._fill, len(x) - start)
+        at = self.pre + self.post - self._fill
+        self._window[at:at + take] = x[start:start + take]
+        self._fill -= take
+        if not self._fill and self.on_window is not None:
+            self.on_window(self._window, self._trig_at)
+
+
+class WindowFile:
+    """
+    Appends triggered windows to a file: one record per window, a header
+    (<QI: trigger sample index, sample count) followed by the int16 samples.
+    """
+
+    def __init__(self, path):
+        self._f = open(path, "wb")
+        self.windows = 0
+
+    def __call__(self, samples, trigger_index):
+        self._f.write(_RECORD.pack(trigger_index, len(samples)))
+        self._f.write(samples.tobytes())
+        self.windows += 1
+
+    def close(self):
+        self._f.close()
+
+
+def read_windows(path):
+    """Yield (trigger_index, int16 samples) for each record written by WindowFile."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    while pos + _RECORD.size <= len(data):
+        trig, n = _RECORD.unpack_from(data, pos)
+        pos += _RECORD.size
+        yield trig, np.frombuffer(data, dtype=np.int16, count=n, offset=pos)
+        pos += 2 * n
@@ -0,0 +1,34 @@
+# tests/test_device.py
+from oscifgen.device import Device, IoResult
+
+
+class CountingDevice(Device):
+    """A backend written before read_into: read() only reports a count."""
+    def __init__(self, avail):
+        self.avail = avail
+
+    def open(self, path):
+        return True
+
+    def close(self):
+        pass
+
+    def read(self, n):
+        k = min(n, self.avail)
+        self.avail -= k
+        return IoResult(k)
+
+    def write(self, data):
+        return IoResult(len(data))
+
+    def is_connected(self):
+        return True
+
+
+def test_read_into_default_uses_read():
+    dev = CountingDevice(avail=5)
+    buf = bytearray(b"\xff" * 8)
+    r = dev.read_into(memoryview(buf))
+    assert (r.bytes, r.err) == (5, "")
+    assert buf == b"\x00" * 5 + b"\xff" * 3
+    assert dev.read_into(memoryview(buf)).bytes == 0
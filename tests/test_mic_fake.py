@@ -0,0 +1,29 @@
+# tests/test_mic_fake.py
+import math
+
+from oscifgen.mic_device import MicrophoneDevice
+from oscifgen.reader import Reader
+
+
+def _acquire(tmp_path, n, chunk=1024):
+    dev = MicrophoneDevice(samplerate=16000, fake=True)
+    r = Reader()
+    status = r.run(dev=dev, in_path="", out_path=str(tmp_path / "mic.bin"),
+                   fs=math.inf, n=n, chunk=chunk)
+    return status, r, (tmp_path / "mic.bin").read_bytes()
+
+
+def test_fake_mic_reads_exactly_n(tmp_path):
+    status, r, data = _acquire(tmp_path, n=8000)
+    assert status == 0
+    assert r.bytes_total == 8000
+    assert len(data) == 8000
+    assert any(data)  # the test tone, not silence
+
+
+def test_fake_mic_never_reads_past_n(tmp_path):
+    # 8001 bytes is 4000 int16 frames plus a partial one, which is not read
+    status, r, data = _acquire(tmp_path, n=8001, chunk=1001)
+    assert status == 0
+    assert r.bytes_total == 8000
+    assert len(data) == 8000
@@ -0,0 +1,62 @@
+# tests/test_pyramid.py
+import numpy as np
+import pytest
+
+from oscifgen.pyramid import PyramidBuilder, PyramidConfig, PyramidFile
+
+
+def _brute(x, lo, hi):
+    """min, max, mean, rms of frames [lo, hi) of x (frames, channels)."""
+    seg = x[lo:hi]
+    f = seg.astype(np.float64)
+    return seg.min(axis=0), seg.max(axis=0), f.mean(axis=0), np.sqrt((f * f).mean(axis=0))
+
+
+def _build(path, x, base, seed):
+    cfg = PyramidConfig(dtype=x.dtype.name, channels=x.shape[1], base=base)
+    b = PyramidBuilder(str(path), cfg, 1000.0)
+    raw = x.tobytes()
+    rng = np.random.default_rng(seed)
+    i = 0
+    while i < len(raw):   # ragged chunks that split frames and buckets
+        k = int(rng.integers(1, 5 * base * x.itemsize * x.shape[1]))
+        b.feed(raw[i:i + k])
+        i += k
+    b.close()
+    return b
+
+
+@pytest.mark.parametrize("frames", [64 * 16, 64 * 16 + 1, 64 * 23 + 37, 50])
+def test_levels_match_brute_force(tmp_path, frames):
+    rng = np.random.default_rng(frames)
+    x = rng.integers(-30000, 30000, size=(frames, 2)).astype(np.int16)
+    x[:, 1] //= 7
+    base = 64
+    _build(tmp_path / "p.pyr", x, base, seed=frames)
+    with PyramidFile(str(tmp_path / "p.pyr")) as pyr:
+        assert pyr.frames == frames and pyr._nlevels() >= 1
+        for k in range(pyr._nlevels()):
+            per = base << k
+            mn, mx, mean, rms = pyr._arrays(k)
+            assert len(mn) == -(-frames // per), f"level {k}"
+            for j in range(len(mn)):
+                want = _brute(x, j * per, min((j + 1) * per, frames))
+                assert np.array_equal(mn[j], want[0]) and np.array_equal(mx[j], want[1])
+                np.testing.assert_allclose(mean[j], want[2], rtol=1e-5, atol=1e-2)
+                np.testing.assert_allclose(rms[j], want[3], rtol=1e-5, atol=1e-2)
+
+
+def test_columns_weight_a_short_last_bucket(tmp_path):
+    base = 32
+    frames = base * 9 + 5                      # the last level-0 bucket holds 5 frames
+    x = np.zeros((frames, 1), dtype=np.int16)
+    x[-5:] = 1000                              # all the energy sits in the short bucket
+    _build(tmp_path / "w.pyr", x, base, seed=3)
+    with PyramidFile(str(tmp_path / "w.pyr")) as pyr:
+        lv = pyr.query(0.0, pyr.duration_s, width=10)
+        assert lv.level == 0 and lv.count[-1] == 5 and lv.count[:-1].tolist() == [base] * 9
+        mn, mx, mean, rms = pyr.columns(0.0, pyr.duration_s, width=1)
+        want = _brute(x, 0, frames)
+        assert mn[0, 0] == 0 and mx[0, 0] == 1000
+        np.testing.assert_allclose(mean[0], want[2], rtol=1e-6)
+        np.testing.assert_allclose(rms[0], want[3], rtol=1e-6)
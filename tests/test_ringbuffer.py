@@ -0,0 +1,86 @@
+# tests/test_ringbuffer.py
+import math
+import os
+import random
+from collections import deque
+
+import pytest
+
+from oscifgen.null_device import NullDevice
+from oscifgen.reader import Reader
+from oscifgen.ringbuffer import RingBuffer
+
+
+def test_wrap_around_keeps_order():
+    rb = RingBuffer(10)
+    assert rb.write_from(b"abcdefg") == 7
+    out = bytearray(5)
+    assert rb.read_into(memoryview(out)) == 5 and out == b"abcde"
+    assert rb.write_from(b"hijklm") == 6          # wraps: 3 at the end, 3 at the start
+    assert bytes(rb.read_view(100)) == b"fghij"   # a view stops at the wrap point
+    assert bytes(rb.read_view(100)) == b"klm"
+    assert len(rb) == 0 and rb.overruns == 0
+    assert rb.high_water == 8
+
+
+def test_overrun_drops_whole_write_and_counts_it():
+    rb = RingBuffer(8)
+    assert rb.write_from(b"123456") == 6
+    assert rb.write_from(b"789") == 0             # does not fit: dropped, not torn
+    assert (rb.overruns, rb.dropped_bytes) == (1, 3)
+    assert rb.write_from(b"78") == 2              # exactly fills the ring
+    assert rb.free() == 0
+    v = rb.read_view(4)                           # lent bytes stay reserved
+    assert bytes(v) == b"1234"
+    assert rb.write_from(b"x") == 0
+    assert (rb.overruns, rb.dropped_bytes) == (2, 4)
+    out = bytearray(8)
+    assert rb.read_into(memoryview(out)) == 4 and out[:4] == b"5678"
+    assert rb.high_water == 8
+
+
+def test_matches_a_queue_model():
+    rng = random.Random(5)
+    rb = RingBuffer(1000)
+    model = deque()
+    lent = 0                                      # bytes of the last read_view, still reserved
+    dropped = overruns = 0
+    out = memoryview(bytearray(700))
+    for _ in range(3000):
+        if rng.random() < 0.55:
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 400)))
+            if len(data) > rb.capacity - len(model) - lent:
+                overruns += 1
+                dropped += len(data)
+                assert rb.write_from(data) == 0
+            else:
+                assert rb.write_from(data) == len(data)
+                model.extend(data)
+        elif rng.random() < 0.5:
+            k = rb.read_into(out[:rng.randrange(1, 700)])
+            lent = 0
+            assert bytes(out[:k]) == bytes(model.popleft() for _ in range(k))
+        else:
+            v = rb.read_view(rng.randrange(1, 700))
+            lent = len(v)
+            assert bytes(v) == bytes(model.popleft() for _ in range(len(v)))
+        assert len(rb) == len(model)
+    assert (rb.overruns, rb.dropped_bytes) == (overruns, dropped)
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+def test_disk_writer_failure_fails_the_run(capsys):
+    dev = NullDevice()
+    status = Reader().run(dev=dev, in_path="", out_path="/dev/full", fs=math.inf,
+                          n=1 << 22, chunk=4096, ring=1 << 16)
+    out = capsys.readouterr().out
+    assert status == 1
+    assert "(disk-writer thread)" in out
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+def test_inline_write_failure_fails_the_run(capsys):
+    status = Reader().run(dev=NullDevice(), in_path="", out_path="/dev/full", fs=math.inf,
+                          n=1 << 20, chunk=4096)
+    assert status == 1
+    assert "Write error:" in capsys.readouterr().out
@@ -0,0 +1,79 @@
+# tests/test_trigger.py
+import numpy as np
+import pytest
+
+from scope_mt.trigger import Trigger
+
+
+def brute_force(x, mode, level=0, hyst=0, low=None, high=None, holdoff=0, post=1024):
+    """Sample-by-sample Schmitt trigger with holdoff: the reference for Trigger."""
+    armed = mode == "level"
+    gap = max(holdoff, post)
+    next_ok = 0
+    out = []
+    for i, v in enumerate(int(s) for s in x):
+        if mode == "falling":
+            arm, fire = v > level + hyst, v <= level
+        elif mode == "window":
+            arm, fire = low + hyst <= v <= high - hyst, v < low or v > high
+        else:
+            arm, fire = v < level - hyst, v >= level
+        if fire:
+            if armed and i >= next_ok:
+                out.append(i)
+                next_ok = i + gap
+            armed = False
+        elif arm:
+            armed = True
+    return out
+
+
+def _stream(seed, n=40000):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    x = 9000 * np.sin(2 * np.pi * t / 700.0) + rng.normal(0, 1500, n)
+    x[n // 2:n // 2 + 50] = 32767     # clipped burst
+    return np.clip(x, -32768, 32767).astype(np.int16)
+
+
+CASES = [
+    dict(mode="rising", level=0, hyst=0),
+    dict(mode="rising", level=2000, hyst=800, holdoff=1500),
+    dict(mode="falling", level=-1000, hyst=500),
+    dict(mode="level", level=-20000, hyst=100),
+    dict(mode="window", low=-7000, high=7000, hyst=300, holdoff=200),
+]
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda c: c["mode"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_trigger_positions_and_windows_match_brute_force(case, seed):
+    x = _stream(seed)
+    pre, post = 96, 300
+    want = brute_force(x, post=post, **case)
+    assert want   # the case really triggers
+
+    got = []
+    trig = Trigger(pre=pre, post=post, on_window=lambda w, at: got.append((at, w.copy())), **case)
+    rng = np.random.default_rng(seed + 100)
+    i = 0
+    while i < len(x):   # ragged chunks, including single samples
+        k = int(rng.choice([1, 2, 17, 256, 1000, 4099]))
+        trig.process(x[i:i + k])
+        i += k
+
+    assert trig.triggers == len(want) and trig.seen == len(x)
+    done = [g for g in want if g + post <= len(x)]
+    assert [at for at, _ in got] == done
+    padded = np.concatenate([np.zeros(pre, dtype=np.int16), x])
+    for at, w in got:
+        assert np.array_equal(w, padded[at:at + pre + post])
+
+
+def test_edges_carry_armed_state_between_chunks():
+    x = np.array([-10, -10, 5, 5, -10, 3], dtype=np.int16)
+    whole = Trigger("rising", level=0, hyst=2, post=1).edges(x)
+    t = Trigger("rising", level=0, hyst=2, post=1)
+    split = [int(i) + off for off, part in ((0, x[:2]), (2, x[2:5]), (5, x[5:]))
+             for i in t.edges(part)]
+    assert list(whole) == split == [2, 5]
@@ -0,0 +1,30 @@
+# tests/test_wavegen.py
+import random
+
+import pytest
+
+from oscifgen.wavegen import Wave, Waveform
+
+
+def _chunks(seed, count):
+    rng = random.Random(seed)
+    # tiny chunks (per-sample path), ragged ones, and many-cycle blocks
+    return [rng.choice([0, 1, 7, 63, 64, 65, 255, 256, 1000, 4097, 65536 + rng.randrange(500)])
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("kind", list(Wave))
+@pytest.mark.parametrize("amp", [1.0, 0.37])
+def test_numpy_matches_scalar_across_chunk_boundaries(kind, amp):
+    scalar = Waveform(kind, amp, vectorized=False)
+    fast = Waveform(kind, amp)
+    for i, n in enumerate(_chunks(f"{kind.value}:{amp}", 60)):
+        want = scalar.next_bytes(n)
+        if i % 2:
+            buf = bytearray(n)
+            assert fast.next_into(memoryview(buf)) == n
+            got = bytes(buf)
+        else:
+            got = fast.next_bytes(n)
+        assert got == want, f"chunk {i} (n={n}) differs"
+    assert fast._phase == scalar._phase